@@ -25,11 +25,15 @@ if __conf_path.exists():
 
 from .common import *
 from .outcomes import *
+from .sampling import *
+from .frontier import *
 from .utilities import *
+from .traces import *
 from .negotiators import *
 from .mechanisms import *
 from negmas.modeling import *
 from .sao import *
+from .batch import *
 from .st import *
 from .inout import *
 from .genius import *
@@ -39,10 +43,14 @@ from .situated import *
 __all__ = (
     common.__all__
     + outcomes.__all__
+    + sampling.__all__
+    + frontier.__all__
     + utilities.__all__
+    + traces.__all__
     + negotiators.__all__
     + mechanisms.__all__
     + sao.__all__
+    + batch.__all__
     + st.__all__
     + inout.__all__
     + genius.__all__
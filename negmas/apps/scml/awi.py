@@ -301,7 +301,7 @@ class SCMLAWI(AgentWorldInterface):
             A dictionary with agent IDs in keys and their financial reports at the given time as values
         """
         if step is None:
-            reports = self.bb_query(section="reports_time", query=None)
+            reports = self.bb_query(section="reports_time", query=None, view=True)
             reports = self.bb_read(
                 "reports_time", key=str(max([int(_) for _ in reports.keys()]))
             )
@@ -249,6 +249,7 @@ class GreedyScheduler(Scheduler):
         result = self.__dict__.copy()
         if "fields" in result.keys():
             result.pop("fields", None)
+        return result
 
     def __setstate__(self, state):
         self.__dict__ = state
@@ -270,11 +270,30 @@ class SCMLWorld(TimeInAgreementMixin, World):
         if balance_at_max_interest is None:
             balance_at_max_interest = initial_wallet_balances
         self.strip_annotations = strip_annotations
-        self.bulletin_board.register_listener(event_type="new_record", listener=self)
+        # only CFPs are of interest (see `on_event`)
         self.bulletin_board.register_listener(
-            event_type="will_remove_record", listener=self
+            event_type="new_record", listener=self, data={"section": "cfps"}
+        )
+        self.bulletin_board.register_listener(
+            event_type="will_remove_record", listener=self, data={"section": "cfps"}
+        )
+        self.bulletin_board.add_section(
+            "cfps",
+            indexes={
+                "is_buy": "is_buy",
+                "publisher": "publisher",
+                "product": "product",
+                "product_id": "product",
+                "product_index": "product",
+            },
+            set_indexes={
+                "publishers": "publisher",
+                "products": "product",
+                "product_ids": "product",
+                "product_indices": "product",
+            },
+            sorted_index="max_time",
         )
-        self.bulletin_board.add_section("cfps")
         self.bulletin_board.add_section("products")
         self.bulletin_board.add_section("processes")
         self.bulletin_board.add_section("bankruptcy")
@@ -1282,6 +1301,19 @@ class SCMLWorld(TimeInAgreementMixin, World):
         for v in self.products:
             self.bulletin_board.record("products", key=str(v), value=v)
 
+    def _fork_shared(self) -> Iterable[Any]:
+        # products, processes and manufacturing profiles are fixed (with their catalog prices) once the world is created
+        yield from super()._fork_shared()
+        yield from (self.products, self.processes)
+        yield from self.products
+        for process in self.processes:
+            yield from (process, process.inputs, process.outputs)
+            yield from process.inputs
+            yield from process.outputs
+        for factory in self.factories:
+            yield factory.profiles
+            yield from factory.profiles
+
     def order_contracts_for_execution(self, contracts: Collection[Contract]):
         def order(x: Contract):
             o = self.products[x.annotation["cfp"].product].production_level
@@ -1430,8 +1462,9 @@ class SCMLWorld(TimeInAgreementMixin, World):
                     inventory=inventory,
                     credit_rating=self.bank.credit_rating(agent.id),
                 )
-                repstr = str(report).replace("\n", " ")
-                self.logdebug(f"{agent.name}: {repstr}")
+                self.logdebug(
+                    lambda: f"{agent.name}: " + str(report).replace("\n", " ")
+                )
                 if reports_agent.get(agent.id, None) is None:
                     reports_agent[agent.id] = []
                 reports_agent[agent.id].append(report)
@@ -1453,14 +1486,16 @@ class SCMLWorld(TimeInAgreementMixin, World):
             reports = factory.step()
             if isinstance(manager, FactoryManager):
                 self.logdebug(
-                    f"{manager.name} (Factory {factory.id}): money={factory.wallet}"
+                    lambda: f"{manager.name} (Factory {factory.id}): money={factory.wallet}"
                     f", storage={str(dict(factory.storage))}"
                     f", loans={factory.loans}"
                 )
                 nonempty = []
                 for report in reports:
                     if not report.is_empty:
-                        self.logdebug(f"PRODUCTION>> {manager.name}: {str(report)}")
+                        self.logdebug(
+                            lambda: f"PRODUCTION>> {manager.name}: {str(report)}"
+                        )
                         if report.finished:
                             nonempty.append(report)
                 failures = []
@@ -1473,7 +1508,7 @@ class SCMLWorld(TimeInAgreementMixin, World):
                     manager.on_production_success(nonempty)
             else:
                 self.logdebug(
-                    f"{manager.name}: money={factory.wallet}"
+                    lambda: f"{manager.name}: money={factory.wallet}"
                     f", storage={str(dict(factory.storage))}"
                 )
 
@@ -1493,17 +1528,13 @@ class SCMLWorld(TimeInAgreementMixin, World):
 
         # remove expired CFPs
         # -------------------
-        cfps = self.bulletin_board.query(section="cfps", query=None)
-        if cfps is not None:
-            # new_cfps = dict()
-            toremove = []
-            for key, cfp in cfps.items():
-                # we remove CFP with a max_time less than *or equal* to current step as all processing for current step
-                # should already be complete by now
-                if cfp.max_time <= self.current_step:
-                    toremove.append(key)
-            for key in toremove:
-                self.bulletin_board.remove(section="cfps", query=key, query_keys=True)
+        # we remove CFP with a max_time less than *or equal* to current step as all processing for current step
+        # should already be complete by now
+        expired = self.bulletin_board.query_range(
+            section="cfps", upper=self.current_step
+        )
+        for key in expired.keys():
+            self.bulletin_board.remove(section="cfps", key=key)
 
     def pre_step_stats(self):
         # noinspection PyProtectedMember
@@ -1561,7 +1592,9 @@ class SCMLWorld(TimeInAgreementMixin, World):
             )
             return breaches
         if unit_price < 1e-7:
-            self.logdebug(f"Contract with {unit_price} unit_price: {str(contract)}")
+            self.logdebug(
+                lambda: f"Contract with {unit_price} unit_price: {str(contract)}"
+            )
         # find out the values for vicitm and social penalties
         penalty_victim = (
             agreement.get("penalty", None)
@@ -2242,17 +2275,12 @@ class SCMLWorld(TimeInAgreementMixin, World):
         available = factory.balance - keep_for_beneficiary
         owed = 0.0
         nulled_contracts = []
-        for time, contracts in self.contracts.items():
-            if time < self.current_step:
-                continue
-            for contract in contracts:
-                if agent.id in contract.partners:
-                    victim = [_ for _ in contract.partners if _ != agent.id][0]
-                    nulled_contracts.append((victim, contract))
-                    owed += (
-                        contract.agreement["quantity"]
-                        * contract.agreement["unit_price"]
-                    )
+        for contract in self._contract_registry.scheduled_for(
+            agent.id, self.current_step
+        ):
+            victim = [_ for _ in contract.partners if _ != agent.id][0]
+            nulled_contracts.append((victim, contract))
+            owed += contract.agreement["quantity"] * contract.agreement["unit_price"]
         self.__n_bankrupt += 1
         if owed <= 0.0:
             return
@@ -2513,59 +2541,54 @@ class SCMLWorld(TimeInAgreementMixin, World):
     @property
     def business_size(self) -> float:
         """The total business size defined as the total money transferred within the system"""
-        return sum(self.stats["activity_level"])
+        return self._stats.sum("activity_level")
 
     @property
     def agreement_rate(self) -> float:
         """Fraction of negotiations ending in agreement and leading to signed contracts"""
-        n_negs = sum(self.stats["n_negotiations"])
+        n_negs = self._stats.sum("n_negotiations")
         n_contracts = len(self._saved_contracts)
         return n_contracts / n_negs if n_negs != 0 else np.nan
 
     @property
     def cancellation_rate(self) -> float:
         """Fraction of negotiations ending in agreement and leading to signed contracts"""
-        n_negs = sum(self.stats["n_negotiations"])
+        n_negs = self._stats.sum("n_negotiations")
         n_contracts = len(self._saved_contracts)
-        n_signed_contracts = len(
-            [_ for _ in self._saved_contracts.values() if _["signed"]]
-        )
+        n_signed_contracts = self._saved_contracts.count(signed=True)
         return (1.0 - n_signed_contracts / n_contracts) if n_contracts != 0 else np.nan
 
     @property
     def n_negotiation_rounds_successful(self) -> float:
         """Average number of rounds in a successful negotiation"""
-        n_negs = sum(self.stats["n_contracts_concluded"])
+        n_negs = self._stats.sum("n_contracts_concluded")
         if n_negs == 0:
             return np.nan
-        return sum(self.stats["n_negotiation_rounds_successful"]) / n_negs
+        return self._stats.sum("n_negotiation_rounds_successful") / n_negs
 
     @property
     def n_negotiation_rounds_failed(self) -> float:
         """Average number of rounds in a successful negotiation"""
-        n_negs = sum(self.stats["n_negotiations"]) - sum(
-            self.stats["n_contracts_concluded"]
+        n_negs = (
+            self._stats.sum("n_negotiations")
+            - self._stats.sum("n_contracts_concluded")
         )
         if n_negs == 0:
             return np.nan
-        return sum(self.stats["n_negotiation_rounds_failed"]) / n_negs
+        return self._stats.sum("n_negotiation_rounds_failed") / n_negs
 
     @property
     def contract_execution_fraction(self) -> float:
         """Fraction of signed contracts successfully executed"""
-        n_executed = sum(self.stats["n_contracts_executed"])
-        n_signed_contracts = len(
-            [_ for _ in self._saved_contracts.values() if _["signed"]]
-        )
+        n_executed = self._stats.sum("n_contracts_executed")
+        n_signed_contracts = self._saved_contracts.count(signed=True)
         return n_executed / n_signed_contracts if n_signed_contracts > 0 else np.nan
 
     @property
     def breach_rate(self) -> float:
         """Fraction of signed contracts that led to breaches"""
-        n_breaches = sum(self.stats["n_breaches"])
-        n_signed_contracts = len(
-            [_ for _ in self._saved_contracts.values() if _["signed"]]
-        )
+        n_breaches = self._stats.sum("n_breaches")
+        n_signed_contracts = self._saved_contracts.count(signed=True)
         if n_signed_contracts != 0:
             return n_breaches / n_signed_contracts
         return np.nan
@@ -0,0 +1,446 @@
+"""Runs many SAO negotiations in lock-step.
+
+`BatchSAORunner` advances a collection of `SAOMechanism` sessions one round per `step` call. Sessions whose
+negotiators support batch execution (see `SAONegotiator.supports_batch`) are run on a vectorized fast path: the state
+of all such sessions is kept in arrays (current offer index, proposer, number of acceptances, step etc) and every
+negotiator class is called once per turn for all sessions instead of once per session. All other sessions are
+stepped normally using `Mechanism.step`.
+
+Examples:
+
+    >>> from negmas import SAOMechanism, AspirationNegotiator, MappingUtilityFunction
+    >>> mechanisms = []
+    >>> for _ in range(10):
+    ...     m = SAOMechanism(outcomes=10, n_steps=20, history_mode="offers")
+    ...     ufuns = MappingUtilityFunction.generate_random(2, outcomes=m.outcomes)
+    ...     for i, u in enumerate(ufuns):
+    ...         _ = m.add(AspirationNegotiator(name=f"a{i}"), ufun=u)
+    ...     mechanisms.append(m)
+    >>> runner = BatchSAORunner(mechanisms)
+    >>> states = runner.run()
+    >>> runner.n_fast
+    10
+    >>> all(not _.running for _ in states)
+    True
+
+"""
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import numpy as np
+
+from negmas.events import Event
+from negmas.outcomes import ResponseType
+from negmas.sao import SAOMechanism, SAONegotiator, SAOState
+
+__all__ = ["BatchSAORunner"]
+
+_ACCEPT = ResponseType.ACCEPT_OFFER.value
+_REJECT = ResponseType.REJECT_OFFER.value
+_END = ResponseType.END_NEGOTIATION.value
+
+_BEHAVIOR = ("counter", "propose_", "respond_", "propose", "respond")
+"""Methods that must not be overridden by a subclass of a negotiator class implementing batch execution"""
+
+
+def _batch_class(negotiator: SAONegotiator) -> Optional[Type[SAONegotiator]]:
+    """Returns the class implementing batch execution for the negotiator (None if it cannot be run in batch)"""
+    cls = type(negotiator)
+    owner = next((_ for _ in cls.__mro__ if "batch_propose" in _.__dict__), None)
+    if owner is None or any(getattr(cls, _) is not getattr(owner, _) for _ in _BEHAVIOR):
+        return None
+    if (
+        negotiator.utility_function is None
+        or not negotiator.capabilities.get("propose", False)
+        or getattr(negotiator, "_SAONegotiator__end_negotiation", False)
+    ):
+        return None
+    if negotiator._ufun_modified:
+        negotiator.on_ufun_changed()
+    return owner if negotiator.supports_batch else None
+
+
+def _can_batch(mechanism: SAOMechanism) -> bool:
+    """Checks whether the mechanism can be run on the fast path"""
+    ami = mechanism.ami
+    return (
+        type(mechanism).round is SAOMechanism.round
+        and type(mechanism).step is SAOMechanism.step
+        and not mechanism._started
+        and not mechanism._enable_callbacks
+        and not mechanism._avoid_ultimatum
+        and getattr(mechanism, "_CheckpointMixin__checkpoint_folder", None) is None
+        and ami.outcomes is not None
+        and len(ami.outcomes) > 0
+        and ami.step_time_limit == float("inf")
+        and (ami.n_steps is not None or ami.time_limit < float("inf"))
+        and len(mechanism.negotiators) > 1
+    )
+
+
+class _LockStepBatch:
+    """A set of sessions with the same number of outcomes run together using arrays"""
+
+    def __init__(
+        self,
+        mechanisms: List[SAOMechanism],
+        classes: List[List[Type[SAONegotiator]]],
+    ):
+        self.mechanisms = mechanisms
+        m = len(mechanisms)
+        self.n_negotiators = np.array([len(_.negotiators) for _ in mechanisms])
+        max_n = int(self.n_negotiators.max())
+        self.n_steps = np.array(
+            [np.inf if _.ami.n_steps is None else _.ami.n_steps for _ in mechanisms]
+        )
+        self.time_limit = np.array([_.ami.time_limit for _ in mechanisms], dtype=float)
+        self.end_on_no_response = np.array(
+            [_.end_negotiation_on_refusal_to_propose for _ in mechanisms]
+        )
+        self.offering_is_accepting = np.array(
+            [_._offering_is_accepting for _ in mechanisms]
+        )
+
+        self.offer = np.full(m, -1, dtype=np.int64)
+        self.proposer = np.full(m, -1, dtype=np.int64)
+        self.n_accepting = np.zeros(m, dtype=np.int64)
+        self.last_checked = np.full(m, -1, dtype=np.int64)
+        self.step = np.zeros(m, dtype=np.int64)
+        self.last_round = np.full(m, -1, dtype=np.int64)
+        self.start = np.zeros(m, dtype=float)
+        self.agreement = np.full(m, -1, dtype=np.int64)
+        self.broken = np.zeros(m, dtype=bool)
+        self.timedout = np.zeros(m, dtype=bool)
+        self.running = np.zeros(m, dtype=bool)
+        self.done = np.zeros(m, dtype=bool)
+
+        # negotiators are numbered globally (g) and within the class implementing batch execution for them (row)
+        self.negotiators: List[SAONegotiator] = []
+        self.ids = np.full((m, max_n), -1, dtype=np.int64)
+        self.classes: List[Type[SAONegotiator]] = []
+        class_index: Dict[Type[SAONegotiator], int] = {}
+        members: Dict[int, List[int]] = defaultdict(list)
+        cls_of, row_of = [], []
+        for s, (mechanism, session_classes) in enumerate(zip(mechanisms, classes)):
+            for p, (negotiator, cls) in enumerate(
+                zip(mechanism.negotiators, session_classes)
+            ):
+                g = len(self.negotiators)
+                self.negotiators.append(negotiator)
+                self.ids[s, p] = g
+                c = class_index.get(cls, None)
+                if c is None:
+                    c = class_index[cls] = len(self.classes)
+                    self.classes.append(cls)
+                cls_of.append(c)
+                row_of.append(len(members[c]))
+                members[c].append(s)
+        self.class_of = np.array(cls_of, dtype=np.int64)
+        self.row_of = np.array(row_of, dtype=np.int64)
+        self.session_of = np.repeat(np.arange(m), self.n_negotiators)
+
+        self.utilities = np.vstack(
+            [
+                n.utility_function.eval_many(self.mechanisms[s].outcomes)
+                for n, s in zip(self.negotiators, self.session_of)
+            ]
+        )
+        reserved = [_.reserved_value for _ in self.negotiators]
+        self.reserved = np.array(
+            [np.nan if _ is None else _ for _ in reserved], dtype=float
+        )
+        self.rational = np.array([_.rational_proposal for _ in self.negotiators])
+        self.last_proposal = np.full(len(self.negotiators), -1, dtype=np.int64)
+        self.data: List[Any] = []
+        for c, cls in enumerate(self.classes):
+            gs = np.nonzero(self.class_of == c)[0]
+            self.data.append(
+                cls.batch_prepare(
+                    [self.negotiators[_] for _ in gs],
+                    [self.mechanisms[_] for _ in members[c]],
+                    self.utilities[gs],
+                )
+            )
+
+    def _dispatch(self, method: str, g: np.ndarray, *args) -> np.ndarray:
+        """Calls a batch method of every negotiator class for the negotiators g"""
+        classes = self.class_of[g]
+        result = np.empty(len(g), dtype=np.int64)
+        for c in np.unique(classes):
+            mask = classes == c
+            result[mask] = getattr(self.classes[c], method)(
+                self.data[c], self.row_of[g[mask]], *(_[mask] for _ in args)
+            )
+        return result
+
+    def _relative_time(self, s: np.ndarray, now: float) -> np.ndarray:
+        n_steps = self.n_steps[s]
+        relative_step = np.where(
+            np.isinf(n_steps), -1.0, (self.step[s] + 1) / n_steps
+        )
+        return np.maximum(relative_step, (now - self.start[s]) / self.time_limit[s])
+
+    def advance(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Runs a round of all live sessions. Returns the sessions stepped and the sessions ended"""
+        now = time.monotonic()
+        live = np.nonzero(~self.done)[0]
+        starting = live[~self.running[live]]
+        if len(starting):
+            self._start(starting, now)
+            live = np.nonzero(~self.done)[0]
+        started = live[np.isin(live, starting, invert=True)]
+        elapsed = now - self.start[live]
+        expired = (elapsed > self.time_limit[live]) | (
+            np.isin(live, started)
+            & (
+                (self.n_steps[live] - self.step[live] <= 0)
+                | (self.time_limit[live] - elapsed <= 0.0)
+            )
+        )
+        timedout = live[expired]
+        self.timedout[timedout] = True
+        self.running[timedout] = False
+        self.done[timedout] = True
+        active = live[~expired]
+        self._round(active)
+        self.last_round[active] = self.step[active]
+        ended_in_round = active[~self.running[active]]
+        self.done[ended_in_round] = True
+        return active, np.concatenate((timedout, ended_in_round))
+
+    def _start(self, sessions: np.ndarray, now: float) -> None:
+        self.running[sessions] = True
+        self.start[sessions] = now
+        for s in sessions:
+            mechanism = self.mechanisms[s]
+            mechanism._running, mechanism._step, mechanism._started = True, 0, True
+            mechanism._start_time = now
+            if mechanism.on_negotiation_start() is False:
+                self.running[s] = False
+                self.done[s] = True
+                continue
+            mechanism.announce(Event(type="negotiation_start", data=None))
+
+    def _round(self, sessions: np.ndarray) -> None:
+        """Runs one round of the given sessions mirroring `SAOMechanism.round`"""
+        first = self.last_checked[sessions] + 1
+        max_n = int(self.n_negotiators[sessions].max()) if len(sessions) else 0
+        for k in range(max_n):
+            alive = self.running[sessions] & (k < self.n_negotiators[sessions])
+            s, base = sessions[alive], first[alive]
+            if len(s) == 0:
+                break
+            now = time.monotonic()
+            pos = (base + k) % self.n_negotiators[s]
+            self.last_checked[s] = pos
+            g = self.ids[s, pos]
+            relative_time = self._relative_time(s, now)
+            # the proposer of the current offer is asked to propose again (if offering is accepting)
+            repeating = (self.proposer[s] == pos) & self.offering_is_accepting[s]
+            self.n_accepting[s[repeating]] = 0
+            asked = repeating | (self.offer[s] < 0)
+            responses = np.full(len(s), _REJECT, dtype=np.int64)
+            responding = ~asked
+            if responding.any():
+                responses[responding] = self._dispatch(
+                    "batch_respond",
+                    g[responding],
+                    relative_time[responding],
+                    self.offer[s[responding]],
+                )
+            proposing = responses == _REJECT
+            proposals = np.full(len(s), -1, dtype=np.int64)
+            if proposing.any():
+                gp = g[proposing]
+                proposals[proposing] = self._dispatch(
+                    "batch_propose", gp, relative_time[proposing]
+                )
+                # never propose something below the reserved value (see SAONegotiator.propose_)
+                p = proposals[proposing]
+                u = self.utilities[gp, np.maximum(p, 0)]
+                with np.errstate(invalid="ignore"):
+                    irrational = (
+                        (p >= 0)
+                        & self.rational[gp]
+                        & ~np.isnan(self.reserved[gp])
+                        & (u < self.reserved[gp])
+                    )
+                p[irrational] = -1
+                proposals[proposing] = p
+                made = p >= 0
+                self.last_proposal[gp[made]] = p[made]
+
+            ending = responses == _END
+            self.broken[s[ending]] = True
+
+            accepting = s[responses == _ACCEPT]
+            self.n_accepting[accepting] += 1
+            agreed = accepting[
+                self.n_accepting[accepting] == self.n_negotiators[accepting]
+            ]
+            self.agreement[agreed] = self.offer[agreed]
+
+            refused = (responses == _REJECT) & (proposals < 0)
+            self.broken[s[refused & self.end_on_no_response[s]]] = True
+
+            offered = (responses == _REJECT) & (proposals >= 0)
+            so = s[offered]
+            self.offer[so] = proposals[offered]
+            self.proposer[so] = pos[offered]
+            self.n_accepting[so] = self.offering_is_accepting[so].astype(np.int64)
+            for i, offer, t in zip(
+                so, proposals[offered], relative_time[offered]
+            ):
+                trace = self.mechanisms[i]._trace
+                if trace is not None:
+                    trace.record(
+                        step=int(self.step[i]),
+                        time=now - self.start[i],
+                        relative_time=float(t),
+                        proposer=self.negotiators[self.ids[i, self.proposer[i]]].id,
+                        outcome=None,
+                        outcome_index=int(offer),
+                    )
+            self.running[s[ending]] = False
+            self.running[agreed] = False
+            self.running[s[refused & self.end_on_no_response[s]]] = False
+
+    def sync(self, s: int) -> None:
+        """Writes the state of a session back to its mechanism"""
+        mechanism = self.mechanisms[s]
+        outcomes = mechanism.outcomes
+        mechanism._step = int(self.step[s])
+        mechanism._running = bool(self.running[s])
+        mechanism._broken = bool(self.broken[s])
+        mechanism._timedout = bool(self.timedout[s])
+        mechanism._agreement = (
+            None if self.agreement[s] < 0 else outcomes[int(self.agreement[s])]
+        )
+        mechanism._current_offer = (
+            None if self.offer[s] < 0 else outcomes[int(self.offer[s])]
+        )
+        mechanism._current_proposer = (
+            None
+            if self.proposer[s] < 0
+            else mechanism.negotiators[int(self.proposer[s])]
+        )
+        mechanism._n_accepting = int(self.n_accepting[s])
+        mechanism._last_checked_negotiator = int(self.last_checked[s])
+        mechanism._new_offers = self._last_offers(s)
+
+    def _last_offers(self, s: int) -> List[Tuple[str, Any]]:
+        """The offers made in the most recent round of a session (read back from its trace)"""
+        trace = self.mechanisms[s]._trace
+        if trace is None:
+            return []
+        steps, proposers = trace.column("step"), trace.column("proposer")
+        row = len(trace)
+        while row > 0 and steps[row - 1] == self.last_round[s]:
+            row -= 1
+        return [
+            (trace.proposers[proposers[_]], trace.outcome_at(_))
+            for _ in range(row, len(trace))
+        ]
+
+    def finish(self, s: int) -> None:
+        """Writes back the results of an ended session and informs everyone"""
+        mechanism = self.mechanisms[s]
+        outcomes = mechanism.outcomes
+        self.sync(s)
+        for g in self.ids[s, : self.n_negotiators[s]]:
+            negotiator, p = self.negotiators[g], self.last_proposal[g]
+            if p >= 0 and not np.isnan(self.utilities[g, p]):
+                negotiator.my_last_proposal = outcomes[int(p)]
+                negotiator.my_last_proposal_utility = float(self.utilities[g, p])
+        mechanism.on_negotiation_end()
+
+
+class BatchSAORunner:
+    """Runs many `SAOMechanism` sessions in lock-step.
+
+    Args:
+        mechanisms: The sessions to run. They must have all their negotiators and not be started yet to be run on
+                    the fast path.
+
+    Remarks:
+        - A session is run on the vectorized fast path if all of its negotiators support batch execution (see
+          `SAONegotiator.supports_batch`), its outcomes are enumerated, it has a step or time limit and it does not
+          use callbacks, checkpoints, a step time limit or `avoid_ultimatum`. Sessions with the same number of
+          outcomes share arrays.
+        - Utilities are evaluated once (using `UtilityFunction.eval_many`) when the runner is created. Changing
+          utility functions of negotiators in fast sessions during the run has no effect.
+        - The mechanisms of fast sessions are updated after every step only if they keep a full history (see the
+          `history_mode` of `Mechanism`). Otherwise, they are updated when they end. Use the "offers" history mode
+          to get the most out of this runner.
+    """
+
+    def __init__(self, mechanisms: List[SAOMechanism]):
+        self.mechanisms = list(mechanisms)
+        self._slow: List[int] = []
+        groups: Dict[int, List[int]] = defaultdict(list)
+        classes: Dict[int, List[Type[SAONegotiator]]] = {}
+        for i, mechanism in enumerate(self.mechanisms):
+            session_classes = (
+                [_batch_class(_) for _ in mechanism.negotiators]
+                if _can_batch(mechanism)
+                else [None]
+            )
+            if any(_ is None for _ in session_classes):
+                self._slow.append(i)
+                continue
+            classes[i] = session_classes
+            groups[len(mechanism.ami.outcomes)].append(i)
+        self._batches: List[Tuple[List[int], _LockStepBatch]] = [
+            (
+                indices,
+                _LockStepBatch(
+                    [self.mechanisms[_] for _ in indices], [classes[_] for _ in indices]
+                ),
+            )
+            for indices in groups.values()
+        ]
+        self._slow_running = list(self._slow)
+
+    @property
+    def n_fast(self) -> int:
+        """Number of sessions run on the vectorized fast path"""
+        return len(self.mechanisms) - len(self._slow)
+
+    @property
+    def running(self) -> bool:
+        """True if any session did not end yet"""
+        return len(self._slow_running) > 0 or any(
+            not batch.done.all() for _, batch in self._batches
+        )
+
+    def step(self) -> int:
+        """Advances all running sessions one round. Returns the number of sessions still running"""
+        for _, batch in self._batches:
+            stepped, ended = batch.advance()
+            full = [_ for _ in stepped if batch.mechanisms[_]._history_mode == "full"]
+            for s in full:
+                batch.sync(s)
+                batch.mechanisms[s]._record_state()
+            batch.step[stepped] += 1
+            for s in ended:
+                if s not in stepped and batch.mechanisms[s]._history_mode == "full":
+                    batch.sync(s)
+                    batch.mechanisms[s]._record_state()
+                batch.finish(s)
+        still_running = []
+        for i in self._slow_running:
+            mechanism = self.mechanisms[i]
+            mechanism.step()
+            if mechanism.running and not mechanism.state.ended:
+                still_running.append(i)
+        self._slow_running = still_running
+        return len(self._slow_running) + sum(
+            int((~batch.done).sum()) for _, batch in self._batches
+        )
+
+    def run(self) -> List[SAOState]:
+        """Runs all sessions to completion and returns their final states"""
+        while self.running:
+            self.step()
+        return [_.state for _ in self.mechanisms]
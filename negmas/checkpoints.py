@@ -1,13 +1,71 @@
-"""Implements Checkpoint functionality for easy dumping and restoration of any `NamedComponent` in negmas."""
-
+"""Implements Checkpoint functionality for easy dumping and restoration of any `NamedComponent` in negmas.
+
+Checkpoints can be incremental: Objects implementing `checkpoint_delta` (and `apply_checkpoint_delta`) like `World`
+save a full snapshot every `full_every` checkpoints and only the changes since the previous checkpoint in between.
+`CheckpointRunner` rebuilds the steps saved as deltas by loading the nearest full snapshot and applying the deltas
+after it. Checkpoints can also be written to disk by a background thread.
+"""
+import datetime
+import queue
 import shutil
+import threading
 from pathlib import Path
 from typing import Optional, Union, Dict, Any, Callable, Type, List
 
+import dill
 import numpy as np
 
 from negmas import NamedObject
-from negmas.helpers import load
+from negmas.helpers import load, dump, get_full_type_name
+
+__all__ = ["CheckpointMixin", "CheckpointRunner", "wait_for_checkpoints"]
+
+
+class _CheckpointWriter:
+    """Writes checkpoints (already serialized) to disk in a background thread"""
+
+    def __init__(self):
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._error: Optional[Exception] = None
+
+    def write(
+        self, file_name: Path, data: bytes, info_file_name: Path, info: Dict[str, Any]
+    ) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._queue = queue.Queue()
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        self._queue.put((file_name, data, info_file_name, dict(info)))
+
+    def wait(self) -> None:
+        if self._queue is not None:
+            self._queue.join()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _run(self) -> None:
+        while True:
+            file_name, data, info_file_name, info = self._queue.get()
+            try:
+                with open(file_name, "wb") as f:
+                    f.write(data)
+                dump(info, info_file_name)
+            except Exception as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+
+_writer = _CheckpointWriter()
+
+
+def wait_for_checkpoints() -> None:
+    """Blocks until all checkpoints passed to the background writer are saved"""
+    _writer.wait()
 
 
 class CheckpointMixin:
@@ -21,6 +79,8 @@ class CheckpointMixin:
         info: Dict[str, Any] = None,
         exist_ok: bool = True,
         single: bool = True,
+        full_every: int = 1,
+        background: bool = False,
     ):
         """
         Initializes the object to automatically save a checkpoint
@@ -35,10 +95,14 @@ class CheckpointMixin:
             info: Any extra information to save in the json file associated with each checkpoint
             exist_ok: Override existing files if any
             single: If True, only the most recent checkpoint will be kept
+            full_every: Number of checkpoints per full snapshot. Checkpoints between full snapshots only save the
+                        changes since the previous checkpoint (only if the object implements `checkpoint_delta`).
+            background: If True, checkpoints are serialized immediately but written to disk by a background thread.
 
         Remarks:
 
             - single_checkpoint implies exist_ok
+            - single_checkpoint implies full_every = 1 (deltas are useless without the earlier checkpoints)
 
         """
         self.__checkpoint_every = -1 if folder is None else every
@@ -48,6 +112,64 @@ class CheckpointMixin:
         self.__checkpoint_single = single
         self.__step_atrrib = step_attrib
         self.__checkpoint_filename = filename
+        self.__checkpoint_full_every = 1 if single else max(1, full_every)
+        self.__checkpoint_background = background
+        self.__checkpoint_count = 0
+
+    def _checkpoint_delta(self, step: int) -> Path:
+        """Saves the changes since the last checkpoint"""
+        me: NamedObject = self  # type: ignore
+        path = Path(self.__checkpoint_folder)
+        path.mkdir(parents=True, exist_ok=True)
+        base_name = (
+            self.__checkpoint_filename
+            if self.__checkpoint_filename is not None
+            else f"{self.__class__.__name__.lower()}.{me.id.replace('/', '_')}"
+        )
+        base_name = f"{step:05}.{base_name}.delta"
+        file_name = path / base_name
+        info = dict(self.__checkpoint_extra_info or {})
+        info.update(
+            {
+                "type": get_full_type_name(self.__class__),
+                "id": me.id,
+                "name": me.name,
+                "time": datetime.datetime.now().isoformat(),
+                "step": step,
+                "filename": str(file_name),
+                "kind": "delta",
+            }
+        )
+        data = dill.dumps(self.checkpoint_delta())  # type: ignore
+        info_file_name = path / (base_name + ".json")
+        if self.__checkpoint_background:
+            _writer.write(file_name, data, info_file_name, info)
+        else:
+            with open(file_name, "wb") as f:
+                f.write(data)
+            dump(info, info_file_name)
+        return file_name
+
+    def _checkpoint_full(self, exist_ok: bool) -> Path:
+        """Saves a full snapshot"""
+        if hasattr(self, "checkpoint_delta"):
+            # starts a new chain of deltas from this snapshot
+            self.checkpoint_delta()  # type: ignore
+        me: NamedObject = self  # type: ignore
+        return me.checkpoint(
+            path=self.__checkpoint_folder,
+            file_name=self.__checkpoint_filename,
+            info=self.__checkpoint_extra_info,
+            exist_ok=exist_ok,
+            single_checkpoint=self.__checkpoint_single,
+            step_attribs=(self.__step_atrrib,),
+            writer=_writer.write if self.__checkpoint_background else None,
+        )
+
+    def checkpoint_flush(self) -> None:
+        """Blocks until all checkpoints of this object are written to disk (if they are written in the background)"""
+        if self.__checkpoint_background:
+            wait_for_checkpoints()
 
     def checkpoint_on_step_started(self) -> Optional[Path]:
         """Should be called on every step to save checkpoints as needed.
@@ -63,14 +185,16 @@ class CheckpointMixin:
             return None
         step = getattr(self, self.__step_atrrib)
         if step % self.__checkpoint_every == 0 or self.__checkpoint_every==1:
-            me: NamedObject = self  # type: ignore
-            return me.checkpoint(
-                path=self.__checkpoint_folder,
-                file_name=self.__checkpoint_filename,
-                info=self.__checkpoint_extra_info,
-                exist_ok=self.__checkpoint_exist_ok or self.__checkpoint_single,
-                single_checkpoint=self.__checkpoint_single,
-                step_attribs=(self.__step_atrrib,),
+            n, self.__checkpoint_count = (
+                self.__checkpoint_count,
+                self.__checkpoint_count + 1,
+            )
+            if n % self.__checkpoint_full_every != 0 and hasattr(
+                self, "checkpoint_delta"
+            ):
+                return self._checkpoint_delta(step)
+            return self._checkpoint_full(
+                exist_ok=self.__checkpoint_exist_ok or self.__checkpoint_single
             )
 
     def checkpoint_final_step(self) -> Optional[Path]:
@@ -81,15 +205,9 @@ class CheckpointMixin:
         """
         if self.__checkpoint_every < 1 or self.__checkpoint_folder is None:
             return None
-        me: NamedObject = self  # type: ignore
-        return me.checkpoint(
-            path=self.__checkpoint_folder,
-            file_name=self.__checkpoint_filename,
-            info=self.__checkpoint_extra_info,
-            exist_ok=True,
-            single_checkpoint=self.__checkpoint_single,
-            step_attribs=(self.__step_atrrib,),
-        )
+        file_name = self._checkpoint_full(exist_ok=True)
+        self.checkpoint_flush()
+        return file_name
 
 
 class CheckpointRunner:
@@ -110,11 +228,20 @@ class CheckpointRunner:
             pattern = "*id*.json"
         self.__infos = [load(_) for _ in self.__folder.glob(pattern)]
         self.__files = dict(
-            zip(
-                (_["step"] for _ in self.__infos), (_["filename"] for _ in self.__infos)
-            )
+            (_["step"], _["filename"])
+            for _ in self.__infos
+            if _.get("kind", "full") != "delta"
+        )
+        self.__deltas = dict(
+            (_["step"], _["filename"])
+            for _ in self.__infos
+            if _.get("kind", "full") == "delta"
         )
-        self.__sorted_steps = sorted(list(self.__files.keys()))
+        self.__full_steps = sorted(list(self.__files.keys()))
+        self.__sorted_steps = sorted(
+            list(self.__files.keys()) + list(self.__deltas.keys())
+        )
+        self.__rebuilt = False
         self._step_index = -1
         self.__object: NamedObject = None
         self.__object_type = object_type
@@ -185,6 +312,12 @@ class CheckpointRunner:
         """
         if self.__object is None:
             return None
+        if self.__rebuilt:
+            raise ValueError(
+                f"Step {self.current_step} was rebuilt from a delta checkpoint which only updates the recorded "
+                f"state of the object (e.g. stats and contracts). It cannot be forked. Go to a step with a full "
+                f"checkpoint ({self.__full_steps}) instead"
+            )
         if (
             not isinstance(self.__object, CheckpointMixin)
             and folder is not None
@@ -263,16 +396,44 @@ class CheckpointRunner:
         if self._step_index > -1 and step == self.__sorted_steps[self._step_index]:
             return None
         filename = self.__files.get(step)
-        self.__object = self.__object_type.from_checkpoint(filename, return_info=False)
+        if filename is not None:
+            self.__object = self.__object_type.from_checkpoint(
+                filename, return_info=False
+            )
+            self.__rebuilt = False
+        else:
+            self.__object = self.__rebuild(step)
+            self.__rebuilt = True
         self._step_index = step_index
         for callback in self.__callbacks:
             callback(self.__object, step)
         return step
 
+    def __rebuild(self, step: int) -> NamedObject:
+        """Rebuilds the object at a step saved as a delta by applying deltas to the nearest full snapshot before it"""
+        base_index = np.searchsorted(self.__full_steps, step, side="right") - 1
+        if base_index < 0:
+            raise ValueError(f"No full checkpoint before step {step} to apply deltas to")
+        base = self.__full_steps[base_index]
+        current = self.current_step
+        if self.__object is not None and base <= current < step:
+            obj, start = self.__object, current
+        else:
+            obj = self.__object_type.from_checkpoint(
+                self.__files[base], return_info=False
+            )
+            start = base
+        for s in sorted(self.__deltas.keys()):
+            if start < s <= step:
+                with open(self.__deltas[s], "rb") as f:
+                    obj.apply_checkpoint_delta(dill.load(f))  # type: ignore
+        return obj
+
     def reset(self) -> None:
         """Goes before the first step"""
         self._step_index = -1
         self.__object = None
+        self.__rebuilt = False
 
     @property
     def next_step(self) -> Optional[int]:
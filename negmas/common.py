@@ -8,7 +8,17 @@ import dill
 from copy import deepcopy
 from dataclasses import dataclass, field, fields
 from pathlib import Path
-from typing import List, Optional, Any, TYPE_CHECKING, Union, Dict, Tuple, Type
+from typing import (
+    List,
+    Optional,
+    Any,
+    TYPE_CHECKING,
+    Union,
+    Dict,
+    Tuple,
+    Type,
+    Callable,
+)
 from typing_extensions import Protocol, runtime
 
 from .helpers import unique_name, load, dump, get_full_type_name
@@ -96,11 +106,11 @@ class MechanismState:
         return self.__hash__() == other.__hash__()
 
     def __copy__(self):
-        return AgentMechanismInterface(**self.__dict__)
+        return self.__class__(**self.__dict__)
 
-    def __deepcopy__(self, memodict={}):
-        d = {k: deepcopy(v) for k, v in self.__dict__.items()}
-        return AgentMechanismInterface(**d)
+    def __deepcopy__(self, memodict=None):
+        d = {k: deepcopy(v, memodict) for k, v in self.__dict__.items()}
+        return self.__class__(**d)
 
     def __getitem__(self, item):
         """Makes the outcome type behave like a dict"""
@@ -246,8 +256,8 @@ class AgentMechanismInterface:
     def __copy__(self):
         return AgentMechanismInterface(**self.__dict__)
 
-    def __deepcopy__(self, memodict={}):
-        d = {k: deepcopy(v) for k, v in self.__dict__.items()}
+    def __deepcopy__(self, memodict=None):
+        d = {k: deepcopy(v, memodict) for k, v in self.__dict__.items()}
         return AgentMechanismInterface(**d)
 
     def __getitem__(self, item):
@@ -389,6 +399,7 @@ class NamedObject(object):
             "_Entity__current_step",
             "_step",
         ),
+        writer: Optional[Callable[[Path, bytes, Path, Dict[str, Any]], None]] = None,
     ) -> Path:
         """
         Saves a checkpoint of the current object at  the given path.
@@ -403,6 +414,9 @@ class NamedObject(object):
             step_attribs: Attributes to represent the time-step of the object. Any of the given attributes will be
                           used in the file name generated if single_checkpoint is False. If single_checkpoint is True, the
                           filename will not contain time-step information
+            writer: If given, the object is serialized immediately and the writer is called with the file name, the
+                    serialized object, the info file name and the info instead of writing them (e.g. to write them in
+                    the background).
 
         Returns:
             full path to the file used to save the checkpoint
@@ -450,10 +464,14 @@ class NamedObject(object):
                 f"{str(file_name)} already exists. Pass exist_ok=True if you want to override it"
             )
 
+        info_file_name = path / (base_name + ".json")
+        if writer is not None:
+            writer(file_name, dill.dumps(self), info_file_name, info)
+            return file_name
+
         with open(file_name, "wb") as f:
             dill.dump(self, f)
 
-        info_file_name = path / (base_name + ".json")
         dump(info, info_file_name)
         return file_name
 
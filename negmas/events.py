@@ -2,7 +2,7 @@
 import itertools
 import random
 from collections import defaultdict
-from typing import Any, Dict, Union, Optional, Set, Callable, List
+from typing import Any, Dict, Union, Optional, Set, Callable, List, Iterable, Tuple
 
 from dataclasses import dataclass
 
@@ -25,30 +25,187 @@ class Event:
     data: Any
 
 
+def _lookup(data: Any, path: str) -> Any:
+    """Gets a (possibly nested) field of event data given a dotted path (e.g. "value.product")"""
+    for name in path.split("."):
+        try:
+            data = data[name]
+        except (KeyError, TypeError, IndexError):
+            data = getattr(data, name)
+    return data
+
+
+class _Listeners:
+    """The listeners registered for a single event type (see `EventSource.register_listener`).
+
+    Listeners with a data filter are kept in dispatch tables indexed by the filtered values so that finding the
+    listeners interested in an event does not depend on the number of listeners that are not.
+    """
+
+    def __init__(self):
+        self.unfiltered: List["EventSink"] = []
+        self.keyed: Dict[
+            Tuple[str, ...],
+            Dict[Tuple, List[Tuple["EventSink", Optional[Callable[[Event], bool]]]]],
+        ] = {}
+        self.conditional: List[Tuple["EventSink", Callable[[Event], bool]]] = []
+
+    def add(
+        self,
+        listener: "EventSink",
+        condition: Optional[Callable[[Event], bool]] = None,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if data:
+            keys = tuple(sorted(data.keys()))
+            values = tuple(data[_] for _ in keys)
+            self.keyed.setdefault(keys, {}).setdefault(values, []).append(
+                (listener, condition)
+            )
+        elif condition is not None:
+            self.conditional.append((listener, condition))
+        else:
+            self.unfiltered.append(listener)
+
+    def remove(self, listener: "EventSink") -> bool:
+        n = len(self)
+        self.unfiltered = [_ for _ in self.unfiltered if _ is not listener]
+        self.conditional = [_ for _ in self.conditional if _[0] is not listener]
+        for table in self.keyed.values():
+            for values, entries in table.items():
+                table[values] = [_ for _ in entries if _[0] is not listener]
+        return len(self) < n
+
+    def match(self, event: Event) -> List["EventSink"]:
+        """The listeners interested in the given event (the returned list must not be modified)"""
+        if not self.keyed and not self.conditional:
+            return self.unfiltered
+        listeners = list(self.unfiltered)
+        for keys, table in self.keyed.items():
+            try:
+                entries = table.get(tuple(_lookup(event.data, _) for _ in keys), ())
+            except (AttributeError, TypeError):
+                continue
+            listeners += [l for l, c in entries if c is None or c(event)]
+        listeners += [l for l, c in self.conditional if c(event)]
+        return listeners
+
+    def __len__(self):
+        return (
+            len(self.unfiltered)
+            + len(self.conditional)
+            + sum(len(_) for table in self.keyed.values() for _ in table.values())
+        )
+
+
 class EventSource:
-    """An object capable of raising events"""
+    """An object capable of raising events.
+
+    Listeners are registered for an event type and can optionally restrict the events they receive using a
+    `condition` on the event or a `data` filter (see `register_listener`). Data filters are indexed so that only
+    matching listeners are visited when an event is announced.
+
+    Examples:
+
+        >>> class Printer(EventSink):
+        ...     def __init__(self, name):
+        ...         self.name = name
+        ...     def on_event(self, event, sender):
+        ...         print(self.name, event.data["product"])
+        >>> source = EventSource()
+        >>> source.register_listener("new_cfp", Printer("any"))
+        >>> source.register_listener("new_cfp", Printer("p1"), data={"product": 1})
+        >>> source.register_listener("new_cfp", Printer("odd"), condition=lambda e: e.data["product"] % 2 == 1)
+        >>> source.announce(Event("new_cfp", {"product": 1}))
+        any 1
+        p1 1
+        odd 1
+        >>> source.announce(Event("new_cfp", {"product": 2}))
+        any 2
+
+    """
 
     def __init__(self):
         super().__init__()
-        self.__sinks: Dict[str, list] = defaultdict(list)
+        self.__sinks: Dict[str, _Listeners] = {}
+        self.__rng: Optional[random.Random] = None
+
+    def set_listener_order(self, shuffle: bool = True, seed: Optional[int] = None):
+        """Sets whether listeners are called in a random order for every event (by default they are called in a fixed
+        order: unfiltered listeners in registration order followed by filtered ones).
+
+        Args:
+            shuffle: If true, the listeners of every event are shuffled before they are called
+            seed: The seed of the random number generator used for shuffling (if None, a random seed is used)
+        """
+        self.__rng = random.Random(seed) if shuffle else None
+
+    def _listeners_of(self, event: Event) -> List["EventSink"]:
+        listeners = self.__sinks.get(event.type, None)
+        if listeners is None:
+            return []
+        listeners = listeners.match(event)
+        if self.__rng is not None and len(listeners) > 1:
+            listeners = list(listeners)
+            self.__rng.shuffle(listeners)
+        return listeners
 
     def announce(self, event: Event):
         """Raises an event and informs all event sinks that are registerd for notifications
-        on this event type"""
-
-        sinks = self.__sinks.get(event.type, [])
-        random.shuffle(sinks)
-        for sink in sinks:
+        on this event type (and whose filters match it)"""
+        for sink in self._listeners_of(event):
             sink.on_event(event=event, sender=self)
 
-    def register_listener(self, event_type: str, listener: "EventSink"):
-        self.__sinks[event_type].append(listener)
+    def announce_many(self, events: Iterable[Event]):
+        """Raises a batch of events (e.g. all events of a simulation step). Every event sink is informed once (by
+        calling its `on_events`) with the list of events it is interested in (in the order they were given)"""
+        batches: Dict[int, Tuple["EventSink", List[Event]]] = {}
+        for event in events:
+            for sink in self._listeners_of(event):
+                batch = batches.get(id(sink), None)
+                if batch is None:
+                    batches[id(sink)] = (sink, [event])
+                else:
+                    batch[1].append(event)
+        for sink, batch in batches.values():
+            sink.on_events(events=batch, sender=self)
+
+    def register_listener(
+        self,
+        event_type: str,
+        listener: "EventSink",
+        condition: Optional[Callable[[Event], bool]] = None,
+        data: Optional[Dict[str, Any]] = None,
+    ):
+        """Registers a listener for some event type.
+
+        Args:
+            event_type: The type of events to listen to
+            listener: The listener (its `on_event` will be called for every matching event)
+            condition: If given, only events for which it returns True are passed to the listener
+            data: If given, only events with data having the given values are passed to the listener. Keys can be
+                  dotted paths to nested fields or attributes (e.g. {"section": "cfps", "value.product": 3})
+        """
+        listeners = self.__sinks.get(event_type, None)
+        if listeners is None:
+            listeners = self.__sinks[event_type] = _Listeners()
+        listeners.add(listener, condition, data)
+
+    def unregister_listener(self, event_type: str, listener: "EventSink") -> bool:
+        """Removes a listener from all registrations for the given event type. Returns whether it was registered"""
+        listeners = self.__sinks.get(event_type, None)
+        return listeners is not None and listeners.remove(listener)
 
 
 class EventSink:
     def on_event(self, event: Event, sender: EventSource):
         pass
 
+    def on_events(self, events: List[Event], sender: EventSource):
+        """Called with a batch of events (see `EventSource.announce_many`). By default, calls `on_event` for each"""
+        for event in events:
+            self.on_event(event=event, sender=sender)
+
 
 @dataclass
 class Notification:
@@ -0,0 +1,201 @@
+r"""Efficient calculation of pareto frontiers.
+
+All functions in this module work on a precomputed utility matrix with one row per outcome and one column per
+utility function (see `UtilityFunction.eval_many` for a fast way to calculate it).
+
+- Two dimensional problems (bilateral negotiations) are solved with a sort-and-sweep in :math:`O(n \log n)`.
+- Higher dimensional problems are solved with a sort-filter-skyline algorithm: points are sorted by welfare (so that
+  no point can be dominated by a point that comes after it) and filtered in blocks against the frontier found so far
+  and against each other using vectorized block-vs-block comparisons.
+
+Examples:
+
+    >>> import numpy as np
+    >>> utils = np.array([[0.1, 0.9], [0.5, 0.5], [0.4, 0.4], [0.9, 0.1], [0.5, 0.5]])
+    >>> indices, frontier = pareto_frontier_points(utils)
+    >>> indices.tolist()
+    [3, 1, 0]
+    >>> frontier.tolist()
+    [[0.9, 0.1], [0.5, 0.5], [0.1, 0.9]]
+
+"""
+from typing import Tuple
+
+import numpy as np
+
+__all__ = ["pareto_frontier_points", "is_pareto_optimal"]
+
+BLOCK_SIZE = 1024
+"""Number of candidate points compared at once against the frontier in the k-D skyline"""
+
+
+def _descending_keys(points: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Returns `np.lexsort` keys sorting points descendingly by the first column then the second etc"""
+    return tuple(-points[:, j] for j in range(points.shape[1] - 1, -1, -1))
+
+
+def _sweep_2d(points: np.ndarray, eps: float) -> np.ndarray:
+    """Finds the frontier of 2D points returning the indices ordered by the first utility descendingly"""
+    # sort by the first utility then the second (both descendingly). lexsort is stable so the first of any set of
+    # identical points is the one kept
+    order = np.lexsort((-points[:, 1], -points[:, 0]))
+    second = points[order, 1]
+    if eps <= 0.0:
+        best_so_far = np.maximum.accumulate(second)
+        keep = np.empty(len(order), dtype=bool)
+        keep[0] = True
+        keep[1:] = second[1:] > best_so_far[:-1]
+        return order[keep]
+    keep = []
+    best = float("-inf")
+    for i, u in enumerate(second):
+        if u > best + eps:
+            keep.append(i)
+            best = u
+    return order[keep]
+
+
+def _dominated_by(frontier: np.ndarray, candidates: np.ndarray, eps: float) -> np.ndarray:
+    """Marks the candidates that are (epsilon-)dominated by any of the frontier points"""
+    dominated = np.zeros(len(candidates), dtype=bool)
+    shifted = candidates - eps
+    for start in range(0, len(frontier), BLOCK_SIZE):
+        chunk = frontier[start : start + BLOCK_SIZE]
+        # a (chunk x candidates) matrix built one dimension at a time to keep memory bounded
+        ge = chunk[:, None, 0] >= shifted[None, :, 0]
+        for j in range(1, candidates.shape[1]):
+            ge &= chunk[:, None, j] >= shifted[None, :, j]
+        dominated |= ge.any(axis=0)
+    return dominated
+
+
+def _block_frontier(candidates: np.ndarray, eps: float) -> np.ndarray:
+    """Marks the candidates (sorted by welfare) that are not dominated by earlier accepted candidates"""
+    shifted = candidates - eps
+    # ge[i, j] is True if candidate j comes before candidate i and dominates it
+    ge = candidates[None, :, 0] >= shifted[:, None, 0]
+    for j in range(1, candidates.shape[1]):
+        ge &= candidates[None, :, j] >= shifted[:, None, j]
+    ge &= np.tri(len(candidates), k=-1, dtype=bool)
+    if eps <= 0.0:
+        # dominance is transitive so a candidate dominated by a rejected candidate is also dominated by an
+        # accepted one
+        return ~ge.any(axis=1)
+    # epsilon-dominance is not transitive: accept candidates in order dropping all of those they dominate
+    keep = np.zeros(len(candidates), dtype=bool)
+    undecided = np.ones(len(candidates), dtype=bool)
+    while True:
+        i = int(undecided.argmax())
+        if not undecided[i]:
+            return keep
+        keep[i] = True
+        undecided[i] = False
+        undecided &= ~ge[:, i]
+
+
+def _skyline(points: np.ndarray, eps: float) -> np.ndarray:
+    """Finds the frontier of k-D points returning the indices ordered by welfare descendingly"""
+    # after sorting by welfare no point can be dominated by a point that comes after it
+    order = np.lexsort(_descending_keys(points) + (-points.sum(axis=1),))
+    # the frontier found so far is kept in a buffer that grows by doubling
+    frontier = np.empty(
+        (min(len(order), BLOCK_SIZE), points.shape[1]), dtype=points.dtype
+    )
+    n_found = 0
+    indices = []
+    for start in range(0, len(order), BLOCK_SIZE):
+        block = order[start : start + BLOCK_SIZE]
+        candidates = points[block]
+        # drop candidates dominated by the frontier found so far
+        if n_found:
+            survivors = ~_dominated_by(frontier[:n_found], candidates, eps)
+            block, candidates = block[survivors], candidates[survivors]
+        if not len(block):
+            continue
+        # resolve dominance within the surviving candidates of the block
+        keep = _block_frontier(candidates, eps)
+        block, candidates = block[keep], candidates[keep]
+        if n_found + len(block) > len(frontier):
+            grown = np.empty(
+                (max(2 * len(frontier), n_found + len(block)), frontier.shape[1]),
+                dtype=frontier.dtype,
+            )
+            grown[:n_found] = frontier[:n_found]
+            frontier = grown
+        frontier[n_found : n_found + len(block)] = candidates
+        n_found += len(block)
+        indices.append(block)
+    return np.concatenate(indices).astype(np.int64)
+
+
+def pareto_frontier_points(
+    points: np.ndarray, eps: float = 0.0, sort_by_welfare: bool = False
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Finds the pareto frontier of a set of points.
+
+    Args:
+        points: An (n_outcomes x n_ufuns) utility matrix. Rows containing `nan` are never on the frontier.
+        eps: If positive, epsilon-dominance is used: a point is dropped if a frontier point is at most `eps` worse
+             than it in every dimension. This gives smaller (approximate) frontiers.
+        sort_by_welfare: If True, the frontier is sorted descendingly by welfare (sum of utilities) otherwise it is
+                         sorted descendingly by the first utility (then the second, etc).
+
+    Returns:
+        A tuple of the indices (rows) of the frontier points and their utilities as an (n_frontier x n_ufuns) array.
+
+    Examples:
+
+        >>> utils = np.array([[1.0, 0.0, 0.5], [0.0, 1.0, 0.5], [0.5, 0.5, 0.5]
+        ...                   , [0.4, 0.4, 0.4], [0.2, 1.0, 0.0]])
+        >>> pareto_frontier_points(utils)[0].tolist()
+        [0, 2, 4, 1]
+        >>> pareto_frontier_points(utils, sort_by_welfare=True)[0].tolist()
+        [0, 2, 1, 4]
+        >>> near = np.array([[1.0, 0.0], [0.95, 0.02], [0.0, 1.0]])
+        >>> pareto_frontier_points(near)[0].tolist()
+        [0, 1, 2]
+        >>> pareto_frontier_points(near, eps=0.05)[0].tolist()
+        [0, 2]
+
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim != 2:
+        raise ValueError(
+            f"Expected a 2D utility matrix but got one with shape {points.shape}"
+        )
+    n, n_ufuns = points.shape
+    if n == 0 or n_ufuns == 0:
+        return np.empty(0, dtype=np.int64), np.empty((0, n_ufuns))
+    valid = np.nonzero(~np.isnan(points).any(axis=1))[0]
+    if len(valid) == 0:
+        return np.empty(0, dtype=np.int64), np.empty((0, n_ufuns))
+    candidates = points[valid]
+    if n_ufuns == 1:
+        best = candidates[:, 0].max()
+        indices = np.nonzero(candidates[:, 0] >= best - max(eps, 0.0))[0][:1]
+    elif n_ufuns == 2:
+        indices = _sweep_2d(candidates, eps)
+    else:
+        indices = _skyline(candidates, eps)
+        # use the same order as the 2D case
+        found = candidates[indices]
+        indices = indices[np.lexsort(_descending_keys(found))]
+    indices = valid[indices]
+    if sort_by_welfare:
+        indices = indices[np.argsort(-points[indices].sum(axis=1), kind="stable")]
+    return indices, points[indices]
+
+
+def is_pareto_optimal(points: np.ndarray, eps: float = 0.0) -> np.ndarray:
+    """Returns a boolean mask marking the rows of the utility matrix that are on the pareto frontier.
+
+    Examples:
+
+        >>> is_pareto_optimal(np.array([[1.0, 0.0], [0.5, 0.5], [0.2, 0.2]])).tolist()
+        [True, True, False]
+
+    """
+    points = np.asarray(points, dtype=np.float64)
+    mask = np.zeros(len(points), dtype=bool)
+    mask[pareto_frontier_points(points, eps=eps)[0]] = True
+    return mask
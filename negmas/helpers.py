@@ -4,6 +4,8 @@
 This set of utlities can be extended but must be backward compatible for at
 least two versions
 """
+import atexit
+import bisect
 import datetime
 import importlib
 import json
@@ -11,8 +13,13 @@ import logging
 import math
 import pathlib
 import pickle
+import queue
 import string
 import sys
+import threading
+import time
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
 from typing import (
     List,
     Optional,
@@ -50,6 +57,9 @@ import copy
 
 __all__ = [
     "create_loggers",
+    "log_enabled",
+    "EventLogger",
+    "TimingStats",
     # 'MultiIssueUtilityFunctionMapping',
     "ReturnCause",
     "Distribution",  # A probability distribution
@@ -111,6 +121,7 @@ def create_loggers(
     colored: bool = True,
     app_wide_log_file: bool = True,
     module_wide_log_file: bool = False,
+    buffered: bool = False,
 ) -> logging.Logger:
     """
     Create a set of loggers to report feedback.
@@ -130,6 +141,8 @@ def create_loggers(
         file_level: level of the file logger
         format_str: the format of logged items
         colored: whether or not to try using colored logs
+        buffered: If true, records are passed to the file through a queue and written by a background thread so that
+                  logging never blocks on file I/O.
 
     Returns:
         logging.Logger: The logger
@@ -187,10 +200,330 @@ def create_loggers(
         file_logger = logging.FileHandler(file_name)
         file_logger.setLevel(file_level)
         file_logger.setFormatter(formatter)
+        if buffered:
+            records = queue.Queue(-1)
+            listener = QueueListener(records, file_logger, respect_handler_level=True)
+            listener.start()
+            atexit.register(listener.stop)
+            file_logger = QueueHandler(records)
+            file_logger.setLevel(file_level)
         logger.addHandler(file_logger)
     return logger
 
 
+def log_enabled(logger: logging.Logger, level: int) -> bool:
+    """
+    Checks whether a message at the given level would be emitted by any handler of the logger.
+
+    `create_loggers` sets the level of the logger itself to DEBUG and filters using the levels of its handlers which
+    means that `logger.isEnabledFor` is always true. This function checks the handlers as well so that callers can
+    skip building messages that will be dropped anyway.
+
+    Args:
+        logger: The logger
+        level: The level of the message (e.g. `logging.DEBUG`)
+
+    Returns:
+        bool: True if at least one handler reachable from the logger accepts messages at this level
+
+    Examples:
+
+        >>> log = logging.getLogger("negmas_doctest_log_enabled")
+        >>> log.setLevel(logging.DEBUG)
+        >>> log.propagate = False
+        >>> handler = logging.NullHandler()
+        >>> handler.setLevel(logging.WARNING)
+        >>> log.addHandler(handler)
+        >>> log_enabled(log, logging.DEBUG), log_enabled(log, logging.ERROR)
+        (False, True)
+        >>> log.removeHandler(handler)
+
+    """
+    if not logger.isEnabledFor(level):
+        return False
+    found = False
+    current = logger
+    while current is not None:
+        for handler in current.handlers:
+            found = True
+            if level >= handler.level:
+                return True
+        if not current.propagate:
+            break
+        current = current.parent
+    if not found:
+        return logging.lastResort is not None and level >= logging.lastResort.level
+    return False
+
+
+class EventLogger:
+    """
+    Records structured events to a file in JSON lines format without blocking the caller on I/O.
+
+    Every event is a single line with the keys `step`, `entity`, `kind` and `data`. Events are buffered in memory and
+    handed to the writer in batches of `flush_every` events. If `background` is true, batches are serialized and
+    written by a daemon thread.
+
+    Args:
+        file_name: The file to write events to (it is created along with its parent folder if needed).
+        flush_every: The number of events to buffer before passing them to the writer.
+        background: If true, a background thread serializes and writes the events.
+
+    Remarks:
+        - Payloads are serialized when written (possibly in the background thread) not when logged. Do not mutate
+          them after logging. Objects that cannot be serialized to JSON are converted using `str`.
+        - Call `close` (or use the logger as a context manager) to make sure all events reach the file.
+
+    Examples:
+
+        >>> import tempfile
+        >>> file_name = os.path.join(tempfile.mkdtemp(), "events.jsonl")
+        >>> with EventLogger(file_name, flush_every=2) as events:
+        ...     events.log(0, "a1", "contract-signed", {"id": "c1"})
+        ...     events.log(1, "a2", "breach")
+        >>> with open(file_name) as f:
+        ...     [json.loads(_)["kind"] for _ in f]
+        ['contract-signed', 'breach']
+
+    """
+
+    def __init__(
+        self, file_name: str, flush_every: int = 1000, background: bool = True
+    ):
+        self.file_name = str(file_name)
+        self.flush_every = max(1, flush_every)
+        self.background = background
+        self._buffer: List[Tuple[int, Optional[str], str, Any]] = []
+        self._closed = False
+        os.makedirs(os.path.dirname(os.path.abspath(self.file_name)), exist_ok=True)
+        self._file = open(self.file_name, "a")
+        self._batches: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        if background:
+            self._batches = queue.Queue()
+            self._thread = threading.Thread(target=self._write_batches, daemon=True)
+            self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def log(self, step: int, entity: Optional[str], kind: str, payload: Any = None):
+        """
+        Logs an event.
+
+        Args:
+            step: The simulation step of the event
+            entity: The ID of the entity concerned (if any)
+            kind: The kind of the event
+            payload: Any extra data (should be serializable to JSON)
+        """
+        if self._closed:
+            return
+        self._buffer.append((step, entity, kind, payload))
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self, wait: bool = False) -> None:
+        """
+        Passes all buffered events to the writer.
+
+        Args:
+            wait: If true, blocks until the events are written to the file.
+        """
+        batch, self._buffer = self._buffer, []
+        if self._batches is not None:
+            if batch:
+                self._batches.put(batch)
+            if wait:
+                self._batches.join()
+            return
+        if batch:
+            self._write(batch)
+        if wait:
+            self._file.flush()
+
+    def close(self) -> None:
+        """Writes all remaining events and closes the file"""
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        if self._batches is not None:
+            self._batches.put(None)
+            self._thread.join()
+        self._file.close()
+
+    def _write(self, batch) -> None:
+        self._file.write(
+            "".join(
+                json.dumps(
+                    {"step": step, "entity": entity, "kind": kind, "data": payload},
+                    default=str,
+                )
+                + "\n"
+                for step, entity, kind, payload in batch
+            )
+        )
+
+    def _write_batches(self) -> None:
+        while True:
+            batch = self._batches.get()
+            try:
+                if batch is None:
+                    self._file.flush()
+                    return
+                self._write(batch)
+                self._file.flush()
+            finally:
+                self._batches.task_done()
+
+
+class TimingStats(Mapping):
+    """
+    Accumulates durations (in seconds) under string keys (e.g. the phases of a simulation step) with low overhead.
+
+    For every key, the number of durations added, their total, minimum and maximum and a histogram with logarithmic
+    bins (see `BINS`) are kept. As a mapping, it maps every key to a dict with these values.
+
+    Examples:
+
+        >>> timing = TimingStats()
+        >>> timing.add("signing", 0.002)
+        >>> timing.add("signing", 0.004)
+        >>> with timing.time("execution"):
+        ...     pass
+        >>> sorted(timing.keys())
+        ['execution', 'signing']
+        >>> record = timing["signing"]
+        >>> record["count"], round(record["total"], 3), record["min"], record["max"], record["1ms-10ms"]
+        (2, 0.006, 0.002, 0.004, 2)
+        >>> other = TimingStats()
+        >>> other.add("signing", 2.0)
+        >>> timing.merge(other)["signing"]["count"]
+        3
+        >>> timing.to_frame().loc["signing", ["count", "1ms-10ms", "1s-10s"]].tolist()
+        [3, 2, 1]
+
+    """
+
+    EDGES = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0, 10.0)
+    """Upper edges of the histogram bins (the last bin is open)"""
+    BINS = (
+        "<1us",
+        "1us-10us",
+        "10us-100us",
+        "100us-1ms",
+        "1ms-10ms",
+        "10ms-100ms",
+        "100ms-1s",
+        "1s-10s",
+        ">=10s",
+    )
+    """Names of the histogram bins"""
+
+    def __init__(self):
+        # key -> [count, total, min, max, histogram]
+        self._records: Dict[str, list] = {}
+
+    def add(self, key: str, duration: float) -> None:
+        """Adds a duration (in seconds) under the given key"""
+        record = self._records.get(key, None)
+        if record is None:
+            record = self._records[key] = [0, 0.0, duration, duration, [0] * 9]
+        record[0] += 1
+        record[1] += duration
+        if duration < record[2]:
+            record[2] = duration
+        elif duration > record[3]:
+            record[3] = duration
+        record[4][bisect.bisect_right(self.EDGES, duration)] += 1
+
+    def lap(self, key: str, start: float) -> float:
+        """Adds the time passed since `start` (a `time.perf_counter` value) under the given key and returns the
+        current `time.perf_counter` value (to be used as the start of the next lap)"""
+        now = time.perf_counter()
+        self.add(key, now - start)
+        return now
+
+    @contextmanager
+    def time(self, key: str):
+        """A context manager that adds the time spent inside it under the given key"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(key, time.perf_counter() - start)
+
+    def merge(self, other: "TimingStats") -> "TimingStats":
+        """Adds all durations of another `TimingStats` to this one and returns it"""
+        for key, (count, total, min_, max_, hist) in other._records.items():
+            record = self._records.get(key, None)
+            if record is None:
+                self._records[key] = [count, total, min_, max_, list(hist)]
+                continue
+            record[0] += count
+            record[1] += total
+            record[2] = min(record[2], min_)
+            record[3] = max(record[3], max_)
+            record[4] = [a + b for a, b in zip(record[4], hist)]
+        return self
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        count, total, min_, max_, hist = self._records[key]
+        return dict(
+            count=count,
+            total=total,
+            mean=total / count if count else float("nan"),
+            min=min_,
+            max=max_,
+            **dict(zip(self.BINS, hist)),
+        )
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def __len__(self):
+        return len(self._records)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Returns the accumulated timing with one row per key"""
+        columns = ["count", "total", "mean", "min", "max"] + list(self.BINS)
+        data = pd.DataFrame([self[_] for _ in self._records], columns=columns)
+        data.index = pd.Index(list(self._records), name="key")
+        return data
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame) -> "TimingStats":
+        """Creates a `TimingStats` from the output of `to_frame`"""
+        timing = cls()
+        for key, row in data.iterrows():
+            timing._records[str(key)] = [
+                int(row["count"]),
+                float(row["total"]),
+                float(row["min"]),
+                float(row["max"]),
+                [int(row[_]) for _ in cls.BINS],
+            ]
+        return timing
+
+    def save(self, file_name: Union[str, os.PathLike]) -> None:
+        """Saves the accumulated timing to a csv file"""
+        self.to_frame().to_csv(str(file_name))
+
+    @classmethod
+    def load(cls, file_name: Union[str, os.PathLike]) -> "TimingStats":
+        """Loads timing saved using `save`"""
+        return cls.from_frame(
+            pd.read_csv(str(file_name), index_col="key", float_precision="round_trip")
+        )
+
+
 def snake_case(s: str) -> str:
     """ Converts a string from CamelCase to snake_case
 
@@ -1,10 +1,15 @@
 """Provides interfaces for defining negotiation mechanisms.
 """
+import copy
+import io
 import itertools
 import math
 import pprint
+import random
 import time
 import uuid
+import weakref
+import concurrent.futures as futures
 from abc import abstractmethod, ABC
 from collections import defaultdict
 from pathlib import Path
@@ -19,8 +24,11 @@ from typing import (
     Set,
     Type,
     Collection,
+    MutableMapping,
 )
 
+import dill
+import numpy as np
 import pandas as pd
 from dataclasses import dataclass
 
@@ -29,8 +37,8 @@ from negmas.outcomes import (
     outcome_is_valid,
     Issue,
     Outcome,
-    enumerate_outcomes,
     outcome_as_tuple,
+    OutcomeSpace,
 )
 from negmas.common import (
     AgentMechanismInterface,
@@ -39,10 +47,11 @@ from negmas.common import (
     NamedObject,
 )
 from negmas.checkpoints import CheckpointMixin
+from negmas.traces import NegotiationTrace, HISTORY_MODES
 from negmas.common import NegotiatorInfo
 from negmas.events import *
 from negmas.generics import ikeys
-from negmas.helpers import snake_case
+from negmas.helpers import snake_case, TimingStats
 from negmas.negotiators import Negotiator
 
 __all__ = ["Mechanism", "Protocol", "MechanismRoundResult"]
@@ -73,7 +82,10 @@ class Mechanism(NamedObject, EventSource, CheckpointMixin, ABC):
     Override the `round` function of this class to implement a round of your mechanism
     """
 
-    all: Dict[str, "Mechanism"] = {}
+    all: MutableMapping[str, "Mechanism"] = weakref.WeakValueDictionary()
+    """All mechanisms in existence by ID. Mechanisms are held weakly so this registry does not keep them alive"""
+    _state_independent_attributes: Set[str] = set()
+    """Attributes that do not affect the state. Changing them does not invalidate the cached state"""
     register_all_mechanisms(all)
 
     def __init__(
@@ -97,6 +109,8 @@ class Mechanism(NamedObject, EventSource, CheckpointMixin, ABC):
         extra_checkpoint_info: Dict[str, Any] = None,
         single_checkpoint: bool = True,
         exist_ok: bool = True,
+        history_mode: str = "full",
+        timing_stats: Optional[TimingStats] = None,
         name=None,
     ):
         """
@@ -108,7 +122,8 @@ class Mechanism(NamedObject, EventSource, CheckpointMixin, ABC):
             time_limit: Number of real seconds allowed (None means infinity)
             max_n_agents:  Maximum allowed number of agents
             dynamic_entry: Allow agents to enter/leave negotiations between rounds
-            cache_outcomes: If true, a list of all possible outcomes will be cached
+            cache_outcomes: If true, a list of all possible outcomes will be cached. Outcome spaces of countable
+                            issues are shared between mechanisms through `OutcomeSpace.cache`
             max_n_outcomes: The maximum allowed number of outcomes in the cached set
             keep_issue_names: If True, dicts with issue names will be used for outcomes otherwise tuples
             annotation: Arbitrary annotation
@@ -122,6 +137,11 @@ class Mechanism(NamedObject, EventSource, CheckpointMixin, ABC):
             extra_checkpoint_info: Any extra information to save with the checkpoint in the corresponding json file as
                                    a dictionary with string keys
             exist_ok: IF true, checkpoints override existing checkpoints with the same filename.
+            history_mode: What to keep about the history of the negotiation. "full" keeps the state after every step
+                          (see `history`) and a compact `trace` of all offers, "offers" keeps only the `trace` and
+                          "none" keeps nothing.
+            timing_stats: If given, the durations of every step and of the `round` in it are added to it under the keys
+                          "<mechanism type>.step" and "<mechanism type>.round" (it can be shared between mechanisms).
             name: Name of the mechanism session. Should be unique. If not given, it will be generated.
         """
         super().__init__(name=name)
@@ -144,11 +164,11 @@ class Mechanism(NamedObject, EventSource, CheckpointMixin, ABC):
             if outcomes is None:
                 __issues = []
                 outcomes = []
+            elif isinstance(outcomes, int):
+                __issues = [Issue(outcomes, name=0)]
+                outcomes = OutcomeSpace.shared(__issues, keep_issue_names=False)
             else:
-                if isinstance(outcomes, int):
-                    outcomes = [(_,) for _ in range(outcomes)]
-                else:
-                    outcomes = list(outcomes)
+                outcomes = list(outcomes)
                 n_issues = len(outcomes[0])
                 issues = []
                 issue_names = ikeys(outcomes[0])
@@ -173,7 +193,7 @@ class Mechanism(NamedObject, EventSource, CheckpointMixin, ABC):
                             if n_outcomes > max_n_outcomes:
                                 break
                         else:
-                            outcomes = enumerate_outcomes(
+                            outcomes = OutcomeSpace.shared(
                                 __issues, keep_issue_names=keep_issue_names
                             )
 
@@ -202,7 +222,10 @@ class Mechanism(NamedObject, EventSource, CheckpointMixin, ABC):
         # create a couple of ways to access outcomes by indices effeciently
         self.outcome_indices = []
         self.__outcome_index = None
-        if self.__outcomes is not None and cache_outcomes:
+        if isinstance(self.__outcomes, OutcomeSpace):
+            # the outcome space encodes outcomes directly. No need for an index
+            self.outcome_indices = range(len(self.__outcomes))
+        elif self.__outcomes is not None and cache_outcomes:
             self.outcome_indices = range(len(self.__outcomes))
             self.__outcome_index = dict(
                 zip(
@@ -225,12 +248,23 @@ class Mechanism(NamedObject, EventSource, CheckpointMixin, ABC):
             annotation=annotation,
         )
 
+        if history_mode not in HISTORY_MODES:
+            raise ValueError(
+                f"Unknown history mode {history_mode}. Allowed values are {HISTORY_MODES}"
+            )
+        self._history_mode = history_mode
         self._history = []
+        self._trace = (
+            NegotiationTrace(outcomes=self.__outcomes)
+            if history_mode != "none"
+            else None
+        )
         # if self.ami.issues is not None:
         #     self.ami.issues = tuple(self.ami.issues)
         # if self.ami.outcomes is not None:
         #     self.ami.outcomes = tuple(self.ami.outcomes)
         self._state_factory = state_factory
+        self.timing_stats = timing_stats
         Mechanism.all[self.id] = self
 
         self._requirements = {}
@@ -247,6 +281,7 @@ class Mechanism(NamedObject, EventSource, CheckpointMixin, ABC):
         self._error = False
         self._error_details = ""
         self._waiting = False
+        self._closed = False
         self.__discrete_outcomes: List[Outcome] = None
         self._enable_callbacks = enable_callbacks
 
@@ -257,6 +292,8 @@ class Mechanism(NamedObject, EventSource, CheckpointMixin, ABC):
         """Returns the index of the outcome if that was possible"""
         if self.__outcomes is None:
             return None
+        if isinstance(self.__outcomes, OutcomeSpace):
+            return self.__outcomes.index(outcome)
         if self.__outcome_index is not None:
             return self.__outcome_index[outcome_as_tuple(outcome)]
         return self.__outcomes.index(outcome)
@@ -338,6 +375,10 @@ class Mechanism(NamedObject, EventSource, CheckpointMixin, ABC):
         """
         if self.ami.issues is None or len(self.ami.issues) == 0:
             raise ValueError("I do not have any issues to generate offers from")
+        if isinstance(self.__outcomes, OutcomeSpace):
+            return self.__outcomes.decode_many(
+                self.__outcomes.sample(n), astype=astype
+            )
         return Issue.sample(
             issues=self.issues,
             n_outcomes=n,
@@ -437,12 +478,25 @@ class Mechanism(NamedObject, EventSource, CheckpointMixin, ABC):
 
         if negotiator.join(ami=self.ami, state=self.state, ufun=ufun, role=role):
             self._negotiators.append(negotiator)
+            self._dissociate_on_collection(negotiator)
             self._roles.append(role)
             self.role_of_agent[negotiator.uuid] = role
             self.agents_of_role[role].append(negotiator)
             return True
         return None
 
+    def _dissociate_on_collection(self, negotiator: "Negotiator") -> None:
+        """Dissociates the negotiator from the mechanism when the mechanism is garbage collected.
+
+        Remarks:
+            - The `AgentMechanismInterface` of the negotiator looks the mechanism up in `Mechanism.all` which does not
+              keep it alive so the negotiator must not keep referring to it after it is collected.
+        """
+        finalizer = weakref.finalize(
+            self, _dissociate_if_in, weakref.ref(negotiator), self.id
+        )
+        finalizer.atexit = False
+
     def remove(self, agent: "Negotiator", **kwargs) -> Optional[bool]:
         """Remove the agent from the negotiation.
 
@@ -466,6 +520,41 @@ class Mechanism(NamedObject, EventSource, CheckpointMixin, ABC):
             agent.on_leave(self.ami, **kwargs)
         return True
 
+    def close(self) -> None:
+        """Releases the negotiators, history, trace and cached outcomes of the mechanism and unregisters it.
+
+        Remarks:
+            - Call it when only the final results of the negotiation are needed. The `state` (e.g. the agreement)
+              stays accessible but the mechanism cannot be stepped anymore.
+            - Negotiators are dissociated from the mechanism so that they (and their utility functions) are not kept
+              alive by it and can join other negotiations.
+            - Mechanisms are not kept alive by `Mechanism.all` anyway. Closing only makes sure that whatever the
+              mechanism refers to is released even if the mechanism itself is still referenced.
+        """
+        d = self.__dict__
+        if d.get("_closed", False):
+            return
+        state = self.state
+        for negotiator in self._negotiators:
+            if negotiator._mechanism_id == self.id:
+                negotiator._dissociate()
+        d["_negotiators"] = []
+        d["_roles"] = []
+        d["agents_of_role"] = defaultdict(list)
+        d["role_of_agent"] = {}
+        d["_history"] = []
+        d["_trace"] = None
+        d["_Mechanism__outcome_index"] = None
+        d["_Mechanism__discrete_outcomes"] = None
+        d["_EventSource__sinks"] = {}
+        d["_running"] = False
+        d["_closed"] = True
+        # keep the final state
+        d["_cached_state"] = state
+        d["_cached_state_key"] = (d.get("_state_version", 0), 0)
+        if Mechanism.all.get(self.id, None) is self:
+            del Mechanism.all[self.id]
+
     def add_requirements(self, requirements: dict) -> None:
         """Adds requirements."""
         requirements = {
@@ -693,25 +782,39 @@ class Mechanism(NamedObject, EventSource, CheckpointMixin, ABC):
             - There is another function (`run()`) that runs the whole mechanism in blocking mode
 
         """
+        if self.timing_stats is None:
+            return self._step_once()
+        start = time.perf_counter()
+        try:
+            return self._step_once()
+        finally:
+            self.timing_stats.add(
+                f"{self.__class__.__name__}.step", time.perf_counter() - start
+            )
+
+    def _step_once(self) -> MechanismState:
+        if self._closed:
+            return self.state
         self.checkpoint_on_step_started()
+        self._invalidate_state()
         if self.time > self.time_limit:
             self._agreement, self._broken, self._timedout = None, False, True
-            self._history.append(self.state)
+            self._record_state()
             self.on_negotiation_end()
             return self.state
         if len(self._negotiators) < 2:
             if self.ami.dynamic_entry:
-                self._history.append(self.state)
+                self._record_state()
                 return self.state
             else:
-                self.ami.state.running = False
+                self._running = False
                 self._agreement, self._broken, self._timedout = None, False, False
-                self._history.append(self.state)
+                self._record_state()
                 self.on_negotiation_end()
                 return self.state
 
         if self._broken or self._timedout or self._agreement is not None:
-            self._history.append(self.state)
+            self._record_state()
             return self.state
 
         if not self._running:
@@ -721,7 +824,7 @@ class Mechanism(NamedObject, EventSource, CheckpointMixin, ABC):
             self._started = True
             if self.on_negotiation_start() is False:
                 self._agreement, self._broken, self._timedout = None, False, False
-                self._history.append(self.state)
+                self._record_state()
                 return self.state
             if self._enable_callbacks:
                 for a in self.negotiators:
@@ -734,7 +837,7 @@ class Mechanism(NamedObject, EventSource, CheckpointMixin, ABC):
             ):
                 self._running = False
                 self._agreement, self._broken, self._timedout = None, False, True
-                self._history.append(self.state)
+                self._record_state()
                 self.on_negotiation_end()
                 return self.state
 
@@ -746,6 +849,8 @@ class Mechanism(NamedObject, EventSource, CheckpointMixin, ABC):
         step_start = time.perf_counter()
         result = self.round()
         step_time = time.perf_counter() - step_start
+        if self.timing_stats is not None:
+            self.timing_stats.add(f"{self.__class__.__name__}.round", step_time)
         self._error, self._error_details, self._waiting = (
             result.error,
             result.error_details,
@@ -770,7 +875,7 @@ class Mechanism(NamedObject, EventSource, CheckpointMixin, ABC):
             if self._enable_callbacks:
                 for agent in self._negotiators:
                     agent.on_round_end(state=self.state)
-            self._history.append(self.state)
+            self._record_state()
             self._step += 1
         if not self._running:
             self.on_negotiation_end()
@@ -778,7 +883,11 @@ class Mechanism(NamedObject, EventSource, CheckpointMixin, ABC):
 
     @classmethod
     def runall(
-        cls, mechanisms: List["Mechanism"], keep_order=True
+        cls,
+        mechanisms: List["Mechanism"],
+        keep_order=True,
+        parallelism: str = "serial",
+        max_workers: Optional[int] = None,
     ) -> List[MechanismState]:
         """
         Runs all mechanisms
@@ -786,32 +895,177 @@ class Mechanism(NamedObject, EventSource, CheckpointMixin, ABC):
         Args:
             mechanisms: List of mechanisms
             keep_order: if True, the mechanisms will be run in order every step otherwise the order will be randomized
-                        at every step
+                        at every step. Only used for serial execution.
+            parallelism: How to run the mechanisms. "serial" steps them in turn in this process, "threads" runs each
+                         of them to completion in a thread pool and "processes" runs each of them to completion in a
+                         process pool.
+            max_workers: Maximum number of threads/processes to use (None to use the executor's default).
 
         Returns:
             - List of states of all mechanisms after completion
 
+        Remarks:
+            - With "processes", each mechanism is pickled (using dill) with everything reachable from it and run in a
+              worker process. The state of the mechanism and its negotiators is then copied back into the original
+              objects. Changes done in the worker to other objects (e.g. controllers of negotiators) are lost. Use
+              "threads" in that case or if the negotiators cannot be pickled (e.g. they are bound to a bridge).
+            - With "processes", every mechanism gets a seed drawn from `random` in this process so results are
+              deterministic if `random` is seeded. Threads share the random number generators so results are only
+              deterministic if negotiators do not use them.
+            - Event listeners are informed of the end of every negotiation in this process after it is run.
+
         """
-        if not keep_order:
-            raise NotImplementedError(
-                "running mechanisms in random order is not yet supported"
+        if parallelism == "threads":
+            with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return list(
+                    executor.map(
+                        lambda m: m.run() if m is not None else None, mechanisms
+                    )
+                )
+        if parallelism == "processes":
+            seeds = [random.randrange(2 ** 31) for _ in mechanisms]
+            with futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+                running = []
+                for mechanism, seed in zip(mechanisms, seeds):
+                    if mechanism is None:
+                        running.append(None)
+                        continue
+                    running.append(
+                        executor.submit(
+                            _run_in_worker, mechanism._dump_for_worker(), seed
+                        )
+                    )
+                for mechanism, future in zip(mechanisms, running):
+                    if mechanism is not None:
+                        mechanism._load_from_worker(future.result())
+            return [_.state if _ is not None else None for _ in mechanisms]
+        if parallelism != "serial":
+            raise ValueError(
+                f"Unknown parallelism {parallelism}. Allowed values are serial, threads and processes"
             )
 
         completed = [_ is None for _ in mechanisms]
         states = [None] * len(mechanisms)
+        indices = list(range(len(mechanisms)))
         while not all(completed):
-            for i, (done, mechanism) in enumerate(zip(completed, mechanisms)):
-                if done:
+            if not keep_order:
+                random.shuffle(indices)
+            for i in indices:
+                if completed[i]:
                     continue
-                result = mechanism.step()
+                result = mechanisms[i].step()
                 if result.running:
                     continue
                 completed[i] = True
-                states[i] = mechanism.state
+                states[i] = mechanisms[i].state
                 if all(completed):
                     break
         return states
 
+    def _shared_objects(self) -> List[Any]:
+        """Objects that keep their identity when the mechanism is run in a worker process (see `runall`)"""
+        objects = [self]
+        for negotiator in self._negotiators:
+            objects += [
+                negotiator,
+                negotiator.__dict__.get("_Negotiator__parent", None),
+                negotiator._utility_function,
+            ]
+        return objects
+
+    def _dump_for_worker(self) -> bytes:
+        """Pickles the mechanism to be run in a worker process (without its event listeners)"""
+        sinks = self._EventSource__sinks
+        self.__dict__["_EventSource__sinks"] = {}
+        try:
+            return dill.dumps(self)
+        finally:
+            self.__dict__["_EventSource__sinks"] = sinks
+
+    def _dump_results(self) -> bytes:
+        """Pickles the state of the mechanism and its negotiators after running in a worker process"""
+        shared = {id(_): i for i, _ in enumerate(self._shared_objects()) if _ is not None}
+        buffer = io.BytesIO()
+        pickler = dill.Pickler(buffer)
+        pickler.persistent_id = lambda obj: shared.get(id(obj), None)
+        pickler.dump(
+            (
+                {k: v for k, v in self.__dict__.items() if k != "_EventSource__sinks"},
+                [_.__dict__ for _ in self._negotiators],
+            )
+        )
+        return buffer.getvalue()
+
+    def _load_from_worker(self, results: bytes) -> None:
+        """Updates the mechanism and its negotiators with the results of running it in a worker process"""
+        shared = self._shared_objects()
+        negotiators = list(self._negotiators)
+        unpickler = dill.Unpickler(io.BytesIO(results))
+        unpickler.persistent_load = lambda pid: shared[pid]
+        mechanism_state, negotiator_states = unpickler.load()
+        self.__dict__.update(mechanism_state)
+        for negotiator, state in zip(negotiators, negotiator_states):
+            negotiator.__dict__.update(state)
+        self._invalidate_state()
+        Mechanism.all[self.id] = self
+        self.announce(self._negotiation_end_event())
+
+    def _fork_shared(self) -> Iterable[Any]:
+        """Objects that are never modified while negotiating and are shared between the mechanism and its forks (see
+        `fork`)"""
+        yield from (self.ami.issues, self.__outcomes, self.__outcome_index)
+        yield self.__discrete_outcomes
+        yield from self.ami.issues
+        yield from self._history
+        for negotiator in self._negotiators:
+            yield negotiator.__dict__.get("sorted_index", None)
+
+    def fork(self) -> "Mechanism":
+        """Creates an independent copy of the mechanism (with copies of all of its negotiators) that can be run without
+        affecting this mechanism.
+
+        Remarks:
+            - Only the mutable state (negotiators, utility functions, offers, the trace, etc) is copied. Structures that
+              never change while negotiating (issues, outcomes, outcome indices, history states and the sorted
+              utility indices of negotiators) are shared with the fork instead of being copied.
+            - The fork gets a new `id` (and is registered in `Mechanism.all`) so that the `AgentMechanismInterface` of
+              its negotiators refers to it. The fork never saves checkpoints.
+            - Mechanisms with negotiators that live outside of python (e.g. Genius negotiators) cannot be forked.
+
+        Examples:
+
+            >>> from negmas import SAOMechanism, AspirationNegotiator, MappingUtilityFunction
+            >>> m = SAOMechanism(outcomes=10, n_steps=10)
+            >>> _ = m.add(AspirationNegotiator(), ufun=MappingUtilityFunction(lambda x: x[0] / 10))
+            >>> _ = m.add(AspirationNegotiator(), ufun=MappingUtilityFunction(lambda x: 1 - x[0] / 10))
+            >>> _ = m.step()
+            >>> f = m.fork()
+            >>> f.id != m.id, f.ami.issues is m.ami.issues, f.current_step == m.current_step
+            (True, True, True)
+            >>> _ = f.run()
+            >>> f.state.step > m.state.step
+            True
+
+        """
+        cls = self.__class__
+        forked = cls.__new__(cls)
+        memo = {id(_): _ for _ in self._fork_shared() if _ is not None}
+        memo[id(self)] = forked
+        forked.__dict__.update(copy.deepcopy(self.__dict__, memo))
+        forked._fork_rekey(str(uuid.uuid4()))
+        CheckpointMixin.checkpoint_init(forked, step_attrib="_step", folder=None)
+        return forked
+
+    def _fork_rekey(self, id: str) -> None:
+        """Changes the id of a forked mechanism and registers it"""
+        self.id = id
+        self.ami.id = id
+        for negotiator in self._negotiators:
+            if negotiator.__dict__.get("_mechanism_id", None) is not None:
+                negotiator._mechanism_id = id
+                self._dissociate_on_collection(negotiator)
+        Mechanism.all[id] = self
+
     def run(self, timeout=None) -> MechanismState:
         if timeout is None:
             for _ in self:
@@ -846,33 +1100,106 @@ class Mechanism(NamedObject, EventSource, CheckpointMixin, ABC):
         if self._enable_callbacks:
             for a in self.negotiators:
                 a.on_negotiation_end(state=self.state)
-        self.announce(
-            Event(
-                type="negotiation_end",
-                data={
-                    "agreement": self.agreement,
-                    "state": self.state,
-                    "annotation": self.ami.annotation,
-                },
-            )
-        )
+        self.announce(self._negotiation_end_event())
         self.checkpoint_final_step()
 
+    def _negotiation_end_event(self) -> Event:
+        return Event(
+            type="negotiation_end",
+            data={
+                "agreement": self.agreement,
+                "state": self.state,
+                "annotation": self.ami.annotation,
+            },
+        )
+
     def on_negotiation_start(self) -> bool:
         """Called before starting the negotiation. If it returns False then negotiation will end immediately"""
         return True
 
     @property
     def history(self):
+        """The state after every step. Only kept in the "full" history mode"""
         return self._history
 
+    @property
+    def trace(self) -> Optional[NegotiationTrace]:
+        """A compact record of all offers made in the negotiation. None in the "none" history mode"""
+        return self._trace
+
+    def _record_state(self) -> None:
+        """Adds the current state to the history (if a full history is kept)"""
+        if self._history_mode == "full":
+            self._history.append(self.state)
+
+    def _record_offer(self, negotiator_id: str, outcome: "Outcome") -> None:
+        """Adds an offer to the trace (if one is kept)"""
+        if self._trace is None:
+            return
+        try:
+            index = self.outcome_index(outcome)
+        except (ValueError, KeyError, TypeError):
+            index = None
+        self._trace.record(
+            step=self._step,
+            time=self.time,
+            relative_time=self.relative_time,
+            proposer=negotiator_id,
+            outcome=outcome,
+            outcome_index=index,
+        )
+
     @property
     def current_step(self):
         return self._step
 
+    def __setattr__(self, key, value):
+        # any change to the mechanism invalidates the cached state
+        if key not in self._state_independent_attributes and (
+            key not in self.__dict__ or self.__dict__[key] is not value
+        ):
+            self._invalidate_state()
+        super().__setattr__(key, value)
+
+    def _invalidate_state(self) -> None:
+        """Forces the state to be recreated the next time it is accessed"""
+        self.__dict__["_state_version"] = self.__dict__.get("_state_version", 0) + 1
+
     @property
     def state(self):
-        """Returns the current state. Override `extra_state` if you want to keep extra state"""
+        """Returns the current state. Override `extra_state` if you want to keep extra state
+
+        Remarks:
+            - The state is cached and the same object is returned until any attribute of the mechanism is changed
+              (or the mechanism is stepped). Do not modify the returned state. Copy it instead.
+            - While a mechanism with a time limit is running, its `time` and `relative_time` change continuously so
+              a new state is created on every access. Otherwise, `time` is the elapsed time when the state was
+              created.
+            - Mechanisms that change their extra state in-place (e.g. appending to a list) should call
+              `_invalidate_state` after doing so if the change is to be visible in the state.
+        """
+        d = self.__dict__
+        key = (d.get("_state_version", 0), len(d.get("_negotiators", ())))
+        if d.get("_cached_state_key", None) == key and not self._time_dependent_state:
+            return d["_cached_state"]
+        d["_cached_state"] = self._make_state()
+        d["_cached_state_key"] = key
+        return d["_cached_state"]
+
+    @property
+    def _time_dependent_state(self) -> bool:
+        """Whether the state changes with time alone (i.e. the mechanism is running with a time limit)"""
+        d = self.__dict__
+        ami = d.get("ami", None)
+        return (
+            d.get("_running", False)
+            and ami is not None
+            and ami.time_limit is not None
+            and ami.time_limit != float("inf")
+        )
+
+    def _make_state(self) -> MechanismState:
+        """Creates a new state object"""
         current_state = self.extra_state()
         if current_state is None:
             current_state = {}
@@ -1004,3 +1331,24 @@ class Mechanism(NamedObject, EventSource, CheckpointMixin, ABC):
 
 Protocol = Mechanism
 """An alias for `Mechanism`"""
+
+
+def _dissociate_if_in(negotiator_ref: weakref.ref, mechanism_id: str) -> None:
+    """Dissociates the negotiator if it is still alive and in the given mechanism (see `Mechanism.add`)"""
+    negotiator = negotiator_ref()
+    if negotiator is not None and negotiator._mechanism_id == mechanism_id:
+        negotiator._dissociate()
+
+
+def _run_in_worker(mechanism: bytes, seed: int) -> bytes:
+    """Runs a pickled mechanism to completion in a worker process and returns the pickled results (see `runall`)"""
+    random.seed(seed)
+    np.random.seed(seed)
+    mechanism: Mechanism = dill.loads(mechanism)
+    # unpickling does not register the mechanism which is needed by its AgentMechanismInterface
+    Mechanism.all[mechanism.id] = mechanism
+    try:
+        mechanism.run()
+        return mechanism._dump_results()
+    finally:
+        Mechanism.all.pop(mechanism.id, None)
@@ -14,7 +14,11 @@ from typing import TYPE_CHECKING, Dict, Any, Callable
 from negmas.common import *
 from negmas.events import Notifiable, Notification
 from negmas.helpers import get_class
-from negmas.utilities import make_discounted_ufun
+from negmas.utilities import (
+    make_discounted_ufun,
+    SortedUtilityIndex,
+    CachedUtilityFunction,
+)
 from negmas.outcomes import Issue
 import numpy as np
 
@@ -83,6 +87,11 @@ class Negotiator(NamedObject, Notifiable, ABC):
     def utility_function(self, utility_function):
         self._utility_function = utility_function
         self._ufun_modified = True
+        if utility_function is not None:
+            # the ufun may have been changed in place so anything cached for it may be stale
+            SortedUtilityIndex.invalidate(utility_function)
+            if isinstance(utility_function, CachedUtilityFunction):
+                utility_function.invalidate()
         if self._ami is not None and self._ami.state.started:
             warnings.warn(
                 "Changing the utility function by direct assignment after the negotiation is "
@@ -200,6 +209,7 @@ class Negotiator(NamedObject, Notifiable, ABC):
         self._initial_state = state
         if ufun is not None:
             self._utility_function = ufun
+            self._ufun_modified = True
             self.on_ufun_changed()
         if self._utility_function:
             self._utility_function.ami = ami
@@ -316,6 +326,8 @@ class Negotiator(NamedObject, Notifiable, ABC):
         elif notification.type == "negotiation_end":
             self.on_negotiation_end(state=notification.data)
         elif notification.type == "ufun_modified":
+            if self._utility_function is not None:
+                SortedUtilityIndex.invalidate(self._utility_function)
             self.on_ufun_changed()
 
     def on_ufun_changed(self):
@@ -326,7 +338,13 @@ class Negotiator(NamedObject, Notifiable, ABC):
 
             - You MUST call the super() version of this function either before or after your code when you are overriding
               it.
+            - If the ufun was not just assigned, it is assumed to have been changed in place and all sorted indices
+              built for it are dropped.
         """
+        if not self._ufun_modified and self._utility_function is not None:
+            SortedUtilityIndex.invalidate(self._utility_function)
+        if isinstance(self._utility_function, CachedUtilityFunction):
+            self._utility_function.invalidate()
         self._ufun_modified = False
 
     def __str__(self):
@@ -409,13 +427,17 @@ class Controller(NamedObject):
 
     @property
     def states(self) -> Dict[str, MechanismState]:
-        """Gets the current states of all negotiations as a mapping from negotiator ID to mechanism"""
-        return dict(
-            zip(
-                self._negotiators.keys(),
-                (self._negotiators[k][0]._ami.state for k in self._negotiators.keys()),
-            )
-        )
+        """Gets the current states of all negotiations as a mapping from negotiator ID to mechanism.
+
+        Remarks:
+            - Negotiators that are not in any negotiation (e.g. because their mechanism was garbage collected) are
+              skipped.
+        """
+        return {
+            k: v[0]._ami.state
+            for k, v in self._negotiators.items()
+            if v[0]._ami is not None
+        }
 
     def create_negotiator(
         self,
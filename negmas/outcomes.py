@@ -28,8 +28,10 @@ import itertools
 import math
 import random
 import xml.etree.ElementTree as ET
-from collections import defaultdict
+from collections import defaultdict, abc
 import copy
+import threading
+from collections import OrderedDict
 from enum import Enum
 from functools import reduce
 from operator import mul
@@ -43,7 +45,7 @@ from typing import (
     Union,
     Type,
 )
-from typing import Tuple, Mapping, Dict, Any
+from typing import Tuple, Mapping, Dict, Any, Iterator
 
 import numpy as np
 import pkg_resources
@@ -53,9 +55,12 @@ from .java import PYTHON_CLASS_IDENTIFIER
 from .common import NamedObject
 from .generics import *
 from .helpers import unique_name
+from .sampling import sample_ids, sample_codes
 from typing import Callable
 
 LARGE_NUMBER = 100
+CHUNK_SIZE = 65536
+"""Default number of outcomes per block when scanning outcome spaces in chunks (see `OutcomeSpace.chunks`)"""
 __all__ = [
     "Outcome",
     "OutcomeType",
@@ -65,6 +70,7 @@ __all__ = [
     "Issues",
     "outcome_is_valid",
     "outcome_is_complete",
+    "OutcomeValidator",
     "outcome_range_is_valid",
     "outcome_range_is_complete",
     "outcome_in_range",
@@ -73,6 +79,8 @@ __all__ = [
     "outcome_as_dict",
     "outcome_as_tuple",
     "num_outcomes",
+    "OutcomeSpace",
+    "OutcomeSpaceCache",
 ]
 
 
@@ -815,22 +823,36 @@ class Issue(NamedObject):
 
         return random.choice(self.values)  # type: ignore
 
+    def values_at(self, codes: Iterable[int]) -> list:
+        """Returns the values of a countable issue at the given codes (indices in `Issue.all`)"""
+        if isinstance(codes, np.ndarray):
+            codes = codes.tolist()
+        if isinstance(self.values, int):
+            return list(codes)
+        values = self.values
+        return [values[_] for _ in codes]
+
     def rand_outcomes(
         self, n: int, with_replacement=False, fail_if_not_enough=False
     ) -> Iterable["Outcome"]:
-        """Picks a random valid value."""
-        if isinstance(self.values, int):
-            if n > self.values and not with_replacement:
+        """Picks n random valid values.
+
+        Remarks:
+
+            - Countable issues are sampled in O(n) time independent of the number of values.
+            - Sampling a continuous issue without replacement returns n equally spaced values.
+        """
+        if self.is_countable():
+            n_values = self.cardinality()
+            if n > n_values and not with_replacement:
                 if fail_if_not_enough:
                     raise ValueError(
                         f"Cannot sample {n} outcomes out of {self.values} without replacement"
                     )
-                else:
-                    return [_ for _ in range(self.values)]
-            if with_replacement:
-                return np.random.randint(low=0, high=self.values, size=n).tolist()
-            else:
-                return random.shuffle([_ for _ in range(self.values)])[:n]
+                return list(self.all)
+            return self.values_at(
+                sample_ids(n_values, n, with_replacement=with_replacement)
+            )
         elif self.is_continuous():
             if with_replacement:
                 return (
@@ -848,18 +870,6 @@ class Issue(NamedObject):
                     f"replacement"
                 )
             return [self.values() for _ in range(n)]
-        if n > len(self.values) and not with_replacement:
-            if fail_if_not_enough:
-                raise ValueError(
-                    f"Cannot sample {n} outcomes out of {self.values} without replacement"
-                )
-            else:
-                return self.values
-        return np.random.choice(
-            np.asarray(self.values, dtype=type(self.values[0])),
-            size=n,
-            replace=with_replacement,
-        ).tolist()
 
     rand_valid = rand
 
@@ -891,9 +901,10 @@ class Issue(NamedObject):
         n = num_outcomes(issues)
         if n is None:
             return cls.sample(issues=issues, n_outcomes=max_n_outcomes, astype=astype)
-        values = enumerate_outcomes(issues, keep_issue_names=False)
         if max_n_outcomes is not None and n > max_n_outcomes:
-            values = random.sample(values, max_n_outcomes)
+            values = _sample_values(issues, max_n_outcomes, with_replacement=False)
+        else:
+            values = enumerate_outcomes(issues, keep_issue_names=False)
         outcomes = []
         for value in values:
             if astype == tuple:
@@ -987,37 +998,11 @@ class Issue(NamedObject):
                 f"Cannot sample unknown number of outcomes from continuous outcome spaces"
             )
         else:
-            samples = []
-            for issue in issues:
-                samples.append(
-                    issue.rand_outcomes(
-                        n=n_outcomes, with_replacement=True, fail_if_not_enough=True
-                    )
-                )
-            values = []
-            for i in range(n_outcomes):
-                values.append([s[i] for s in samples])
-            if not with_replacement and not any(i.is_uncountable() for i in issues):
-                tmp_values = []
-                for value in values:
-                    tmp_values.append(tuple(value))
-                tmp_values = set(tmp_values)
-                remaining = n_outcomes - len(tmp_values)
-                n_max_trials, i = 10, 0
-                while remaining < 0 and i < n_max_trials:
-                    tmp_values = tmp_values.union(
-                        set(
-                            cls.sample(
-                                issues=issues,
-                                n_outcomes=remaining,
-                                astype=tuple,
-                                with_replacement=True,
-                                fail_if_not_enough=False,
-                            )
-                        )
-                    )
-                    i += 1
-                values = list(tmp_values)
+            if n_total is not None and not with_replacement:
+                n_outcomes = min(n_outcomes, n_total)
+            values = _sample_values(
+                issues, n_outcomes, with_replacement=with_replacement
+            )
 
         outcomes = []
         for value in values:
@@ -1332,6 +1317,34 @@ def num_outcomes(issues: Collection[Issue]) -> Optional[int]:
     return n
 
 
+def _sample_values(
+    issues: Sequence[Issue], n: int, with_replacement: bool = True
+) -> List[tuple]:
+    """Samples n tuples of issue values in O(n * len(issues)) without enumerating the outcome space.
+
+    Remarks:
+
+        - Without replacement, the sampled values of countable issues are distinct if all issues are countable.
+          Continuous issues are sampled uniformly which makes repetitions (almost surely) impossible.
+    """
+    issues = list(issues)
+    countable = [i for i, _ in enumerate(issues) if _.is_countable()]
+    columns: List[list] = [[] for _ in issues]
+    if countable:
+        codes = sample_codes(
+            [issues[i].cardinality() for i in countable],
+            n,
+            with_replacement=with_replacement or len(countable) < len(issues),
+        )
+        for j, i in enumerate(countable):
+            columns[i] = issues[i].values_at(codes[:, j])
+    for i, issue in enumerate(issues):
+        if issue.is_countable():
+            continue
+        columns[i] = issue.rand_outcomes(n, with_replacement=True)
+    return list(zip(*columns)) if columns else [tuple() for _ in range(n)]
+
+
 def is_outcome(x: Any) -> bool:
     """Checks if x is acceptable as an outcome type"""
     return isinstance(x, dict) or isinstance(x, tuple) or isinstance(x, OutcomeType)
@@ -1400,7 +1413,8 @@ def sample_outcomes(
 
 
     """
-    issues = [copy.deepcopy(_) for _ in issues]
+    # discretized issues replace the originals in this list so there is no need to copy them
+    issues = list(issues)
     continuous = []
     uncountable = []
     indx = []
@@ -1465,11 +1479,452 @@ def sample_outcomes(
                 outcomes += outcomes[:n_rem]
             return outcomes
 
-    return list(
-        random.sample(
-            enumerate_outcomes(issues, keep_issue_names=keep_issue_names), n_outcomes
-        )
-    )
+    values = _sample_values(issues, n_outcomes, with_replacement=False)
+    if not keep_issue_names:
+        return values
+    issue_names = [_.name for _ in issues]
+    return [dict(zip(issue_names, _)) for _ in values]
+
+
+class OutcomeSpaceCache:
+    """A bounded, thread-safe cache of `OutcomeSpace` objects keyed by a canonical signature of their issues.
+
+    Many mechanisms are created over structurally identical issues (e.g. all negotiations about the same CFP shape
+    in SCML). The cache lets all of them share a single read-only outcome space (including its value encoders and
+    cardinalities) so that only the first one pays for building it.
+
+    Args:
+        max_size: The maximum number of outcome spaces kept. The least recently used space is evicted when it is
+                  exceeded. If zero or negative, nothing is cached.
+
+    Examples:
+
+        >>> cache = OutcomeSpaceCache(max_size=2)
+        >>> a = cache.get([Issue(3, 'quantity'), Issue(['a', 'b'], 'type')])
+        >>> b = cache.get([Issue(3, 'quantity'), Issue(['a', 'b'], 'type')])
+        >>> a is b, len(b)
+        (True, 6)
+        >>> cache.get([Issue([1, 2], 'x')]) is cache.get([Issue([1.0, 2.0], 'x')])
+        False
+        >>> stats = cache.stats()
+        >>> stats['hits'], stats['misses'], stats['evictions'], stats['size']
+        (1, 3, 1, 2)
+
+    Remarks:
+
+        - The signature of an issue is its name and its values (with their types) so issues with random names never
+          share outcome spaces unless they are the same issue objects passed again.
+        - Issues with unhashable values are never cached (a new outcome space is created for every call).
+        - Returned spaces are shared and must be treated as read-only.
+
+    """
+
+    def __init__(self, max_size: int = 1024) -> None:
+        self.max_size = max_size
+        self._spaces: "OrderedDict[Any, OutcomeSpace]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._evictions = self._uncacheable = 0
+
+    @classmethod
+    def signature(
+        cls, issues: Collection[Issue], astype: Type = dict
+    ) -> Optional[Tuple]:
+        """Returns a hashable canonical signature of the given issues or None if it cannot be created"""
+        signature = [astype]
+        for issue in issues:
+            values = issue.values
+            if isinstance(values, int):
+                signature.append((issue.name, values))
+                continue
+            if isinstance(values, tuple) or callable(values):
+                return None
+            values = tuple(values)
+            signature.append((issue.name, values, tuple(map(type, values))))
+        signature = tuple(signature)
+        try:
+            hash(signature)
+        except TypeError:
+            return None
+        return signature
+
+    def get(
+        self,
+        issues: Collection[Issue],
+        keep_issue_names: bool = True,
+        astype: Optional[Type] = None,
+    ) -> "OutcomeSpace":
+        """Returns a (possibly shared) outcome space for the given issues.
+
+        Args:
+            issues: The issues defining the space. All of them must be countable
+            keep_issue_names: If True, outcomes are decoded as dicts with issue names as keys otherwise as tuples
+            astype: An optional `OutcomeType` descendant (or `tuple`/`dict`) used for decoding outcomes.
+
+        """
+        if astype is None:
+            astype = dict if keep_issue_names else tuple
+        key = self.signature(issues, astype) if self.max_size > 0 else None
+        if key is None:
+            with self._lock:
+                self._uncacheable += 1
+            return OutcomeSpace(issues, astype=astype)
+        with self._lock:
+            space = self._spaces.get(key, None)
+            if space is not None:
+                self._hits += 1
+                self._spaces.move_to_end(key)
+                return space
+            self._misses += 1
+        # the space keeps copies of the issues so that it does not depend on objects owned by whoever created it
+        space = OutcomeSpace([copy.deepcopy(_) for _ in issues], astype=astype)
+        with self._lock:
+            space = self._spaces.setdefault(key, space)
+            while len(self._spaces) > self.max_size:
+                self._spaces.popitem(last=False)
+                self._evictions += 1
+        return space
+
+    def clear(self) -> None:
+        """Removes all cached outcome spaces and resets statistics"""
+        with self._lock:
+            self._spaces.clear()
+            self._hits = self._misses = self._evictions = self._uncacheable = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the number of hits, misses, evictions and uncacheable requests, the size and the hit rate"""
+        with self._lock:
+            n = self._hits + self._misses
+            return dict(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                uncacheable=self._uncacheable,
+                size=len(self._spaces),
+                max_size=self.max_size,
+                hit_rate=self._hits / n if n > 0 else 0.0,
+            )
+
+    def __len__(self) -> int:
+        return len(self._spaces)
+
+
+class OutcomeSpace(abc.Sequence):
+    """A lazily decoded, integer-encoded outcome space defined by a set of countable issues.
+
+    Every value of every issue is assigned an integer *code* (its position in `Issue.all`) and every outcome is
+    assigned a mixed-radix integer *id* built from these codes with the last issue varying fastest. This means that
+    ids follow exactly the same order as `enumerate_outcomes` but no outcome is ever materialized until it is
+    requested.
+
+    Args:
+        issues: The issues defining the space. All of them must be countable
+        keep_issue_names: If True, outcomes are decoded as dicts with issue names as keys otherwise as tuples
+        astype: An optional `OutcomeType` descendant (or `tuple`/`dict`) used for decoding outcomes. Overrides
+                `keep_issue_names` if given.
+
+    Examples:
+
+        >>> space = OutcomeSpace([Issue(3, 'quantity'), Issue(['a', 'b'], 'type')])
+        >>> len(space)
+        6
+        >>> space[3]
+        {'quantity': 1, 'type': 'b'}
+        >>> space.index({'quantity': 2, 'type': 'a'})
+        4
+        >>> list(OutcomeSpace([Issue(2), Issue(['x', 'y'])], keep_issue_names=False))
+        [(0, 'x'), (0, 'y'), (1, 'x'), (1, 'y')]
+        >>> space.codes([0, 5]).tolist()
+        [[0, 0], [2, 1]]
+        >>> space.decode_many(space.ids([[1, 1], [0, 1]]))
+        [{'quantity': 1, 'type': 'b'}, {'quantity': 0, 'type': 'b'}]
+
+    Remarks:
+
+        - The space behaves as a read-only sequence of outcomes (supports `len`, indexing, slicing, iteration,
+          `index` and `in`) so it can be used wherever a list of outcomes is expected.
+        - Use `codes` and `ids` to move between outcome ids and the (n_outcomes x n_issues) matrix of value codes
+          without creating any outcome objects and `chunks` to stream this matrix in blocks for huge spaces.
+        - Use `OutcomeSpace.shared` to get a read-only space shared with all other users of structurally identical
+          issues.
+
+    """
+
+    cache = OutcomeSpaceCache()
+    """Process-wide cache used by `shared`"""
+
+    def __init__(
+        self,
+        issues: Collection[Issue],
+        keep_issue_names: bool = True,
+        astype: Optional[Type] = None,
+    ) -> None:
+        self.issues = list(issues)
+        for issue in self.issues:
+            if not issue.is_countable():
+                raise ValueError(
+                    f"Cannot create an outcome space with the uncountable issue {issue}"
+                )
+        if astype is None:
+            astype = dict if keep_issue_names else tuple
+        self.astype = astype
+        self.keep_issue_names = astype != tuple
+        self.issue_names = [_.name for _ in self.issues]
+        self.cardinalities = [_.cardinality() for _ in self.issues]
+        self.n_issues = len(self.issues)
+        self.n_outcomes = reduce(mul, self.cardinalities, 1)
+        self._values: List[Optional[list]] = []
+        self._encoders: List[Optional[Dict[Any, int]]] = []
+        for issue in self.issues:
+            if isinstance(issue.values, int):
+                # integer issues are their own codes
+                self._values.append(None)
+                self._encoders.append(None)
+                continue
+            values = list(issue.values)
+            self._values.append(values)
+            try:
+                encoder = {}
+                for code, value in enumerate(values):
+                    encoder.setdefault(value, code)
+                self._encoders.append(encoder)
+            except TypeError:
+                # unhashable values. we fall back to linear search in this case
+                self._encoders.append(None)
+        self.strides = [1] * self.n_issues
+        for i in range(self.n_issues - 2, -1, -1):
+            self.strides[i] = self.strides[i + 1] * self.cardinalities[i + 1]
+        self._fits_int64 = self.n_outcomes < np.iinfo(np.int64).max
+
+    @classmethod
+    def shared(
+        cls,
+        issues: Collection[Issue],
+        keep_issue_names: bool = True,
+        astype: Optional[Type] = None,
+    ) -> "OutcomeSpace":
+        """Returns a read-only outcome space from `OutcomeSpace.cache` shared by all callers with identical issues.
+
+        Examples:
+
+            >>> OutcomeSpace.shared([Issue(5, 'a')]) is OutcomeSpace.shared([Issue(5, 'a')])
+            True
+
+        """
+        return cls.cache.get(issues, keep_issue_names=keep_issue_names, astype=astype)
+
+    def __len__(self) -> int:
+        return self.n_outcomes
+
+    def __iter__(self):
+        values = [
+            range(card) if vals is None else vals
+            for vals, card in zip(self._values, self.cardinalities)
+        ]
+        for value in itertools.product(*values):
+            yield self._as_outcome(value)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self.decode(_) for _ in range(*item.indices(self.n_outcomes))]
+        return self.decode(item)
+
+    def __contains__(self, outcome) -> bool:
+        return self.encode(outcome, default=None) is not None
+
+    def __eq__(self, other):
+        if isinstance(other, OutcomeSpace):
+            return self.astype == other.astype and self.issues == other.issues
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return False
+        return len(other) == self.n_outcomes and all(a == b for a, b in zip(self, other))
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def __str__(self):
+        return f"OutcomeSpace({self.issues}, n_outcomes={self.n_outcomes})"
+
+    __repr__ = __str__
+
+    def _as_outcome(self, values: Sequence) -> "Outcome":
+        """Converts a sequence of issue values to an outcome of the type of this space"""
+        if self.astype == tuple:
+            return tuple(values)
+        if self.astype == dict:
+            return dict(zip(self.issue_names, values))
+        return self.astype(**dict(zip(self.issue_names, values)))
+
+    def _value_code(self, i: int, value) -> Optional[int]:
+        """Returns the code of the given value of the i^th issue or None if it is not a valid value"""
+        values, encoder = self._values[i], self._encoders[i]
+        if values is None:
+            if isinstance(value, (int, np.integer)) and 0 <= value < self.cardinalities[i]:
+                return int(value)
+            return None
+        if encoder is not None:
+            try:
+                return encoder.get(value, None)
+            except TypeError:
+                return None
+        try:
+            return values.index(value)
+        except ValueError:
+            return None
+
+    def _issue_values(self, outcome: "Outcome") -> Optional[Sequence]:
+        """Returns the values of all issues in order (or None if the outcome does not have the right issues)"""
+        if isinstance(outcome, np.ndarray):
+            outcome = outcome.tolist()
+        if isinstance(outcome, OutcomeType):
+            outcome = outcome.asdict()
+        if isinstance(outcome, dict):
+            try:
+                return [outcome[_] for _ in self.issue_names]
+            except KeyError:
+                return None
+        if len(outcome) != self.n_issues:
+            return None
+        return outcome
+
+    def encode(self, outcome: "Outcome", default: Any = ValueError) -> Optional[int]:
+        """Returns the id of the given outcome.
+
+        Args:
+            outcome: The outcome to encode (dict, tuple or `OutcomeType`)
+            default: Value to return if the outcome is not in the space. If not given, a `ValueError` is raised
+
+        """
+        values = self._issue_values(outcome) if outcome is not None else None
+        index = 0 if values is not None else None
+        if values is not None:
+            for i, (value, stride) in enumerate(zip(values, self.strides)):
+                code = self._value_code(i, value)
+                if code is None:
+                    index = None
+                    break
+                index += code * stride
+        if index is None:
+            if default is ValueError:
+                raise ValueError(f"{outcome} is not in the outcome space")
+            return default
+        return index
+
+    def index(self, outcome: "Outcome", *args) -> int:
+        """Returns the id (index) of the given outcome. Raises `ValueError` if it does not exist"""
+        return self.encode(outcome)
+
+    def count(self, outcome: "Outcome") -> int:
+        return int(outcome in self)
+
+    def decode(self, index: int, astype: Optional[Type] = None) -> "Outcome":
+        """Returns the outcome with the given id.
+
+        Args:
+            index: Outcome id (negative values are counted from the end as in lists)
+            astype: The type to decode to. If not given the type of the space is used
+
+        """
+        index = int(index)
+        if index < 0:
+            index += self.n_outcomes
+        if not 0 <= index < self.n_outcomes:
+            raise IndexError(f"outcome index {index} is out of range")
+        values = []
+        for vals, stride, card in zip(self._values, self.strides, self.cardinalities):
+            code = (index // stride) % card
+            values.append(code if vals is None else vals[code])
+        if astype is not None and astype != self.astype:
+            return _cast_outcome(values, self.issue_names, astype)
+        return self._as_outcome(values)
+
+    def decode_many(
+        self, indices: Iterable[int], astype: Optional[Type] = None
+    ) -> List["Outcome"]:
+        """Decodes a collection of outcome ids"""
+        return [self.decode(_, astype=astype) for _ in indices]
+
+    def codes(self, indices: Optional[Iterable[int]] = None) -> np.ndarray:
+        """Returns the value codes of the given outcome ids (all outcomes if None) as an (n x n_issues) int array"""
+        if not self._fits_int64:
+            raise ValueError(
+                f"Outcome space with {self.n_outcomes} outcomes is too large to be represented as an array"
+            )
+        if indices is None:
+            indices = np.arange(self.n_outcomes, dtype=np.int64)
+        else:
+            indices = np.asarray(indices, dtype=np.int64).reshape(-1)
+        codes = np.empty((len(indices), self.n_issues), dtype=np.int64)
+        for i, (stride, card) in enumerate(zip(self.strides, self.cardinalities)):
+            codes[:, i] = (indices // stride) % card
+        return codes
+
+    def chunks(
+        self,
+        chunk_size: Optional[int] = None,
+        start: int = 0,
+        stop: Optional[int] = None,
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        """Streams the value codes of all outcomes in blocks keeping memory bounded by the block size.
+
+        Args:
+            chunk_size: The maximum number of outcomes per block. If None, `CHUNK_SIZE` is used
+            start: The id of the first outcome to stream
+            stop: One after the id of the last outcome to stream (the end of the space if None)
+
+        Returns:
+            An iterator over tuples of the id of the first outcome in a block and a (block size x n_issues) int array
+            of value codes (see `codes`). Outcome ids of the block are consecutive.
+
+        Examples:
+
+            >>> space = OutcomeSpace([Issue(3, 'a'), Issue(['x', 'y'], 'b')])
+            >>> [(first, codes.tolist()) for first, codes in space.chunks(4)]
+            [(0, [[0, 0], [0, 1], [1, 0], [1, 1]]), (4, [[2, 0], [2, 1]])]
+
+        """
+        if chunk_size is None:
+            chunk_size = CHUNK_SIZE
+        if chunk_size < 1:
+            raise ValueError(f"Chunk size must be positive (given {chunk_size})")
+        stop = self.n_outcomes if stop is None else min(stop, self.n_outcomes)
+        for first in range(start, stop, chunk_size):
+            yield first, self.codes(
+                np.arange(first, min(first + chunk_size, stop), dtype=np.int64)
+            )
+
+    def ids(self, codes: Union[np.ndarray, Sequence[Sequence[int]]]) -> np.ndarray:
+        """Returns the outcome ids corresponding to an (n x n_issues) array of value codes"""
+        codes = np.asarray(codes, dtype=np.int64).reshape(-1, self.n_issues)
+        return codes @ np.asarray(self.strides, dtype=np.int64)
+
+    def issue_values(self, i: int) -> list:
+        """Returns the values of the i^th issue ordered by their codes"""
+        if self._values[i] is None:
+            return list(range(self.cardinalities[i]))
+        return self._values[i]
+
+    def sample(self, n: int, with_replacement: bool = False) -> List[int]:
+        """Samples outcome ids from the space.
+
+        Remarks:
+
+            - When sampling without replacement, at most `len(self)` ids are returned.
+        """
+        if not with_replacement:
+            n = min(n, self.n_outcomes)
+        ids = sample_ids(self.n_outcomes, n, with_replacement=with_replacement)
+        return ids.tolist() if isinstance(ids, np.ndarray) else ids
+
+
+def _cast_outcome(values: Sequence, issue_names: List[str], astype: Type) -> "Outcome":
+    """Creates an outcome of the given type from a sequence of issue values"""
+    if astype == tuple:
+        return tuple(values)
+    if astype == dict:
+        return dict(zip(issue_names, values))
+    return astype(**dict(zip(issue_names, values)))
 
 
 def _is_single(x):
@@ -1585,6 +2040,131 @@ def outcome_is_complete(outcome: Outcome, issues: Collection[Issue]) -> bool:
     return True
 
 
+class OutcomeValidator:
+    """A validator compiled once from a set of issues that checks outcomes quickly.
+
+    Args:
+        issues: The issues defining valid outcomes
+
+    Remarks:
+        - `is_complete` gives the same result as `outcome_is_complete` but looks up every issue once and checks
+          discrete values against hashed sets instead of lists. Tuples are checked by position without building a
+          dict first.
+        - `are_complete` checks a whole array of outcomes (one outcome per row) at once.
+
+    Examples:
+        >>> issues = [Issue((0.5, 2.0), 'price'), Issue(['2018.10.'+ str(_) for _ in range(1, 4)], 'date')\
+                , Issue(20, 'count')]
+        >>> validator = OutcomeValidator(issues)
+        >>> validator.is_complete({'price': 1.9, 'date': '2018.10.2', 'count': 5})
+        True
+        >>> validator.is_complete((1.9, '2018.10.2', 20))
+        False
+        >>> validator.is_complete({'price': 1.9})
+        False
+        >>> validator.are_complete(np.array([(1.0, '2018.10.1', 3), (1.0, '2018.10.4', 3)], dtype=object)).tolist()
+        [True, False]
+
+    """
+
+    def __init__(self, issues: Collection[Issue]):
+        self.issues = list(issues)
+        self.names = [str(_.name) for _ in self.issues]
+        self._unique = len(set(self.names)) == len(self.names)
+        self._checks = [self._compile(_) for _ in self.issues]
+
+    @staticmethod
+    def _compile(issue: Issue) -> Tuple[str, Any]:
+        values = issue.values
+        if isinstance(values, int):
+            return "count", values
+        if isinstance(values, tuple):
+            return "range", values
+        if isinstance(values, list):
+            try:
+                return "set", (frozenset(values), values)
+            except TypeError:
+                return "list", values
+        return "any", None
+
+    @staticmethod
+    def _check(kind: str, data: Any, x: Any) -> bool:
+        if kind == "set":
+            try:
+                return x in data[0]
+            except TypeError:
+                return x in data[1]
+        if kind == "count":
+            return not isinstance(x, str) and 0 <= x < data
+        if kind == "range":
+            return not isinstance(x, str) and data[0] < x < data[1]
+        if kind == "list":
+            return x in data
+        return True
+
+    def is_complete(self, outcome: Outcome) -> bool:
+        """Tests that the outcome is valid and complete (see `outcome_is_complete`)"""
+        if not self._unique:
+            return outcome_is_complete(outcome, self.issues)
+        if isinstance(outcome, np.ndarray):
+            outcome = tuple(outcome.tolist())
+        elif isinstance(outcome, OutcomeType):
+            outcome = outcome.asdict()
+        checks = self._checks
+        if isinstance(outcome, dict):
+            if len(outcome) != len(checks):
+                return False
+            try:
+                values = [outcome[_] for _ in self.names]
+            except KeyError:
+                keys = {str(k): k for k in outcome.keys()}
+                if any(_ not in keys for _ in self.names):
+                    return False
+                values = [outcome[keys[_]] for _ in self.names]
+        else:
+            values = outcome
+            if len(values) < len(checks):
+                return False
+        check = self._check
+        for (kind, data), value in zip(checks, values):
+            if not check(kind, data, value):
+                return False
+        return True
+
+    def are_complete(self, outcomes: np.ndarray) -> np.ndarray:
+        """Tests a batch of outcomes given as an (n_outcomes x n_issues) array with one outcome per row.
+
+        Returns:
+            A boolean array with one value per outcome
+        """
+        outcomes = np.asarray(outcomes)
+        if outcomes.ndim != 2 or outcomes.shape[1] < len(self.issues):
+            return np.zeros(len(outcomes), dtype=bool)
+        valid = np.ones(len(outcomes), dtype=bool)
+        for i, issue in enumerate(self.issues):
+            column = outcomes[:, i]
+            values = issue.values
+            if isinstance(values, (int, tuple)) and column.dtype.kind in "iufb":
+                if isinstance(values, int):
+                    valid &= (column >= 0) & (column < values)
+                else:
+                    valid &= (column > values[0]) & (column < values[1])
+            elif (
+                isinstance(values, list)
+                and column.dtype.kind in "iufb"
+                and all(isinstance(_, (int, float, np.number)) for _ in values)
+            ):
+                valid &= np.isin(column, values)
+            else:
+                kind, data = self._checks[i]
+                valid &= np.fromiter(
+                    (self._check(kind, data, _) for _ in column),
+                    dtype=bool,
+                    count=len(column),
+                )
+        return valid
+
+
 def outcome_range_is_valid(
     outcome_range: OutcomeRange, issues: Optional[Collection[Issue]] = None
 ) -> Union[bool, Tuple[bool, str]]:
@@ -0,0 +1,141 @@
+r"""Sampling from outcome spaces without enumerating them.
+
+Every outcome of a set of countable issues with cardinalities :math:`c_1, c_2, \ldots c_m` is identified by a
+mixed-radix integer *id* :math:`\sum_i v_i \prod_{j>i} c_j` where :math:`v_i` is the *code* (index) of its value for
+issue :math:`i`. This is the same order used by `enumerate_outcomes` and `OutcomeSpace`. Sampling ids directly and
+decoding them to codes takes :math:`O(k \cdot m)` for :math:`k` samples independent of the size of the outcome space:
+
+- Sampling with replacement draws every code independently.
+- Sampling without replacement uses rejection sampling on the id range (redrawing only the duplicates) when the
+  sample is small relative to the space, a partial permutation when it is not, and Floyd's algorithm when ids do not
+  fit in 64 bits.
+
+All functions use the global numpy (and python) random generators so that seeding them makes sampling reproducible.
+
+Examples:
+
+    >>> import numpy as np
+    >>> np.random.seed(0)
+    >>> ids = sample_ids(10 ** 12, 5)
+    >>> len(set(ids.tolist()))
+    5
+    >>> ids_to_codes([0, 5, 23], [2, 3, 4]).tolist()
+    [[0, 0, 0], [0, 1, 1], [1, 2, 3]]
+    >>> codes = sample_codes([10 ** 6, 10 ** 6, 10 ** 6], 4, with_replacement=False)
+    >>> codes.shape
+    (4, 3)
+
+"""
+import random
+from typing import List, Sequence, Union
+
+import numpy as np
+
+__all__ = ["sample_ids", "ids_to_codes", "sample_codes"]
+
+INT64_MAX = int(np.iinfo(np.int64).max)
+"""The largest outcome id that can be handled with numpy arrays"""
+
+DENSE_FRACTION = 0.25
+"""Samples larger than this fraction of the space are drawn from a permutation instead of by rejection"""
+
+Ids = Union[np.ndarray, List[int]]
+
+
+def _unique_in_order(ids: np.ndarray) -> np.ndarray:
+    """Removes repeated ids keeping the first occurrence of each in its original position"""
+    _, first = np.unique(ids, return_index=True)
+    return ids[np.sort(first)]
+
+
+def _floyd(n: int, k: int) -> List[int]:
+    """Samples k distinct integers from range(n) using Floyd's algorithm (works with arbitrary python ints)"""
+    selected = set()
+    for j in range(n - k, n):
+        t = random.randrange(j + 1)
+        selected.add(j if t in selected else t)
+    ids = list(selected)
+    random.shuffle(ids)
+    return ids
+
+
+def sample_ids(n: int, k: int, with_replacement: bool = False) -> Ids:
+    """Samples outcome ids from range(n) in random order.
+
+    Args:
+        n: The number of outcomes in the space
+        k: The number of ids to sample
+        with_replacement: If true, ids may repeat
+
+    Returns:
+        An int64 numpy array of ids or a list of python ints if n does not fit in 64 bits
+
+    Remarks:
+
+        - Raises `ValueError` if more than n ids are requested without replacement.
+
+    """
+    n, k = int(n), int(k)
+    if n < 0 or k < 0:
+        raise ValueError(f"Cannot sample {k} ids from {n} outcomes")
+    if not with_replacement and k > n:
+        raise ValueError(f"Cannot sample {k} distinct ids from {n} outcomes")
+    if k == 0 or n == 0:
+        return np.empty(0, dtype=np.int64)
+    if n > INT64_MAX:
+        if with_replacement:
+            return [random.randrange(n) for _ in range(k)]
+        return _floyd(n, k)
+    if with_replacement:
+        return np.random.randint(0, n, size=k, dtype=np.int64)
+    if k >= DENSE_FRACTION * n:
+        return np.random.permutation(n)[:k].astype(np.int64)
+    ids = _unique_in_order(np.random.randint(0, n, size=k, dtype=np.int64))
+    while len(ids) < k:
+        # less than a quarter of any draw can collide so oversampling twice the deficit rarely needs another round
+        extra = np.random.randint(0, n, size=2 * (k - len(ids)), dtype=np.int64)
+        ids = _unique_in_order(np.concatenate((ids, extra)))[:k]
+    return ids
+
+
+def ids_to_codes(ids: Union[Ids, Sequence[int]], cardinalities: Sequence[int]) -> np.ndarray:
+    """Decodes outcome ids to a (len(ids) x n_issues) int64 array of value codes (the last issue varies fastest)"""
+    cardinalities = [int(_) for _ in cardinalities]
+    strides = [1] * len(cardinalities)
+    for i in range(len(cardinalities) - 2, -1, -1):
+        strides[i] = strides[i + 1] * cardinalities[i + 1]
+    if strides and strides[0] * cardinalities[0] > INT64_MAX + 1:
+        codes = np.empty((len(ids), len(cardinalities)), dtype=np.int64)
+        for row, id_ in enumerate(ids):
+            for i, (stride, card) in enumerate(zip(strides, cardinalities)):
+                codes[row, i] = (int(id_) // stride) % card
+        return codes
+    ids = np.asarray(ids, dtype=np.int64).reshape(-1)
+    codes = np.empty((len(ids), len(cardinalities)), dtype=np.int64)
+    for i, (stride, card) in enumerate(zip(strides, cardinalities)):
+        codes[:, i] = (ids // stride) % card
+    return codes
+
+
+def sample_codes(
+    cardinalities: Sequence[int], k: int, with_replacement: bool = True
+) -> np.ndarray:
+    """Samples k outcomes of a space of countable issues as a (k x n_issues) int64 array of value codes.
+
+    Args:
+        cardinalities: The number of values of every issue
+        k: The number of outcomes to sample
+        with_replacement: If false, all sampled rows are distinct
+
+    """
+    if with_replacement:
+        codes = np.empty((int(k), len(cardinalities)), dtype=np.int64)
+        for i, card in enumerate(cardinalities):
+            if card <= 0 and k > 0:
+                raise ValueError(f"Cannot sample from an issue with {card} values")
+            codes[:, i] = np.random.randint(0, card, size=k, dtype=np.int64)
+        return codes
+    n = 1
+    for card in cardinalities:
+        n *= int(card)
+    return ids_to_codes(sample_ids(n, k), cardinalities)
@@ -34,7 +34,7 @@ from negmas.outcomes import (
     ResponseType,
     outcome_as_dict,
     outcome_as_tuple,
-    outcome_is_complete,
+    OutcomeValidator,
 )
 from negmas.utilities import (
     MappingUtilityFunction,
@@ -42,6 +42,7 @@ from negmas.utilities import (
     UtilityFunction,
     UtilityValue,
     JavaUtilityFunction,
+    SortedUtilityIndex,
 )
 import pandas as pd
 import seaborn as sns
@@ -93,6 +94,8 @@ class SAOAMI(AgentMechanismInterface):
 
 
 class SAOMechanism(Mechanism):
+    _state_independent_attributes = {"_last_checked_negotiator"}
+
     def __init__(
         self,
         issues=None,
@@ -146,6 +149,7 @@ class SAOMechanism(Mechanism):
         self.publish_proposer = publish_proposer
         self.publish_n_acceptances = publish_n_acceptances
         self.check_offers = check_offers
+        self._outcome_validator = OutcomeValidator(self.issues)
         self._no_responses = 0
         self._new_offers = []
         self._offering_is_accepting = offering_is_accepting
@@ -171,7 +175,8 @@ class SAOMechanism(Mechanism):
         return True
 
     def extra_state(self):
-        return SAOState(
+        # a dict (rather than an SAOState) avoids creating a throw-away state object every time the state is built
+        return dict(
             current_offer=self._current_offer,
             new_offers=self._new_offers,
             current_proposer=self._current_proposer.id
@@ -180,6 +185,10 @@ class SAOMechanism(Mechanism):
             n_acceptances=self._n_accepting if self.publish_n_acceptances else 0,
         )
 
+    def _fork_shared(self) -> Iterable[Any]:
+        yield from super()._fork_shared()
+        yield self._outcome_validator
+
     def plot(
         self,
         visible_negotiators: Union[Tuple[int, int], Tuple[str, str]] = (0, 1),
@@ -211,20 +220,33 @@ class SAOMechanism(Mechanism):
                 self.negotiators[visible_negotiators[1]],
             ]
         indx = dict(zip([_.id for _ in self.negotiators], range(len(self.negotiators))))
+        if self._trace is not None:
+            trace = self._trace.to_dict()
+            offers = zip(
+                trace["proposer"],
+                trace["outcome"],
+                trace["relative_time"],
+                trace["step"],
+            )
+        else:
+            offers = (
+                (a, o, state.relative_time, state.step)
+                for state in self.history
+                for a, o in state.new_offers
+            )
         history = []
-        for state in self.history:
-            for a, o in state.new_offers:
-                history.append(
-                    {
-                        "current_proposer": a,
-                        "current_offer": o,
-                        "offer_index": self.outcomes.index(o),
-                        "relative_time": state.relative_time,
-                        "step": state.step,
-                        "u0": visible_negotiators[0].utility_function(o),
-                        "u1": visible_negotiators[1].utility_function(o),
-                    }
-                )
+        for a, o, relative_time, step in offers:
+            history.append(
+                {
+                    "current_proposer": a,
+                    "current_offer": o,
+                    "offer_index": self.outcomes.index(o),
+                    "relative_time": relative_time,
+                    "step": step,
+                    "u0": visible_negotiators[0].utility_function(o),
+                    "u1": visible_negotiators[1].utility_function(o),
+                }
+            )
         history = pd.DataFrame(data=history)
         has_history = len(history) > 0
         has_front = 1
@@ -444,7 +466,7 @@ class SAOMechanism(Mechanism):
             if (
                 self.check_offers
                 and response.outcome is not None
-                and (not outcome_is_complete(response.outcome, self.issues))
+                and (not self._outcome_validator.is_complete(response.outcome))
             ):
                 return SAOResponse(response.response, None)
             return response
@@ -552,6 +574,8 @@ class SAOMechanism(Mechanism):
             self._current_proposer = neg
             self._last_checked_negotiator = _first_proposer
             self._new_offers.append((neg.id, resp.outcome))
+            self._invalidate_state()
+            self._record_offer(neg.id, resp.outcome)
             return MechanismRoundResult(broken=False, timedout=False, agreement=None)
 
         # this is not the first round. A round will get n_negotiators steps
@@ -607,6 +631,8 @@ class SAOMechanism(Mechanism):
                     self._current_offer = proposal
                     self._current_proposer = neg
                     self._new_offers.append((neg.id, proposal))
+                    self._invalidate_state()
+                    self._record_offer(neg.id, proposal)
                     self._n_accepting = 1 if self._offering_is_accepting else 0
                     if self._enable_callbacks:
                         for other in self.negotiators:
@@ -618,6 +644,9 @@ class SAOMechanism(Mechanism):
         return MechanismRoundResult(broken=False, timedout=False, agreement=None)
 
     def negotiator_offers(self, negotiator_id: str) -> List[Outcome]:
+        """Returns all offers made by the given negotiator in order"""
+        if self._trace is not None:
+            return self._trace.offers_of(negotiator_id)
         offers = []
         for state in self._history:
             offers += [o for n, o in state.new_offers if n == negotiator_id]
@@ -916,6 +945,11 @@ class SAONegotiator(Negotiator):
     def on_notification(self, notification: Notification, notifier: str):
         if notification.type == "end_negotiation":
             self.__end_negotiation = True
+        elif notification.type == "ufun_modified":
+            # the ufun was changed in place so sorted outcomes built for it are stale
+            if self._utility_function is not None:
+                SortedUtilityIndex.invalidate(self._utility_function)
+            self.on_ufun_changed()
 
     def propose_(self, state: MechanismState) -> Optional["Outcome"]:
         if not self._capabilities["propose"] or self.__end_negotiation:
@@ -1032,6 +1066,27 @@ class SAONegotiator(Negotiator):
         else:
             return self._utility_function
 
+    @property
+    def supports_batch(self) -> bool:
+        """Whether this negotiator can be run through the vectorized interface of `BatchSAORunner`.
+
+        Remarks:
+            - Negotiators supporting batch execution implement three class methods that work on many negotiators
+              (of the same class) in different negotiations at once. Outcomes are passed as indices into the outcomes
+              of the negotiation and responses as `ResponseType` values:
+
+                - batch_prepare(negotiators, mechanisms, utilities) -> data: Called once with the negotiators, their
+                  mechanisms and their utilities for all outcomes (one row per negotiator). Returns any data needed
+                  by the other two methods.
+                - batch_respond(data, rows, relative_time, offers) -> responses: Responses of the negotiators at the
+                  given rows to the given offers
+                - batch_propose(data, rows, relative_time) -> offers: Proposals of the negotiators at the given rows
+                  (-1 for no proposal)
+
+            - Batch execution must behave exactly as `respond` and `propose` would.
+        """
+        return False
+
     # CALLBACK
     def on_partner_proposal(
         self, state: MechanismState, agent_id: str, offer: "Outcome"
@@ -1209,7 +1264,7 @@ class AspirationNegotiator(SAONegotiator, AspirationMixin):
         ufun_max=None,
         ufun_min=None,
     ):
-        self.ordered_outcomes = []
+        self.sorted_index: Optional[SortedUtilityIndex] = None
         self.ufun_max = ufun_max
         self.ufun_min = ufun_min
         self.ranking = ranking
@@ -1236,22 +1291,25 @@ class AspirationNegotiator(SAONegotiator, AspirationMixin):
             }
         )
 
+    @property
+    def ordered_outcomes(self) -> List[Tuple[Optional[float], "Outcome"]]:
+        """All outcomes as (utility, outcome) tuples ordered by descending utility with unknown utilities last"""
+        if self.sorted_index is None:
+            return []
+        index = self.sorted_index
+        return [(index.utility(_), index.outcome(_)) for _ in range(len(index))]
+
     def on_ufun_changed(self):
         super().on_ufun_changed()
-        outcomes = self._ami.discrete_outcomes()
-        self.ordered_outcomes = sorted(
-            [(self._utility_function(outcome), outcome) for outcome in outcomes],
-            key=lambda x: float(x[0]) if x[0] is not None else float("-inf"),
-            reverse=True,
+        index = self.sorted_index = SortedUtilityIndex.from_ufun(
+            self._utility_function, self._ami.discrete_outcomes()
         )
         if not self.assume_normalized:
-            self.ufun_max = self.ordered_outcomes[0][0]
+            self.ufun_max = index.utility(0)
 
             # we set the minimum utility to the minimum finite value above both reserved_value
-            for j in range(len(outcomes) - 1, -1, -1):
-                self.ufun_min = self.ordered_outcomes[j][0]
-                if self.ufun_min is not None and self.ufun_min > float("-inf"):
-                    break
+            finite = np.flatnonzero(index.known & (index.utilities > float("-inf")))
+            self.ufun_min = index.utility(finite[-1] if len(finite) else 0)
             if self.reserved_value is not None and self.ufun_min < self.reserved_value:
                 self.ufun_min = self.reserved_value
 
@@ -1278,20 +1336,110 @@ class AspirationNegotiator(SAONegotiator, AspirationMixin):
         )
         if self.reserved_value is not None and asp < self.reserved_value:
             return None
-        for i, (u, o) in enumerate(self.ordered_outcomes):
-            if u is None:
-                continue
-            if u < asp:
-                if self.reserved_value is not None and u < self.reserved_value:
-                    return None
-                if i == 0:
-                    return self.ordered_outcomes[i][1]
-                if self.randomize_offer:
-                    return random.sample(self.ordered_outcomes[:i], 1)[0][1]
-                return self.ordered_outcomes[i - 1][1]
+        index = self.sorted_index
+        n = len(index)
+        i = index.first_below(asp)
+        if i < n:
+            u = index.utility(i)
+            if self.reserved_value is not None and u < self.reserved_value:
+                return None
+            if i == 0:
+                return index.outcome(0)
+            if self.randomize_offer:
+                return index.outcome(random.sample(range(i), 1)[0])
+            return index.outcome(i - 1)
         if self.randomize_offer:
-            return random.sample(self.ordered_outcomes, 1)[0][1]
-        return self.ordered_outcomes[-1][1]
+            return index.outcome(random.sample(range(n), 1)[0])
+        return index.outcome(n - 1)
+
+    @property
+    def supports_batch(self) -> bool:
+        return (
+            not self.randomize_offer
+            and self.ufun_max is not None
+            and self.ufun_min is not None
+        )
+
+    @classmethod
+    def batch_prepare(
+        cls,
+        negotiators: List["AspirationNegotiator"],
+        mechanisms: List["SAOMechanism"],
+        utilities: np.ndarray,
+    ) -> Dict[str, np.ndarray]:
+        # the same stable descending order used by on_ufun_changed with unknown utilities last
+        order = np.argsort(
+            -np.nan_to_num(utilities, nan=float("-inf")), axis=1, kind="stable"
+        )
+        ordered = np.take_along_axis(utilities, order, axis=1)
+        reserved = [_.reserved_value for _ in negotiators]
+        return dict(
+            utilities=utilities,
+            order=order,
+            # unknown utilities are skipped when searching for the first outcome below the aspiration level
+            ordered=np.where(np.isnan(ordered), float("inf"), ordered),
+            max_aspiration=np.array([_.max_aspiration for _ in negotiators], dtype=float),
+            exponent=np.array([_.exponent for _ in negotiators], dtype=float),
+            ufun_max=np.array([_.ufun_max for _ in negotiators], dtype=float),
+            ufun_min=np.array([_.ufun_min for _ in negotiators], dtype=float),
+            reserved=np.array([np.nan if _ is None else _ for _ in reserved], dtype=float),
+        )
+
+    @classmethod
+    def _batch_aspiration(
+        cls, data: Dict[str, np.ndarray], rows: np.ndarray, relative_time: np.ndarray
+    ) -> np.ndarray:
+        umin = data["ufun_min"][rows]
+        return (
+            data["max_aspiration"][rows]
+            * (1.0 - np.power(relative_time, data["exponent"][rows]))
+            * (data["ufun_max"][rows] - umin)
+            + umin
+        )
+
+    @classmethod
+    def batch_respond(
+        cls,
+        data: Dict[str, np.ndarray],
+        rows: np.ndarray,
+        relative_time: np.ndarray,
+        offers: np.ndarray,
+    ) -> np.ndarray:
+        u = data["utilities"][rows, offers]
+        asp = cls._batch_aspiration(data, rows, relative_time)
+        reserved = data["reserved"][rows]
+        has_reserved = ~np.isnan(reserved)
+        known = ~np.isnan(u)
+        with np.errstate(invalid="ignore"):
+            accept = known & (u >= asp) & (~has_reserved | (u > reserved))
+            end = known & ~accept & has_reserved & (asp < reserved)
+        responses = np.full(len(rows), ResponseType.REJECT_OFFER.value)
+        responses[accept] = ResponseType.ACCEPT_OFFER.value
+        responses[end] = ResponseType.END_NEGOTIATION.value
+        return responses
+
+    @classmethod
+    def batch_propose(
+        cls, data: Dict[str, np.ndarray], rows: np.ndarray, relative_time: np.ndarray
+    ) -> np.ndarray:
+        asp = cls._batch_aspiration(data, rows, relative_time)
+        reserved = data["reserved"][rows]
+        has_reserved = ~np.isnan(reserved)
+        order, ordered = data["order"][rows], data["ordered"][rows]
+        below = ordered < asp[:, None]
+        found = below.any(axis=1)
+        first = below.argmax(axis=1)
+        r = np.arange(len(rows))
+        # the outcome just above the aspiration level or the last outcome if none is below it
+        proposals = np.where(
+            found, order[r, np.maximum(first - 1, 0)], order[:, -1]
+        )
+        with np.errstate(invalid="ignore"):
+            refuse = has_reserved & (
+                (asp < reserved) | (found & (ordered[r, first] < reserved))
+            )
+        proposals[refuse] = -1
+        return proposals
 
 
 class NiceNegotiator(SAONegotiator, RandomProposalMixin):
@@ -1305,6 +1453,31 @@ class NiceNegotiator(SAONegotiator, RandomProposalMixin):
     def propose(self, state: MechanismState) -> Optional["Outcome"]:
         return RandomProposalMixin.propose(self=self, state=state)
 
+    @property
+    def supports_batch(self) -> bool:
+        return getattr(self, "_offerable_outcomes", None) is None
+
+    @classmethod
+    def batch_prepare(
+        cls,
+        negotiators: List["NiceNegotiator"],
+        mechanisms: List["SAOMechanism"],
+        utilities: np.ndarray,
+    ) -> int:
+        return utilities.shape[1]
+
+    @classmethod
+    def batch_respond(
+        cls, data: int, rows: np.ndarray, relative_time: np.ndarray, offers: np.ndarray
+    ) -> np.ndarray:
+        return np.full(len(rows), ResponseType.ACCEPT_OFFER.value)
+
+    @classmethod
+    def batch_propose(
+        cls, data: int, rows: np.ndarray, relative_time: np.ndarray
+    ) -> np.ndarray:
+        return np.random.randint(0, data, size=len(rows))
+
 
 class ToughNegotiator(SAONegotiator):
     def __init__(
@@ -1340,9 +1513,13 @@ class ToughNegotiator(SAONegotiator):
             if self._offerable_outcomes is None
             else self._offerable_outcomes
         )
-        self.best_outcome = max(
-            [(self._utility_function(outcome), outcome) for outcome in outcomes]
-        )[1]
+        index = SortedUtilityIndex.from_ufun(self._utility_function, outcomes)
+        # ties in the best utility are broken in favor of the largest outcome
+        best = index.utility(0)
+        ties = index.within(best, best) if best is not None else []
+        self.best_outcome = (
+            max(index.outcome(_) for _ in ties) if len(ties) > 1 else index.outcome(0)
+        )
 
     def respond(self, state: MechanismState, offer: "Outcome") -> "ResponseType":
         if offer == self.best_outcome:
@@ -1354,6 +1531,41 @@ class ToughNegotiator(SAONegotiator):
             return None
         return self.best_outcome
 
+    @property
+    def supports_batch(self) -> bool:
+        return self.best_outcome is not None
+
+    @classmethod
+    def batch_prepare(
+        cls,
+        negotiators: List["ToughNegotiator"],
+        mechanisms: List["SAOMechanism"],
+        utilities: np.ndarray,
+    ) -> np.ndarray:
+        return np.array(
+            [m.outcome_index(n.best_outcome) for n, m in zip(negotiators, mechanisms)]
+        )
+
+    @classmethod
+    def batch_respond(
+        cls,
+        data: np.ndarray,
+        rows: np.ndarray,
+        relative_time: np.ndarray,
+        offers: np.ndarray,
+    ) -> np.ndarray:
+        return np.where(
+            offers == data[rows],
+            ResponseType.ACCEPT_OFFER.value,
+            ResponseType.REJECT_OFFER.value,
+        )
+
+    @classmethod
+    def batch_propose(
+        cls, data: np.ndarray, rows: np.ndarray, relative_time: np.ndarray
+    ) -> np.ndarray:
+        return data[rows]
+
 
 class OnlyBestNegotiator(SAONegotiator):
     def __init__(
@@ -1483,7 +1695,7 @@ class NaiveTitForTatNegotiator(SAONegotiator):
     ):
         self.received_utilities = []
         self.proposed_utility = None
-        self.ordered_outcomes = None
+        self.sorted_index: Optional[SortedUtilityIndex] = None
         self.sent_offer_index = None
         self.n_sent = 0
         super().__init__(name=name, ufun=ufun, parent=parent)
@@ -1492,13 +1704,18 @@ class NaiveTitForTatNegotiator(SAONegotiator):
         self.randomize_offer = randomize_offer
         self.always_concede = always_concede
 
+    @property
+    def ordered_outcomes(self) -> Optional[List[Tuple[Optional[float], "Outcome"]]]:
+        """All outcomes as (utility, outcome) tuples ordered by descending utility with unknown utilities last"""
+        if self.sorted_index is None:
+            return None
+        index = self.sorted_index
+        return [(index.utility(_), index.outcome(_)) for _ in range(len(index))]
+
     def on_ufun_changed(self):
         super().on_ufun_changed()
-        outcomes = self._ami.discrete_outcomes()
-        self.ordered_outcomes = sorted(
-            [(self._utility_function(outcome), outcome) for outcome in outcomes],
-            key=lambda x: x[0],
-            reverse=True,
+        self.sorted_index = SortedUtilityIndex.from_ufun(
+            self._utility_function, self._ami.discrete_outcomes()
         )
 
     def respond(self, state: MechanismState, offer: "Outcome") -> "ResponseType":
@@ -1511,21 +1728,20 @@ class NaiveTitForTatNegotiator(SAONegotiator):
             self.received_utilities[0] = self.received_utilities[1]
             self.received_utilities[-1] = offered_utility
         indx = self._propose(state=state)
-        my_utility, my_offer = self.ordered_outcomes[indx]
+        my_utility = self.sorted_index.utility(indx)
         if offered_utility >= my_utility:
             return ResponseType.ACCEPT_OFFER
         return ResponseType.REJECT_OFFER
 
     def _outcome_just_below(self, ulevel: float) -> int:
-        for i, (u, o) in enumerate(self.ordered_outcomes):
-            if u is None:
-                continue
-            if u < ulevel:
-                if self.randomize_offer:
-                    return random.randint(0, i)
-                return i
+        n = len(self.sorted_index)
+        i = self.sorted_index.first_below(ulevel)
+        if i < n:
+            if self.randomize_offer:
+                return random.randint(0, i)
+            return i
         if self.randomize_offer:
-            return random.randint(0, len(self.ordered_outcomes) - 1)
+            return random.randint(0, n - 1)
         return -1
 
     def _propose(self, state: MechanismState) -> int:
@@ -1536,9 +1752,9 @@ class NaiveTitForTatNegotiator(SAONegotiator):
                 isinstance(self.initial_concession, str)
                 and self.initial_concession == "min"
             ):
-                return self._outcome_just_below(ulevel=self.ordered_outcomes[0][0])
+                return self._outcome_just_below(ulevel=self.sorted_index.utility(0))
             else:
-                asp = self.ordered_outcomes[0][0] * (1.0 - self.initial_concession)
+                asp = self.sorted_index.utility(0) * (1.0 - self.initial_concession)
             return self._outcome_just_below(ulevel=asp)
 
         if self.always_concede:
@@ -1558,8 +1774,8 @@ class NaiveTitForTatNegotiator(SAONegotiator):
 
     def propose(self, state: MechanismState) -> Optional[Outcome]:
         indx = self._propose(state)
-        self.proposed_utility = self.ordered_outcomes[indx][0]
-        return self.ordered_outcomes[indx][1]
+        self.proposed_utility = self.sorted_index.utility(indx)
+        return self.sorted_index.outcome(indx)
 
 
 def _to_java_response(response: ResponseType) -> int:
@@ -25,6 +25,8 @@ Simulation steps:
     #. update custom stats (call `_post_step_stats`)
 
 """
+import bisect
+import concurrent.futures as futures
 import copy
 import json
 import logging
@@ -35,12 +37,14 @@ import sys
 import time
 import uuid
 import traceback
+import weakref
 import itertools
 from abc import ABC, abstractmethod
 from collections import defaultdict, namedtuple
 from enum import Enum
 from pathlib import Path
-from typing import Dict, Sized
+from types import MappingProxyType
+from typing import Dict, Sized, Mapping
 from typing import (
     Optional,
     List,
@@ -73,11 +77,19 @@ from negmas.helpers import (
     dump,
     create_loggers,
     add_records,
+    log_enabled,
+    EventLogger,
+    TimingStats,
 )
 from negmas.java import to_flat_dict, to_dict
-from negmas.mechanisms import Mechanism
+from negmas.mechanisms import Mechanism, MechanismRoundResult
 from negmas.negotiators import Negotiator
 from negmas.outcomes import OutcomeType, Issue, outcome_as_dict
+from negmas.traces import (
+    NegotiationLogSink,
+    BinaryNegotiationLogSink,
+    CSVNegotiationLogSink,
+)
 
 __all__ = [
     "Action",  # An action that an `Agent` can execute in the `World`.
@@ -86,12 +98,15 @@ __all__ = [
     "BreachProcessing",
     "Agent",  # Negotiator capable of engaging in multiple negotiations
     "BulletinBoard",
+    "NegotiationScheduler",
+    "ContractRegistry",
     "World",
     "Entity",
     "AgentWorldInterface",  # the interface though which an agent can interact with the world
     "NegotiationInfo",
     "RenegotiationRequest",
     "StatsMonitor",
+    "StatsStore",
     "WorldMonitor",
     "save_stats",
     "SimpleWorld",
@@ -303,6 +318,103 @@ class Entity(NamedObject):
         """Override this method to modify stepping logic"""
 
 
+class _SectionIndex:
+    """Secondary indexes of a single bulletin-board section (see `BulletinBoard.add_section`)"""
+
+    def __init__(
+        self,
+        indexes: Optional[Dict[str, str]],
+        set_indexes: Optional[Dict[str, str]],
+        sorted_attribute: Optional[str],
+    ):
+        self.indexes = dict(indexes) if indexes else {}
+        self.set_indexes = dict(set_indexes) if set_indexes else {}
+        self.sorted_attribute = sorted_attribute
+        attributes = set(self.indexes.values()) | set(self.set_indexes.values())
+        self._hashed: Dict[str, Dict[Any, Set[str]]] = {_: {} for _ in attributes}
+        # keys of records with unhashable attribute values are candidates for every query
+        self._unhashable: Dict[str, Set[str]] = {_: set() for _ in attributes}
+        self._sorted: List[Tuple[Any, int, str]] = []
+        self._order: Dict[str, int] = {}
+        self._n_added = 0
+
+    @staticmethod
+    def _get(value: Any, attribute: str) -> Any:
+        if isinstance(value, dict):
+            return value.get(attribute, None)
+        return getattr(value, attribute, None)
+
+    def add(self, key: str, value: Any) -> None:
+        if key not in self._order:
+            self._order[key] = self._n_added
+            self._n_added += 1
+        for attribute, buckets in self._hashed.items():
+            v = self._get(value, attribute)
+            try:
+                buckets.setdefault(v, set()).add(key)
+            except TypeError:
+                self._unhashable[attribute].add(key)
+        if self.sorted_attribute is not None:
+            v = self._get(value, self.sorted_attribute)
+            if v is not None:
+                bisect.insort(self._sorted, (v, self._order[key], key))
+
+    def remove(self, key: str, value: Any, keep_order=False) -> None:
+        for attribute, buckets in self._hashed.items():
+            v = self._get(value, attribute)
+            try:
+                bucket = buckets.get(v, None)
+            except TypeError:
+                self._unhashable[attribute].discard(key)
+                continue
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del buckets[v]
+        if self.sorted_attribute is not None:
+            v = self._get(value, self.sorted_attribute)
+            if v is not None:
+                item = (v, self._order[key], key)
+                i = bisect.bisect_left(self._sorted, item)
+                if i < len(self._sorted) and self._sorted[i] == item:
+                    del self._sorted[i]
+        if not keep_order:
+            self._order.pop(key, None)
+
+    def _sorted_keys(self, keys: Iterable[str]) -> List[str]:
+        return sorted(keys, key=self._order.__getitem__)
+
+    def candidates(self, query: Dict[str, Any]) -> Optional[List[str]]:
+        keys = None
+        for k, v in query.items():
+            attribute = self.indexes.get(k, None)
+            try:
+                if attribute is not None:
+                    found = set(self._hashed[attribute].get(v, ()))
+                else:
+                    attribute = self.set_indexes.get(k, None)
+                    if attribute is None:
+                        continue
+                    buckets, found = self._hashed[attribute], set()
+                    for x in v:
+                        found.update(buckets.get(x, ()))
+            except TypeError:
+                continue
+            found |= self._unhashable[attribute]
+            keys = found if keys is None else keys & found
+        return None if keys is None else self._sorted_keys(keys)
+
+    def in_range(self, lower: Any, upper: Any) -> List[str]:
+        items = self._sorted
+        start = 0 if lower is None else bisect.bisect_left(items, (lower,))
+        end = (
+            len(items)
+            if upper is None
+            else bisect.bisect_right(items, (upper, float("inf")))
+        )
+        return self._sorted_keys(_[2] for _ in items[start:end])
+
+
 class BulletinBoard(Entity, EventSource, ConfigReader):
     """The bulletin-board which carries all public information. It consists of sections each with a dictionary of records.
 
@@ -324,21 +436,45 @@ class BulletinBoard(Entity, EventSource, ConfigReader):
         """
         super().__init__(name=name)
         self._data: Dict[str, Dict[str, Any]] = {}
+        self._indexes: Dict[str, "_SectionIndex"] = {}
 
-    def add_section(self, name: str) -> None:
+    def add_section(
+        self,
+        name: str,
+        indexes: Optional[Dict[str, str]] = None,
+        set_indexes: Optional[Dict[str, str]] = None,
+        sorted_index: Optional[str] = None,
+    ) -> None:
         """
         Adds a section to the bulletin Board
 
         Args:
             name: Section name
+            indexes: Maps query keys to the attribute (or dict key) of records that must be *equal* to the value given
+                     for that key in a query. Queries using any of these keys only test matching records.
+            set_indexes: Maps query keys to the attribute (or dict key) of records that must be *in* the collection
+                         given for that key in a query.
+            sorted_index: An attribute (or dict key) of records to keep sorted for `query_range`
 
-        Returns:
+        Remarks:
+            - Indexes only narrow down the records tested against a query (using `satisfies`) so they never change
+              query results. Indexes for attributes that do not match the semantics of the query keys just make
+              queries slower.
+            - Indexed attributes are read when a record is recorded. Records must not be changed in place after that.
 
         """
         self._data[name] = {}
+        if indexes or set_indexes or sorted_index:
+            self._indexes[name] = _SectionIndex(indexes, set_indexes, sorted_index)
+        else:
+            self._indexes.pop(name, None)
 
     def query(
-        self, section: Optional[Union[str, List[str]]], query: Any, query_keys=False
+        self,
+        section: Optional[Union[str, List[str]]],
+        query: Any,
+        query_keys=False,
+        view=False,
     ) -> Optional[Dict[str, Any]]:
         """
         Returns all records in the given section/sections of the bulletin-board that satisfy the query
@@ -348,6 +484,8 @@ class BulletinBoard(Entity, EventSource, ConfigReader):
             query: The query which is USUALLY a dict with conditions on it when querying values and a RegExp when
             querying keys
             query_keys: Whether the query is to be applied to the keys or values.
+            view: If True, records are not copied. A query of a single section with no conditions returns a
+                  read-only live view of the section.
 
         Returns:
 
@@ -366,11 +504,12 @@ class BulletinBoard(Entity, EventSource, ConfigReader):
                 section=[_ for _ in self._data.keys() if not _.startswith("_")],
                 query=query,
                 query_keys=query_keys,
+                view=view,
             )
 
         if isinstance(section, Iterable) and not isinstance(section, str):
             results = [
-                self.query(section=_, query=query, query_keys=query_keys)
+                self.query(section=_, query=query, query_keys=query_keys, view=view)
                 for _ in section
             ]
             if len(results) == 0:
@@ -384,10 +523,44 @@ class BulletinBoard(Entity, EventSource, ConfigReader):
         if sec is None:
             return {}
         if query is None:
-            return copy.deepcopy(sec)
+            return MappingProxyType(sec) if view else copy.deepcopy(sec)
         if query_keys:
             return {k: v for k, v in sec.items() if re.match(str(query), k) is not None}
-        return {k: v for k, v in sec.items() if BulletinBoard.satisfies(v, query)}
+        keys = self._candidates(section, query)
+        if keys is None:
+            return {k: v for k, v in sec.items() if BulletinBoard.satisfies(v, query)}
+        return {k: sec[k] for k in keys if BulletinBoard.satisfies(sec[k], query)}
+
+    def query_range(
+        self, section: str, lower: Any = None, upper: Any = None
+    ) -> Dict[str, Any]:
+        """
+        Returns all records in the given section with a value of the sorted index of the section within a range
+
+        Args:
+            section: The section name. Must have been added with a `sorted_index`.
+            lower: The minimum value (inclusive). None means no minimum.
+            upper: The maximum value (inclusive). None means no maximum.
+
+        Returns:
+
+            - A dictionary with key:value pairs (in the order they were recorded). Records are not copied.
+
+        """
+        sec = self._data.get(section, None)
+        if sec is None:
+            return {}
+        index = self._indexes.get(section, None)
+        if index is None or index.sorted_attribute is None:
+            raise ValueError(f"Section {section} has no sorted index")
+        return {k: sec[k] for k in index.in_range(lower, upper)}
+
+    def _candidates(self, section: str, query: Any) -> Optional[List[str]]:
+        """The keys of records in a section that may satisfy the query (in order) or None if indexes cannot tell"""
+        index = self._indexes.get(section, None)
+        if index is None or not isinstance(query, dict):
+            return None
+        return index.candidates(query)
 
     @classmethod
     def satisfies(cls, value: Any, query: Any) -> bool:
@@ -439,7 +612,13 @@ class BulletinBoard(Entity, EventSource, ConfigReader):
                 skey = str(uuid.uuid4())
         else:
             skey = key
-        self._data[section][skey] = value
+        sec = self._data[section]
+        index = self._indexes.get(section, None)
+        if index is not None:
+            if skey in sec:
+                index.remove(skey, sec[skey], keep_order=True)
+            index.add(skey, value)
+        sec[skey] = value
         self.announce(
             Event("new_record", data={"section": section, "key": skey, "value": value})
         )
@@ -493,10 +672,10 @@ class BulletinBoard(Entity, EventSource, ConfigReader):
                 self.announce(
                     Event(
                         "will_remove_record",
-                        data={"section": sec, "key": key, "value": sec[key]},
+                        data={"section": section, "key": key, "value": sec[key]},
                     )
                 )
-                sec.pop(key, None)
+                self._pop(section, key)
                 return True
             except KeyError:
                 return False
@@ -507,25 +686,311 @@ class BulletinBoard(Entity, EventSource, ConfigReader):
         if query_keys:
             keys = [k for k, v in sec.items() if re.match(str(query), k) is not None]
         else:
-            keys = [k for k, v in sec.items() if v.satisfies(query)]
+            keys = self._candidates(section, query)
+            if keys is None:
+                keys = sec.keys()
+            keys = [k for k in keys if sec[k].satisfies(query)]
         if len(keys) == 0:
             return False
         for k in keys:
             self.announce(
                 Event(
                     "will_remove_record",
-                    data={"section": sec, "key": k, "value": sec[k]},
+                    data={"section": section, "key": k, "value": sec[k]},
                 )
             )
-            sec.pop(k, None)
+            self._pop(section, k)
         return True
 
+    def _pop(self, section: str, key: str) -> None:
+        """Removes a record from a section and its indexes"""
+        sec = self._data[section]
+        if key not in sec:
+            return
+        value = sec.pop(key)
+        index = self._indexes.get(section, None)
+        if index is not None:
+            index.remove(key, value)
+
     @property
     def data(self):
         """This property is intended for use only by the world manager. No other agent is allowed to use it"""
         return self._data
 
 
+class NegotiationScheduler:
+    """Keeps the running negotiations of a world and decides the order in which they are stepped.
+
+    Args:
+        priority: If given, negotiations are stepped in ascending order of the value it returns for their mechanism
+                  (e.g. `lambda m: m.n_steps` to step negotiations with earlier deadlines first). It is evaluated once
+                  when the negotiation is added. Ties are broken by the order negotiations were added in.
+        randomize: If True (and no priority is given), every pass starts at a random negotiation and goes in a random
+                   direction so that no negotiation is systematically stepped before another.
+
+    Remarks:
+        - Adding and removing negotiations are O(1) operations. Negotiations added or removed while a pass is going
+          on take effect in the next pass (removed negotiations are skipped by `World` if they were not stepped yet).
+
+    """
+
+    def __init__(
+        self, priority: Optional[Callable[[Mechanism], Any]] = None, randomize=True
+    ):
+        self.priority = priority
+        self.randomize = randomize
+        self._mechanisms: Dict[str, Mechanism] = {}
+        self._ordered: List[Tuple[Any, int, str]] = []
+        self._sorted = True
+        self._n_added = 0
+
+    def __len__(self):
+        return len(self._mechanisms)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._mechanisms
+
+    def add(self, key: str, mechanism: Mechanism) -> None:
+        """Adds a negotiation (the key is usually the uuid of its mechanism)"""
+        if key in self._mechanisms:
+            return
+        self._mechanisms[key] = mechanism
+        if self.priority is not None:
+            self._ordered.append((self.priority(mechanism), self._n_added, key))
+            self._sorted = False
+        self._n_added += 1
+
+    def remove(self, key: str) -> None:
+        """Removes a negotiation (if it is scheduled)"""
+        self._mechanisms.pop(key, None)
+
+    def clear(self) -> None:
+        """Removes all negotiations"""
+        self._mechanisms.clear()
+        self._ordered = []
+
+    def rekey(self, keys: Dict[str, str]) -> None:
+        """Changes the keys of scheduled negotiations (keys not in `keys` are kept)"""
+        self._mechanisms = {keys.get(k, k): v for k, v in self._mechanisms.items()}
+        self._ordered = [(p, n, keys.get(k, k)) for p, n, k in self._ordered]
+
+    def next_pass(self) -> List[Tuple[str, Mechanism]]:
+        """The negotiations to step in the next pass in order"""
+        mechanisms = self._mechanisms
+        if self.priority is not None:
+            # drop removed negotiations lazily and sort only if something was added
+            self._ordered = [_ for _ in self._ordered if _[2] in mechanisms]
+            if not self._sorted:
+                self._ordered.sort()
+                self._sorted = True
+            return [(_[2], mechanisms[_[2]]) for _ in self._ordered]
+        items = list(mechanisms.items())
+        if not self.randomize or len(items) < 2:
+            return items
+        start = random.randrange(len(items))
+        items = items[start:] + items[:start]
+        if random.random() < 0.5:
+            items.reverse()
+        return items
+
+
+class ContractRegistry(Mapping):
+    """Keeps track of the contracts of a world from conclusion to execution.
+
+    Contracts are kept in per-step buckets for signing (`unsigned`) and execution (`scheduled`) and are indexed by
+    the agents that are partners in them. For every contract, only the contract and its status (signed, executed and
+    breaches) are stored. Records suitable for storage (see `World.contract_record`) are rendered only when accessed.
+
+    As a mapping, the registry maps the IDs of saved contracts to their records.
+
+    Args:
+        record: A function that converts a contract to a record (dict)
+
+    Examples:
+
+        >>> registry = ContractRegistry(record=lambda c: {"id": c.id, "partners": c.partners})
+        >>> c = Contract(partners=["a", "b"], agreement={"time": 3}, id="c1")
+        >>> registry.conclude(c, to_be_signed_at=0)
+        >>> registry.sign(c, step=0)
+        >>> registry.schedule(c, step=3)
+        >>> [_.id for _ in registry.scheduled_at(3)], [_.id for _ in registry.scheduled_for("a", 0)]
+        (['c1'], ['c1'])
+        >>> registry.breached(c, ["late"])
+        >>> registry["c1"]
+        {'id': 'c1', 'partners': ['a', 'b'], 'signed': True, 'executed': False, 'breaches': 'late'}
+        >>> registry.remove_scheduled(3)
+        >>> registry.scheduled_for("a", 0)
+        []
+
+    """
+
+    def __init__(self, record: Callable[[Contract], Dict[str, Any]]):
+        self._record = record
+        self.unsigned: Dict[int, Set[Contract]] = defaultdict(set)
+        """Contracts waiting to be signed indexed by the step at which they are to be signed"""
+        self.scheduled: Dict[int, Set[Contract]] = defaultdict(set)
+        """Signed contracts indexed by the step at which they are to be executed"""
+        self._contracts: Dict[str, Contract] = {}
+        self._status: Dict[str, List[Any]] = {}
+        self._saved: Dict[str, None] = {}
+        self._of_agent: Dict[str, Dict[str, Contract]] = defaultdict(dict)
+        self._scheduled_of_agent: Dict[str, Dict[str, Contract]] = defaultdict(dict)
+        self._execution_step: Dict[str, int] = {}
+        self._dirty: Dict[str, None] = {}
+
+    def conclude(self, contract: Contract, to_be_signed_at: int) -> None:
+        """Registers a concluded contract to be signed at the given step"""
+        self._contracts[contract.id] = contract
+        self._dirty[contract.id] = None
+        for partner in contract.partners:
+            self._of_agent[partner][contract.id] = contract
+        self.unsigned[to_be_signed_at].add(contract)
+
+    def sign(self, contract: Contract, step: int, save: bool = True) -> None:
+        """Marks a contract as signed removing it from the signing bucket of the given step"""
+        self._contracts[contract.id] = contract
+        self.unsigned[step].discard(contract)
+        self._dirty[contract.id] = None
+        self._status[contract.id] = [True, None, None]
+        if save:
+            self._saved[contract.id] = None
+        else:
+            self._saved.pop(contract.id, None)
+
+    def reject(self, contract: Contract) -> None:
+        """Marks a contract as not signed (some partners refused to sign it)"""
+        self._contracts[contract.id] = contract
+        self._dirty[contract.id] = None
+        self._status[contract.id] = [False, None, None]
+        self._saved[contract.id] = None
+
+    def cancel(self, contract: Contract, step: int) -> None:
+        """Removes a cancelled contract from the signing bucket of the given step"""
+        unsigned = self.unsigned.get(step, None)
+        if unsigned is not None:
+            unsigned.discard(contract)
+
+    def schedule(self, contract: Contract, step: int) -> None:
+        """Schedules a signed contract for execution at the given step"""
+        self.scheduled[step].add(contract)
+        self._execution_step[contract.id] = step
+        for partner in contract.partners:
+            self._scheduled_of_agent[partner][contract.id] = contract
+
+    def scheduled_at(self, step: int) -> Collection[Contract]:
+        """Returns the contracts scheduled for execution at the given step"""
+        return self.scheduled.get(step, [])
+
+    def remove_scheduled(self, step: int) -> None:
+        """Removes all contracts scheduled for execution at the given step (e.g. after executing them)"""
+        for contract in self.scheduled.pop(step, []):
+            self._execution_step.pop(contract.id, None)
+            for partner in contract.partners:
+                self._scheduled_of_agent[partner].pop(contract.id, None)
+
+    def scheduled_for(self, agent_id: str, from_step: int = 0) -> List[Contract]:
+        """Returns the contracts of an agent that are scheduled for execution at or after the given step"""
+        steps = self._execution_step
+        return [
+            _
+            for _ in self._scheduled_of_agent.get(agent_id, {}).values()
+            if steps[_.id] >= from_step
+        ]
+
+    def contracts_of(self, agent_id: str) -> List[Contract]:
+        """Returns all contracts (signed or not) concluded by an agent"""
+        return list(self._of_agent.get(agent_id, {}).values())
+
+    def contract(self, contract_id: str) -> Optional[Contract]:
+        """Returns the contract with the given ID if it is known"""
+        return self._contracts.get(contract_id, None)
+
+    def executed(self, contract: Contract) -> None:
+        """Marks a contract as executed without breaches"""
+        status = self._status[contract.id]
+        status[1], status[2] = True, None
+        self._dirty[contract.id] = None
+
+    def breached(self, contract: Contract, breaches: Collection[Any]) -> None:
+        """Marks a contract as breached. The breaches are converted to strings only when records are rendered"""
+        status = self._status[contract.id]
+        status[1], status[2] = False, list(breaches)
+        self._dirty[contract.id] = None
+
+    def pop_changes(self) -> List[Tuple[Contract, Optional[List[Any]], bool]]:
+        """Returns the contracts changed since the last call with their status and whether they are saved"""
+        changes = [
+            (
+                self._contracts[_],
+                list(self._status[_]) if _ in self._status else None,
+                _ in self._saved,
+            )
+            for _ in self._dirty
+        ]
+        self._dirty = {}
+        return changes
+
+    def apply_changes(
+        self, changes: List[Tuple[Contract, Optional[List[Any]], bool]]
+    ) -> None:
+        """Applies changes returned by `pop_changes` (e.g. to rebuild a registry from a checkpoint)"""
+        for contract, status, saved in changes:
+            self._contracts[contract.id] = contract
+            for partner in contract.partners:
+                self._of_agent[partner][contract.id] = contract
+            if status is not None:
+                self._status[contract.id] = status
+            if saved:
+                self._saved[contract.id] = None
+            else:
+                self._saved.pop(contract.id, None)
+
+    def count(self, signed: Optional[bool] = None) -> int:
+        """Counts saved contracts without rendering their records
+
+        Args:
+            signed: If given, only signed (True) or unsigned (False) contracts are counted
+        """
+        if signed is None:
+            return len(self._saved)
+        return sum(1 for _ in self._saved if self._status[_][0] == signed)
+
+    def render(self, contract_id: str) -> Dict[str, Any]:
+        """Renders the record of a contract"""
+        signed, executed, breaches = self._status[contract_id]
+        record = dict(self._record(self._contracts[contract_id]))
+        record["signed"] = signed
+        record["executed"] = executed
+        record["breaches"] = "; ".join(str(_) for _ in breaches) if breaches else ""
+        return record
+
+    def __getitem__(self, contract_id: str) -> Dict[str, Any]:
+        if contract_id not in self._saved:
+            raise KeyError(contract_id)
+        return self.render(contract_id)
+
+    def __contains__(self, contract_id) -> bool:
+        return contract_id in self._saved
+
+    def __iter__(self):
+        return iter(self._saved)
+
+    def __len__(self):
+        return len(self._saved)
+
+    def records(self, signed: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """Renders the records of all saved contracts
+
+        Args:
+            signed: If given, only records of signed (True) or unsigned (False) contracts are rendered
+        """
+        return [
+            self.render(_)
+            for _ in self._saved
+            if signed is None or self._status[_][0] == signed
+        ]
+
+
 def safe_min(a, b):
     """Returns min(a, b) assuming None is less than anything."""
     if a is None:
@@ -937,56 +1402,73 @@ class AgentWorldInterface:
             mechanism_params=mechanism_params,
         )
 
-    def loginfo(self, msg: str) -> None:
+    def loginfo(self, msg: Union[str, Callable[[], str]]) -> None:
         """
         Logs an INFO message
 
         Args:
-            msg: The message to log
+            msg: The message to log or a callable returning it (only called if the message is going to be logged)
 
         Returns:
 
         """
         self._world.loginfo(msg)
 
-    def logwarning(self, msg: str) -> None:
+    def logwarning(self, msg: Union[str, Callable[[], str]]) -> None:
         """
         Logs a WARNING message
 
         Args:
-            msg: The message to log
+            msg: The message to log or a callable returning it (only called if the message is going to be logged)
 
         Returns:
 
         """
         self._world.logwarning(msg)
 
-    def logdebug(self, msg: str) -> None:
+    def logdebug(self, msg: Union[str, Callable[[], str]]) -> None:
         """
-        Logs a WARNING message
+        Logs a DEBUG message
 
         Args:
-            msg: The message to log
+            msg: The message to log or a callable returning it (only called if the message is going to be logged)
 
         Returns:
 
         """
         self._world.logdebug(msg)
 
-    def logerror(self, msg: str) -> None:
+    def logerror(self, msg: Union[str, Callable[[], str]]) -> None:
         """
-        Logs a WARNING message
+        Logs an ERROR message
 
         Args:
-            msg: The message to log
+            msg: The message to log or a callable returning it (only called if the message is going to be logged)
 
         Returns:
 
         """
         self._world.logerror(msg)
 
+    def logevent(self, kind: str, payload: Any = None) -> None:
+        """
+        Logs a structured event concerning this agent (only if the world was created with `log_events`)
+
+        Args:
+            kind: The kind of the event
+            payload: Any extra data (should be serializable to JSON)
+
+        Returns:
+
+        """
+        self._world.logevent(kind, entity=self.agent.id, payload=payload)
+
     def bb_query(
-        self, section: Optional[Union[str, List[str]]], query: Any, query_keys=False
+        self,
+        section: Optional[Union[str, List[str]]],
+        query: Any,
+        query_keys=False,
+        view=False,
     ) -> Optional[Dict[str, Any]]:
         """
         Returns all records in the given section/sections of the bulletin-board that satisfy the query
@@ -996,6 +1478,8 @@ class AgentWorldInterface:
             query: The query which is USUALLY a dict with conditions on it when querying values and a RegExp when
             querying keys
             query_keys: Whether the query is to be applied to the keys or values.
+            view: If True, records are not copied. A query of a single section with no conditions returns a
+                  read-only live view of the section.
 
         Returns:
 
@@ -1010,7 +1494,7 @@ class AgentWorldInterface:
 
         """
         return self._world.bulletin_board.query(
-            section=section, query=query, query_keys=query_keys
+            section=section, query=query, query_keys=query_keys, view=view
         )
 
     def bb_read(self, section: str, key: str) -> Optional[Any]:
@@ -1078,8 +1562,234 @@ def _path(path) -> Path:
     return Path(path).absolute()
 
 
+_STATS_DTYPES = (np.bool_, np.int64, np.float64, object)
+
+
+def _stats_dtype_rank(value) -> int:
+    if isinstance(value, (bool, np.bool_)):
+        return 0
+    if isinstance(value, (int, np.integer)):
+        return 1
+    if isinstance(value, (float, np.floating)):
+        return 2
+    return 3
+
+
+class _StatsColumn:
+    """A single preallocated column of a `StatsStore` that can be appended to like a list"""
+
+    def __init__(self, capacity: int, dtype=None):
+        self._capacity = max(1, capacity)
+        self._rank = None if dtype is None else _STATS_DTYPES.index(dtype)
+        self._data = (
+            None if dtype is None else np.empty(self._capacity, dtype=dtype)
+        )
+        self._n = 0
+        self._shared = False
+
+    def __deepcopy__(self, memo):
+        # the copy shares the buffer until either column is appended to (see `World.fork`)
+        column = copy.copy(self)
+        column._shared = self._shared = self._data is not None
+        return column
+
+    def append(self, value) -> None:
+        rank = _stats_dtype_rank(value)
+        if self._shared:
+            self._data = self._data.copy()
+            self._shared = False
+        if self._data is None:
+            self._rank = rank
+            self._data = np.empty(self._capacity, dtype=_STATS_DTYPES[rank])
+        elif rank > self._rank:
+            self._rank = rank
+            self._data = self._data.astype(_STATS_DTYPES[rank])
+        if self._n >= len(self._data):
+            self._data = np.concatenate(
+                (self._data, np.empty(len(self._data), dtype=self._data.dtype))
+            )
+        try:
+            self._data[self._n] = value
+        except OverflowError:
+            self._rank = 3
+            self._data = self._data.astype(object)
+            self._data[self._n] = value
+        self._n += 1
+
+    def view(self) -> np.ndarray:
+        """Returns a read-only view of the values"""
+        if self._data is None:
+            return np.empty(0, dtype=np.float64)
+        view = self._data[: self._n]
+        view.flags.writeable = False
+        return view
+
+    def tolist(self) -> List[Any]:
+        return self.view().tolist()
+
+    def __len__(self):
+        return self._n
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __getitem__(self, item):
+        value = self.view()[item]
+        return value.tolist() if isinstance(value, np.ndarray) else value.item()
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+
+class StatsStore(Mapping):
+    """Stores the statistics of a world in preallocated NumPy columns (one value per simulation step).
+
+    Columns are created on first access (as with a `defaultdict(list)`) or explicitly using `register` and values
+    are added using `append`. The dtype of a column is decided by the values appended to it (bool, int, float or
+    object) and is upcast if needed.
+
+    Args:
+        capacity: The number of values to preallocate for every column (e.g. the number of steps of the world).
+                  Columns grow automatically if more values are appended.
+
+    Examples:
+
+        >>> stats = StatsStore(capacity=4)
+        >>> stats["n_contracts"].append(3)
+        >>> stats["n_contracts"].append(5)
+        >>> stats["balance"].append(1.5)
+        >>> stats.n_rows, sum(stats["n_contracts"])
+        (2, 8)
+        >>> stats.view("n_contracts").tolist()
+        [3, 5]
+        >>> stats.sum("n_contracts"), stats.sum("n_breaches")
+        (8, 0)
+        >>> stats.to_dict()
+        {'n_contracts': [3, 5], 'balance': [1.5]}
+        >>> stats.to_frame()["balance"].tolist()
+        [1.5, nan]
+
+    """
+
+    def __init__(self, capacity: int = 100):
+        self.capacity = max(1, capacity)
+        self._columns: Dict[str, _StatsColumn] = {}
+        self._flushed = 0
+        self._flushed_columns: List[str] = []
+
+    def register(self, name: str, dtype=None) -> _StatsColumn:
+        """Registers a metric (does nothing if it is already registered).
+
+        Args:
+            name: The name of the metric
+            dtype: The dtype of its column (`np.bool_`, `np.int64`, `np.float64` or `object`). If not given, it is
+                   decided by the first value appended.
+
+        Returns:
+            The column of the metric
+        """
+        column = self._columns.get(name, None)
+        if column is None:
+            column = self._columns[name] = _StatsColumn(self.capacity, dtype)
+        return column
+
+    def __getitem__(self, name: str) -> _StatsColumn:
+        return self.register(name)
+
+    def __contains__(self, name) -> bool:
+        return name in self._columns
+
+    def get(self, name: str, default=None):
+        return self._columns.get(name, default)
+
+    def __iter__(self):
+        return iter(self._columns)
+
+    def __len__(self):
+        return len(self._columns)
+
+    @property
+    def n_rows(self) -> int:
+        """The number of rows (the length of the longest column)"""
+        return max((len(_) for _ in self._columns.values()), default=0)
+
+    def view(self, name: str) -> np.ndarray:
+        """Returns a read-only view (no copy) of the values of a metric"""
+        return self._columns[name].view()
+
+    def sum(self, name: str) -> Union[int, float]:
+        """Returns the sum of the values of a metric as a python number (0 for metrics with no values)"""
+        column = self._columns.get(name, None)
+        if column is None or len(column) == 0:
+            return 0
+        total = column.view().sum()
+        return total.item() if isinstance(total, np.generic) else total
+
+    def views(self) -> Dict[str, np.ndarray]:
+        """Returns read-only views (no copy) of all metrics"""
+        return {k: v.view() for k, v in self._columns.items()}
+
+    def to_dict(self) -> Dict[str, List[Any]]:
+        """Returns a copy of all metrics as lists"""
+        return {k: v.tolist() for k, v in self._columns.items()}
+
+    def to_frame(self, start: int = 0, stop: Optional[int] = None) -> pd.DataFrame:
+        """Returns the given rows as a DataFrame.
+
+        Remarks:
+            - Columns that have all the rows are not copied. Shorter columns are padded with NaN (or None).
+        """
+        if stop is None:
+            stop = self.n_rows
+        data = {}
+        for k, v in self._columns.items():
+            view = v.view()
+            if len(view) >= stop:
+                data[k] = view[start:stop]
+                continue
+            if v._rank is not None and v._rank < 3:
+                padded = np.full(stop - start, np.nan)
+            else:
+                padded = np.full(stop - start, None, dtype=object)
+            available = view[start:]
+            padded[: len(available)] = available
+            data[k] = padded
+        return pd.DataFrame(data, index=pd.RangeIndex(start, stop), copy=False)
+
+    def flush(self, file_name: Union[str, Path]) -> int:
+        """Appends the rows added since the last flush to a CSV file.
+
+        Args:
+            file_name: The file name. The whole file is rewritten if metrics were added since the last flush.
+
+        Returns:
+            The number of rows written
+        """
+        file_name = Path(file_name)
+        names = list(self._columns.keys())
+        start = self._flushed
+        if names != self._flushed_columns or not file_name.exists():
+            start = 0
+        stop = self.n_rows
+        if start >= stop and start > 0:
+            return 0
+        file_name.parent.mkdir(parents=True, exist_ok=True)
+        self.to_frame(start, stop).to_csv(
+            str(file_name),
+            mode="w" if start == 0 else "a",
+            header=start == 0,
+            index_label="index",
+        )
+        self._flushed, self._flushed_columns = stop, names
+        return stop - start
+
+
 class StatsMonitor(Entity):
-    """A monitor object capable of receiving stats of a world"""
+    """A monitor object capable of receiving stats of a world.
+
+    Remarks:
+        - The stats are passed as a dict of read-only NumPy arrays (views of the stats of the world without copying).
+    """
 
     def init(self, stats: Dict[str, Any], world_name: str):
         """Called to initialize the monitor before running first step"""
@@ -1110,6 +1820,11 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
         state = self.__dict__.copy()
         if "logger" in state.keys():
             state.pop("logger", None)
+        if state.get("_event_logger", None) is not None:
+            self._event_logger.flush(wait=True)
+            state["_event_logger"] = None
+        state["_event_logger_finalizer"] = None
+        state["_negotiation_pool"] = None
         return state
 
     def __setstate__(self, state):
@@ -1120,7 +1835,9 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
             screen_level=self.log_screen_level if self.log_to_screen else None,
             file_level=self.log_file_level,
             app_wide_log_file=True,
+            buffered=self.log_buffered,
         )
+        self._open_event_logger()
 
     def __init__(
         self,
@@ -1140,11 +1857,15 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
         log_to_file=True,
         log_ufuns=False,
         log_negotiations: bool = False,
+        negotiation_log_sink: Union[str, NegotiationLogSink] = "binary",
         log_to_screen: bool = False,
         log_stats_every: int = 0,
         log_file_level=logging.DEBUG,
         log_screen_level=logging.ERROR,
         log_file_name="log.txt",
+        log_buffered: bool = False,
+        log_events: bool = False,
+        collect_timing: bool = False,
         save_signed_contracts: bool = True,
         save_cancelled_contracts: bool = True,
         save_negotiations: bool = True,
@@ -1158,7 +1879,12 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
         checkpoint_filename: str = None,
         extra_checkpoint_info: Dict[str, Any] = None,
         single_checkpoint: bool = True,
+        checkpoint_full_every: int = 1,
+        checkpoint_background: bool = False,
         exist_ok: bool = True,
+        negotiation_parallelism: str = "serial",
+        negotiation_priority: Optional[Callable[[Mechanism], Any]] = None,
+        negotiation_max_workers: Optional[int] = None,
         name=None,
     ):
         """
@@ -1171,11 +1897,41 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
             neg_n_steps: Maximum number of steps allowed for a negotiation.
             neg_step_time_limit: Time limit for single step of the negotiation protocol.
             neg_time_limit: Real-time limit on each single negotiation
+            negotiation_log_sink: Where to save negotiations if `log_negotiations` is given. Either a
+                                  `NegotiationLogSink` or "binary" for a single append-only file in the log folder
+                                  (see `BinaryNegotiationLogSink`) or "csv" for a CSV file per negotiation.
+            log_stats_every: If positive, the stats are appended to `stats.csv` in the log folder every that many
+                             steps (only new rows are written) and all stats are saved at the end of `run`.
+            safe_stats_monitoring: Kept for backward compatibility. Stats monitors always receive read-only views
+                                   of the stats so they cannot modify them.
+            log_buffered: If true, log records are written to the log file by a background thread.
+            log_events: If true, structured events (negotiations, contracts, breaches, ...) are logged to
+                        `events.jsonl` in the log folder by a background thread (see `logevent` and `EventLogger`).
+            collect_timing: If true, the time spent in every phase of `step` (signing, negotiations, entities,
+                            contract execution, simulation step and stats) and in stepping every type of agent and
+                            mechanism is accumulated in `timing_stats` (see `TimingStats`) and saved to `timing.csv`
+                            with the stats.
+            negotiation_parallelism: How to step running negotiations ("serial" or "threads"). If "threads",
+                                     negotiations are stepped concurrently in every pass of `step` and
+                                     `run_negotiations` which overlaps the waits of I/O-bound negotiators (e.g.
+                                     `GeniusNegotiator`). Only negotiations with no common agents are stepped at the
+                                     same time and contract registration, logging and stats are still done in a single
+                                     thread in order. Running negotiations in other processes is not supported
+                                     because changes to agents made in the workers would be lost.
+            negotiation_priority: If given, running negotiations are stepped in ascending order of the value it
+                                  returns for their mechanisms instead of a random order (see `NegotiationScheduler`).
+            negotiation_max_workers: Maximum number of threads/processes used to run negotiations in parallel. If
+                                     None, a default that depends on the number of CPUs is used.
             checkpoint_every: The number of steps to checkpoint after. Set to <= 0 to disable
             checkpoint_folder: The folder to save checkpoints into. Set to None to disable
             checkpoint_filename: The base filename to use for checkpoints (multiple checkpoints will be prefixed with
                                  step number).
             single_checkpoint: If true, only the most recent checkpoint will be saved.
+            checkpoint_full_every: The number of checkpoints per full snapshot of the world. Other checkpoints only
+                                   save the changes to the recorded state since the previous checkpoint (new stats
+                                   rows, changed contracts, new breaches and negotiations). Ignored if
+                                   `single_checkpoint` is given.
+            checkpoint_background: If true, checkpoints are written to disk by a background thread.
             extra_checkpoint_info: Any extra information to save with the checkpoint in the corresponding json file as
                                    a dictionary with string keys
             exist_ok: IF true, checkpoints override existing checkpoints with the same filename.
@@ -1192,6 +1948,8 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
             info=extra_checkpoint_info,
             exist_ok=exist_ok,
             single=single_checkpoint,
+            full_every=checkpoint_full_every,
+            background=checkpoint_background,
         )
         self.name = (
             name
@@ -1219,13 +1977,24 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
             screen_level=log_screen_level if log_to_screen else None,
             file_level=log_file_level,
             app_wide_log_file=True,
+            buffered=log_buffered,
+        )
+        self.log_buffered = log_buffered
+        self.log_events = log_events
+        self.log_events_file_name = str(self._log_folder / "events.jsonl")
+        self._open_event_logger()
+        self.timing_stats: Optional[TimingStats] = (
+            TimingStats() if collect_timing else None
         )
         self.ignore_contract_execution_exceptions = ignore_contract_execution_exceptions
         self.ignore_agent_exception = ignore_agent_exceptions
         self.bulletin_board: BulletinBoard = bulletin_board
         self.set_bulletin_board(bulletin_board=bulletin_board)
         self._negotiations: Dict[str, NegotiationInfo] = {}
-        self.unsigned_contracts: Dict[int, Set[Contract]] = defaultdict(set)
+        self._contract_registry = ContractRegistry(record=self.contract_record)
+        self.unsigned_contracts: Dict[
+            int, Set[Contract]
+        ] = self._contract_registry.unsigned
         self.breach_processing = breach_processing
         self.n_steps = n_steps
         self.save_signed_contracts = save_signed_contracts
@@ -1240,11 +2009,25 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
         self.neg_n_steps = neg_n_steps
         self.neg_time_limit = neg_time_limit
         self.neg_step_time_limit = neg_step_time_limit
+        self.negotiation_parallelism = negotiation_parallelism
+        if negotiation_parallelism not in ("serial", "threads"):
+            raise ValueError(
+                f"Unknown negotiation parallelism {negotiation_parallelism} (can be serial or threads)"
+            )
+        self.negotiation_max_workers = negotiation_max_workers
+        self._negotiation_pool: Optional[futures.ThreadPoolExecutor] = None
         self._entities: Dict[int, Set[Entity]] = defaultdict(set)
         self._negotiations: Dict[str, NegotiationInfo] = {}
+        self._scheduler = NegotiationScheduler(priority=negotiation_priority)
         self._start_time = -1
         self._log_ufuns = log_ufuns
         self._log_negs = log_negotiations
+        if isinstance(negotiation_log_sink, str):
+            negotiation_log_sink = {
+                "binary": BinaryNegotiationLogSink,
+                "csv": CSVNegotiationLogSink,
+            }[negotiation_log_sink](self._log_folder)
+        self.negotiation_log_sink = negotiation_log_sink
         self.safe_stats_monitoring = safe_stats_monitoring
         if isinstance(mechanisms, Collection) and not isinstance(mechanisms, dict):
             mechanisms = dict(zip(mechanisms, [dict()] * len(mechanisms)))
@@ -1252,19 +2035,20 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
         self.awi_type = get_class(awi_type, scope=globals())
 
         self._log_folder = str(self._log_folder)
-        self._stats: Dict[str, List[Any]] = defaultdict(list)
+        self._stats = StatsStore(capacity=min(n_steps, 1 << 16))
         self.__n_negotiations = 0
         self.__n_contracts_signed = 0
         self.__n_contracts_concluded = 0
         self.__n_contracts_cancelled = 0
-        self._saved_contracts: Dict[str, Dict[str, Any]] = {}
         self._saved_negotiations: Dict[str, Dict[str, Any]] = {}
         self._saved_breaches: Dict[str, Dict[str, Any]] = {}
+        self._checkpoint_marks = {"stats": 0, "negotiations": 0, "breaches": 0}
         self._started = False
         self.agents: Dict[str, Agent] = {}
         self.immediate_negotiations = start_negotiations_immediately
         self.stats_monitors: Set[StatsMonitor] = set()
         self.world_monitors: Set[WorldMonitor] = set()
+        self._log_stats_every = log_stats_every
         if log_stats_every is None or log_stats_every < 1:
             self._stats_file_name = None
             self._stats_dir_name = None
@@ -1278,41 +2062,67 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
     def log_folder(self):
         return self._log_folder
 
-    def loginfo(self, s: str) -> None:
+    def _log(self, level: int, s: Union[str, Callable[[], str]]) -> None:
+        if not log_enabled(self.logger, level):
+            return
+        if callable(s):
+            s = s()
+        self.logger.log(level, f"{self._log_header()}: " + s.strip())
+
+    def loginfo(self, s: Union[str, Callable[[], str]]) -> None:
         """logs info-level information
 
         Args:
-            s (str): The string to log
+            s (str): The string to log or a callable returning it. The callable is only called (and the header is
+                     only constructed) if the message is going to be logged.
 
         """
-        self.logger.info(f"{self._log_header()}: " + s.strip())
+        self._log(logging.INFO, s)
 
-    def logdebug(self, s) -> None:
+    def logdebug(self, s: Union[str, Callable[[], str]]) -> None:
         """logs debug-level information
 
         Args:
-            s (str): The string to log
+            s (str): The string to log or a callable returning it. The callable is only called (and the header is
+                     only constructed) if the message is going to be logged.
 
         """
-        self.logger.debug(f"{self._log_header()}: " + s.strip())
+        self._log(logging.DEBUG, s)
 
-    def logwarning(self, s) -> None:
+    def logwarning(self, s: Union[str, Callable[[], str]]) -> None:
         """logs warning-level information
 
         Args:
-            s (str): The string to log
+            s (str): The string to log or a callable returning it. The callable is only called (and the header is
+                     only constructed) if the message is going to be logged.
 
         """
-        self.logger.warning(f"{self._log_header()}: " + s.strip())
+        self._log(logging.WARNING, s)
 
-    def logerror(self, s) -> None:
+    def logerror(self, s: Union[str, Callable[[], str]]) -> None:
         """logs error-level information
 
         Args:
-            s (str): The string to log
+            s (str): The string to log or a callable returning it. The callable is only called (and the header is
+                     only constructed) if the message is going to be logged.
+
+        """
+        self._log(logging.ERROR, s)
+
+    def logevent(
+        self, kind: str, entity: Optional[str] = None, payload: Any = None
+    ) -> None:
+        """logs a structured event. Does nothing unless the world was created with `log_events`
+
+        Args:
+            kind: The kind of the event (e.g. "contract-signed")
+            entity: The ID of the entity concerned (if any)
+            payload: Any extra data (should be serializable to JSON and not mutated afterwards)
 
         """
-        self.logger.error(f"{self._log_header()}: " + s.strip())
+        if self._event_logger is None:
+            return
+        self._event_logger.log(self.current_step, entity, kind, payload)
 
     def set_bulletin_board(self, bulletin_board):
         self.bulletin_board = (
@@ -1367,6 +2177,17 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
         # we do not report breachs with no victims
         if breach.victims is None or len(breach.victims) < 1:
             return
+        self.logevent(
+            "breach",
+            entity=breach.perpetrator,
+            payload={
+                "id": breach.id,
+                "contract": breach.contract.id,
+                "type": breach.type,
+                "level": breach.level,
+                "victims": list(breach.victims),
+            },
+        )
         self.bulletin_board.record(
             section="breaches", key=breach.id, value=self.breach_record(breach)
         )
@@ -1376,16 +2197,26 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
         return list(self._saved_negotiations.values())
 
     @property
-    def stats(self) -> Dict[str, Any]:
-        return self._stats
+    def stats(self) -> Dict[str, List[Any]]:
+        """A copy of all stats collected so far as lists.
+
+        Remarks:
+            - Every access converts *all* columns (including per-agent ones) to new python lists which costs
+              O(n_steps * n_metrics). Use `stats_view` (or `_stats.view(name)` for a single metric) to read stats
+              without copying.
+        """
+        return self._stats.to_dict()
+
+    @property
+    def stats_view(self) -> Dict[str, np.ndarray]:
+        """Read-only views of all stats collected so far (no copying)"""
+        return self._stats.views()
 
     def _log_negotiation(self, negotiation: NegotiationInfo) -> None:
         if not self._log_negs:
             return
         mechanism = negotiation.mechanism
         agreement = mechanism.state.agreement
-        negs_folder = str(Path(self._log_folder) / "negotiations")
-        os.makedirs(negs_folder, exist_ok=True)
         record = {
             "partner_ids": [_.id for _ in negotiation.partners],
             "partners": [_.name for _ in negotiation.partners],
@@ -1396,13 +2227,21 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
             "agreement": str(agreement),
             "id": negotiation.mechanism.id,
         }
-        record.update(to_flat_dict(negotiation.annotation))
-        add_records(str(Path(self._log_folder) / "negotiation_info.csv"), [record])
-        data = pd.DataFrame([to_flat_dict(_) for _ in mechanism.history])
-        data.to_csv(os.path.join(negs_folder, f"{mechanism.id}.csv"), index=False)
+        if negotiation.annotation is not None:
+            record.update(to_flat_dict(negotiation.annotation))
+        if len(mechanism.history) > 0:
+            data = [dict(_.__dict__) for _ in mechanism.history]
+        elif mechanism.trace is not None:
+            data = mechanism.trace.to_dict()
+        else:
+            data = []
+        self.negotiation_log_sink.log(record, data)
 
     def step(self) -> bool:
         """A single simulation step"""
+        timing = self.timing_stats
+        if timing is not None:
+            step_start = phase_start = time.perf_counter()
         did_not_start, self._started = self._started, True
         if self.current_step == 0:
             for priority in sorted(self._entities.keys()):
@@ -1410,11 +2249,7 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
                     agent.init_()
 
             for monitor in self.stats_monitors:
-                if self.safe_stats_monitoring:
-                    __stats = copy.deepcopy(self.stats)
-                else:
-                    __stats = self.stats
-                monitor.init(__stats, world_name=self.name)
+                monitor.init(self.stats_view, world_name=self.name)
             for monitor in self.world_monitors:
                 monitor.step(self)
         self.checkpoint_on_step_started()
@@ -1423,52 +2258,63 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
                 f"Asked  to step after the simulation ({self.n_steps}). Will just ignore this"
             )
             for monitor in self.stats_monitors:
-                if self.safe_stats_monitoring:
-                    __stats = copy.deepcopy(self.stats)
-                else:
-                    __stats = self.stats
-                monitor.step(__stats, world_name=self.name)
+                monitor.step(self.stats_view, world_name=self.name)
             for monitor in self.world_monitors:
                 monitor.step(self)
             return False
         self.loginfo(
-            f"{len(self._negotiations)} Negotiations/{len(self.agents)} Agents"
+            lambda: f"{len(self._negotiations)} Negotiations/{len(self.agents)} Agents"
         )
 
         def _run_negotiations(n_steps: Optional[int] = None):
             """ Runs all bending negotiations """
             n_steps_broken_, n_steps_success_ = 0, 0
-            mechanisms = list(
-                (k, _.mechanism) for k, _ in self._negotiations.items() if _ is not None
-            )
+            scheduler = self._scheduler
+            timing = self.timing_stats
+
+            def _step(mechanism: Mechanism):
+                if timing is None:
+                    return mechanism.step(), 0.0
+                start = time.perf_counter()
+                return mechanism.step(), time.perf_counter() - start
+
+            def _on_step(
+                puuid: str, mechanism: Mechanism, result, duration: float
+            ) -> None:
+                nonlocal n_steps_broken_, n_steps_success_
+                if timing is not None:
+                    timing.add(f"mechanism:{mechanism.__class__.__name__}", duration)
+                agreement, is_running = result.agreement, result.running
+                if agreement is not None or not is_running:  # or not mechanism.running:
+
+                    negotiation = self._negotiations.get(puuid, None)
+                    self._log_negotiation(negotiation)
+
+                    if agreement is None:
+                        n_steps_broken_ += mechanism.state.step + 1
+                        self._register_failed_negotiation(mechanism.ami, negotiation)
+                    else:
+                        n_steps_success_ += mechanism.state.step + 1
+                        self._register_contract(mechanism.ami, negotiation)
+                    self._remove_negotiation(puuid)
+
+            threaded = self.negotiation_parallelism == "threads"
             current_step = 0
-            while len(mechanisms) > 0:
-                random.shuffle(mechanisms)
-                for puuid, mechanism in mechanisms:
-                    result = mechanism.step()
-                    agreement, is_running = result.agreement, result.running
-                    if (
-                        agreement is not None or not is_running
-                    ):  # or not mechanism.running:
-
-                        negotiation = self._negotiations.get(puuid, None)
-                        self._log_negotiation(negotiation)
-
-                        if agreement is None:
-                            n_steps_broken_ += mechanism.state.step + 1
-                            self._register_failed_negotiation(
-                                mechanism.ami, negotiation
-                            )
-                        else:
-                            n_steps_success_ += mechanism.state.step + 1
-                            self._register_contract(mechanism.ami, negotiation)
-                        if negotiation:
-                            self._negotiations.pop(mechanism.uuid, None)
-                mechanisms = list(
-                    (k, _.mechanism)
-                    for k, _ in self._negotiations.items()
-                    if _ is not None
-                )
+            while len(scheduler) > 0:
+                mechanisms = scheduler.next_pass()
+                if not threaded or len(mechanisms) < 2:
+                    for puuid, mechanism in mechanisms:
+                        if puuid in scheduler:
+                            _on_step(puuid, mechanism, *_step(mechanism))
+                else:
+                    # only stepping of negotiations with no common agents overlaps. Side effects are applied in
+                    # pass order before any later negotiation of the same agents is stepped
+                    for batch in self._independent_negotiations(mechanisms):
+                        batch = [_ for _ in batch if _[0] in scheduler]
+                        results = self._step_batch(batch, _step)
+                        for (puuid, mechanism), result in zip(batch, results):
+                            if puuid in scheduler:
+                                _on_step(puuid, mechanism, *result)
                 current_step += 1
                 if n_steps is not None and current_step >= n_steps:
                     break
@@ -1484,6 +2330,8 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
 
         self.pre_step_stats()
         self._stats["n_registered_negotiations_before"].append(len(self._negotiations))
+        if timing is not None:
+            phase_start = timing.lap("phase:start", phase_start)
 
         # sign contacts that are to be signed in this step
         # ------------------------------------------------
@@ -1502,11 +2350,15 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
                 self.on_contract_signed(contract=contract)
             for contract in cancelled:
                 self.on_contract_cancelled(contract=contract)
+        if timing is not None:
+            phase_start = timing.lap("phase:signing", phase_start)
 
         # run all negotiations before the simulation step if that is the meeting strategy
         # --------------------------------------------------------------------------------
         if self.negotiation_speed is None:
             n_steps_broken, n_steps_success = _run_negotiations()
+            if timing is not None:
+                phase_start = timing.lap("phase:negotiations", phase_start)
 
         # Step all entities in the world once:
         # ------------------------------------
@@ -1516,6 +2368,8 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
             tasks += [_ for _ in self._entities[priority]]
 
         for task in tasks:
+            if timing is not None:
+                task_start = time.perf_counter()
             try:
                 task.step_()
             except Exception as e:
@@ -1525,6 +2379,10 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
                 self.logerror(
                     f"Entity exception @{task.id}: {traceback.format_tb(exc_traceback)}"
                 )
+            if timing is not None:
+                timing.lap(f"agent:{task.__class__.__name__}", task_start)
+        if timing is not None:
+            phase_start = timing.lap("phase:entities", phase_start)
 
         # execute contracts that are executable at this step
         # --------------------------------------------------
@@ -1548,8 +2406,7 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
                     )
                     continue
                 if len(contract_breaches) < 1:
-                    self._saved_contracts[contract.id]["executed"] = True
-                    self._saved_contracts[contract.id]["breaches"] = ""
+                    self._contract_registry.executed(contract)
                     executed.add(contract)
                     n_new_contract_executions += 1
                     _size = self.contract_size(contract)
@@ -1558,10 +2415,7 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
                     for partner in contract.partners:
                         self.agents[partner].on_contract_executed(contract)
                 else:
-                    self._saved_contracts[contract.id]["executed"] = False
-                    self._saved_contracts[contract.id]["breaches"] = "; ".join(
-                        str(_) for _ in current_contracts
-                    )
+                    self._contract_registry.breached(contract, contract_breaches)
                     for b in contract_breaches:
                         self._saved_breaches[b.id] = b.as_dict()
                     resolution = self._process_breach(contract, list(contract_breaches))
@@ -1574,11 +2428,15 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
                             contract, list(contract_breaches), resolution
                         )
             self.delete_executed_contracts()  # note that all contracts even breached ones are to be deleted
+        if timing is not None:
+            phase_start = timing.lap("phase:contract_execution", phase_start)
 
         # World Simulation Step:
         # ----------------------
         # The world manager should execute a single step of simulation in this function. It may lead to new negotiations
         self.simulation_step()
+        if timing is not None:
+            phase_start = timing.lap("phase:simulation_step", phase_start)
 
         # do one step of all negotiations if that is specified as the meeting strategy
         if self.negotiation_speed is not None:
@@ -1594,7 +2452,9 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
             if _ is not None and _.mechanism.completed
         )
         for key in completed:
-            self._negotiations.pop(key, None)
+            self._remove_negotiation(key)
+        if timing is not None and self.negotiation_speed is not None:
+            phase_start = timing.lap("phase:negotiations", phase_start)
 
         # update stats
         # ------------
@@ -1620,24 +2480,22 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
 
         self.append_stats()
         for monitor in self.stats_monitors:
-            if self.safe_stats_monitoring:
-                __stats = copy.deepcopy(self.stats)
-            else:
-                __stats = self.stats
-            monitor.step(__stats, world_name=self.name)
+            monitor.step(self.stats_view, world_name=self.name)
         for monitor in self.world_monitors:
             monitor.step(self)
+        if timing is not None:
+            timing.lap("phase:stats", phase_start)
+            timing.lap("step", step_start)
         self.current_step += 1
         # always indicate that the simulation is to continue
         return True
 
     def append_stats(self):
-        if self._stats_file_name is not None:
-            save_stats(
-                self,
-                log_dir=self._stats_dir_name,
-                stats_file_name=self._stats_file_name,
-            )
+        """Appends the stats of steps not saved yet to the stats file every `log_stats_every` steps"""
+        if self._stats_file_name is None:
+            return
+        if (self.current_step + 1) % self._log_stats_every == 0:
+            self._stats.flush(Path(self._stats_dir_name) / self._stats_file_name)
 
     @property
     def saved_breaches(self) -> List[Dict[str, Any]]:
@@ -1662,6 +2520,205 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
                 break
             if not self.step():
                 break
+        if self._log_negs:
+            self.negotiation_log_sink.flush()
+        if self._stats_file_name is not None:
+            save_stats(
+                self,
+                log_dir=self._stats_dir_name,
+                stats_file_name=Path(self._stats_file_name).stem,
+            )
+        self.close()
+        self.checkpoint_flush()
+
+    def _negotiation_executor(self) -> futures.ThreadPoolExecutor:
+        """The thread pool used to step negotiations concurrently (created on first use and shut down by `close`)"""
+        executor = self.__dict__.get("_negotiation_pool", None)
+        if executor is None:
+            executor = self._negotiation_pool = futures.ThreadPoolExecutor(
+                max_workers=self.negotiation_max_workers
+            )
+        return executor
+
+    def _independent_negotiations(
+        self, mechanisms: List[Tuple[str, Mechanism]], agents: Iterable[str] = ()
+    ) -> Iterator[List[Tuple[str, Mechanism]]]:
+        """Splits a pass of negotiations into consecutive batches in which no agent takes part in more than one
+        negotiation.
+
+        Args:
+            mechanisms: The negotiations to step (as pairs of keys in `_negotiations` and mechanisms) in order
+            agents: IDs of agents taking part in all the negotiations besides their partners (e.g. the caller of
+                    `run_negotiations`)
+
+        Remarks:
+            - Agents are not thread-safe (e.g. their utility functions may use a shared simulator) so only the
+              negotiations of a batch can be stepped concurrently (see `_step_batch`).
+            - Negotiations with unknown partners are put in batches of their own.
+        """
+        agents = set(agents)
+        batch, busy = [], set()
+        for puuid, mechanism in mechanisms:
+            negotiation = self._negotiations.get(puuid, None)
+            partners = (
+                {_.id for _ in negotiation.partners} | agents
+                if negotiation is not None and negotiation.partners
+                else None
+            )
+            if batch and (partners is None or not busy.isdisjoint(partners)):
+                yield batch
+                batch, busy = [], set()
+            batch.append((puuid, mechanism))
+            if partners is None:
+                yield batch
+                batch = []
+                continue
+            busy |= partners
+        if batch:
+            yield batch
+
+    def _step_batch(
+        self,
+        batch: List[Tuple[str, Mechanism]],
+        step: Optional[Callable[[Mechanism], Any]] = None,
+    ) -> List[Any]:
+        """Steps the mechanisms of a batch of independent negotiations (see `_independent_negotiations`) concurrently
+        and returns the results of `step` (`Mechanism.step` by default) in order"""
+        if step is None:
+            step = lambda mechanism: mechanism.step()
+        if len(batch) == 1:
+            return [step(batch[0][1])]
+        return list(self._negotiation_executor().map(lambda x: step(x[1]), batch))
+
+    def _open_event_logger(self) -> None:
+        """Opens the structured event logger if events are to be logged (it is closed by `close`)"""
+        self._event_logger = (
+            EventLogger(self.log_events_file_name) if self.log_events else None
+        )
+        # closes the log file and stops its writer thread even if `close` is never called
+        self._event_logger_finalizer = (
+            weakref.finalize(self, self._event_logger.close)
+            if self._event_logger is not None
+            else None
+        )
+
+    def close(self) -> None:
+        """Writes all pending structured events (see `logevent`) and releases the event log file and its writer thread
+        as well as the threads used to step negotiations concurrently.
+
+        Remarks:
+            - Called at the end of `run`. If the world is driven by calling `step` directly, call it after the last
+              step (otherwise it is called when the world is garbage collected).
+            - Events logged after closing are ignored.
+        """
+        executor = self.__dict__.get("_negotiation_pool", None)
+        if executor is not None:
+            executor.shutdown(wait=True)
+            self._negotiation_pool = None
+        finalizer = self.__dict__.get("_event_logger_finalizer", None)
+        if finalizer is not None:
+            finalizer()
+        self._event_logger = None
+        self._event_logger_finalizer = None
+
+    def checkpoint_delta(self) -> Dict[str, Any]:
+        """Returns the changes to the recorded state of the world since the last call (used by incremental
+        checkpoints). See `apply_checkpoint_delta`"""
+        marks = self._checkpoint_marks
+        n_rows = self._stats.n_rows
+        delta = {
+            "step": self.current_step,
+            "stats": {
+                k: v[marks["stats"] : n_rows] for k, v in self._stats.items()
+            },
+            "contracts": self._contract_registry.pop_changes(),
+            "negotiations": list(
+                itertools.islice(
+                    self._saved_negotiations.items(), marks["negotiations"], None
+                )
+            ),
+            "breaches": list(
+                itertools.islice(self._saved_breaches.items(), marks["breaches"], None)
+            ),
+        }
+        marks["stats"] = n_rows
+        marks["negotiations"] = len(self._saved_negotiations)
+        marks["breaches"] = len(self._saved_breaches)
+        return delta
+
+    def apply_checkpoint_delta(self, delta: Dict[str, Any]) -> None:
+        """Applies changes returned by `checkpoint_delta`.
+
+        Remarks:
+            - Only the recorded state (current step, stats, contracts, saved negotiations and breaches) is updated. The
+              state of agents and running negotiations stays as it was in the full checkpoint.
+        """
+        self.current_step = delta["step"]
+        for k, values in delta["stats"].items():
+            column = self._stats[k]
+            for v in values:
+                column.append(v)
+        self._contract_registry.apply_changes(delta["contracts"])
+        self._saved_negotiations.update(delta["negotiations"])
+        self._saved_breaches.update(delta["breaches"])
+        self._checkpoint_marks = {
+            "stats": self._stats.n_rows,
+            "negotiations": len(self._saved_negotiations),
+            "breaches": len(self._saved_breaches),
+        }
+
+    def _fork_shared(self) -> Iterable[Any]:
+        """Objects that are never modified while the world is running and are shared between the world and its forks
+        (see `fork`)"""
+        yield self.negotiation_log_sink
+        # records of finished negotiations are never changed once saved
+        yield from self._saved_negotiations.values()
+        for negotiation in self._negotiations.values():
+            yield negotiation.issues
+            yield from negotiation.issues
+            if negotiation.mechanism is not None:
+                yield from negotiation.mechanism._fork_shared()
+
+    def fork(self) -> "World":
+        """Creates an independent copy of the world (with copies of all of its agents and running negotiations) that can
+        be stepped without affecting this world (e.g. to try what-if scenarios).
+
+        Remarks:
+            - Only the mutable state is copied. Structures that never change while the world is running (issues,
+              outcome spaces, etc. See `_fork_shared`) are shared with the fork and statistics are copied only when
+              either world appends to them. The agents and their internal state are still deep-copied so forking
+              a large world can take a time comparable to `copy.deepcopy`.
+            - The fork keeps the ids of all agents and contracts but running negotiations get new ids (see
+              `Mechanism.fork`).
+            - The fork does not save logs of negotiations, events, statistics or checkpoints (it uses the same logger
+              as this world though).
+            - Worlds with agents that live outside of python (e.g. Java agents) cannot be forked.
+        """
+        cls = self.__class__
+        forked = cls.__new__(cls)
+        memo = {id(_): _ for _ in self._fork_shared() if _ is not None}
+        memo[id(self)] = forked
+        forked.__dict__.update(copy.deepcopy(self.__getstate__(), memo))
+        forked.logger = self.logger
+        forked.log_events = False
+        forked._log_negs = False
+        forked._log_ufuns = False
+        forked._stats_file_name = None
+        CheckpointMixin.checkpoint_init(forked, step_attrib="current_step", folder=None)
+        ids, negotiations = {}, {}
+        for k, negotiation in forked._negotiations.items():
+            mechanism = negotiation.mechanism
+            if mechanism is not None:
+                mechanism._fork_rekey(str(uuid.uuid4()))
+                ids[k] = mechanism.id
+            negotiations[ids.get(k, k)] = negotiation
+        forked._negotiations = negotiations
+        forked._scheduler.rekey(ids)
+        for agent in forked.agents.values():
+            agent._running_negotiations = {
+                ids.get(k, k): v for k, v in agent._running_negotiations.items()
+            }
+        return forked
 
     def register(self, x: "Entity", simulation_priority: int = 0):
         """
@@ -1746,10 +2803,19 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
         if neg.mechanism is None:
             return neg
         self.__n_negotiations += 1
+        self.logevent(
+            "negotiation-registered",
+            entity=caller.id,
+            payload={
+                "mechanism": neg.mechanism.id,
+                "partners": [_.id for _ in partners],
+            },
+        )
         if run_to_completion:
             pass
         else:
             self._negotiations[neg.mechanism.uuid] = neg
+            self._scheduler.add(neg.mechanism.uuid, neg.mechanism)
             if self.immediate_negotiations:
                 mechanism = neg.mechanism
                 puuid = mechanism.uuid
@@ -1762,8 +2828,7 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
                         self._register_failed_negotiation(mechanism.ami, negotiation)
                     else:
                         self._register_contract(mechanism.ami, negotiation)
-                    if negotiation:
-                        self._negotiations.pop(mechanism.uuid, None)
+                    self._remove_negotiation(puuid)
         # self.loginfo(
         #    f'{caller.id} request was accepted')
         return neg
@@ -1772,6 +2837,12 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
         if neg is None or neg.mechanism is None:
             return
         del self._negotiations[neg.mechanism.uuid]
+        self._scheduler.remove(neg.mechanism.uuid)
+
+    def _remove_negotiation(self, key: str) -> None:
+        """Removes a negotiation from the running negotiations"""
+        self._negotiations.pop(key, None)
+        self._scheduler.remove(key)
 
     def request_negotiation_about(
         self,
@@ -2001,29 +3072,37 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
             mechanism = neg.mechanism
             mechanism.add(negotiator, ufun=ufun, role=crole)
 
+        def _on_step(i: int, result: MechanismRoundResult) -> None:
+            if result.running:
+                return
+            neg = negs[i]
+            mechanism = neg.mechanism
+            completed[i] = True
+            if mechanism.agreement is None:
+                contracts[i] = None
+                self._register_failed_negotiation(
+                    mechanism=mechanism.ami, negotiation=neg
+                )
+            else:
+                contracts[i] = self._register_contract(
+                    mechanism=mechanism.ami,
+                    negotiation=neg,
+                    force_signature_now=True,
+                )
+            amis[i] = mechanism.ami
+
         while not all(completed):
-            for i, (done, neg) in enumerate(zip(completed, negs)):
-                if completed[i]:
-                    continue
-                mechanism = neg.mechanism
-                result = mechanism.step()
-                if result.running:
-                    continue
-                completed[i] = True
-                if mechanism.agreement is None:
-                    contracts[i] = None
-                    self._register_failed_negotiation(
-                        mechanism=mechanism.ami, negotiation=neg
-                    )
-                else:
-                    contracts[i] = self._register_contract(
-                        mechanism=mechanism.ami,
-                        negotiation=neg,
-                        force_signature_now=True,
-                    )
-                amis[i] = mechanism.ami
-                if all(completed):
-                    break
+            running = [i for i, done in enumerate(completed) if not done]
+            if self.negotiation_parallelism != "threads" or len(running) < 2:
+                for i in running:
+                    _on_step(i, negs[i].mechanism.step())
+                continue
+            # all negotiations include the caller (agents are not thread-safe) so they end up in batches of one
+            mechanisms = [(negs[i].mechanism.uuid, negs[i].mechanism) for i in running]
+            indices = dict(zip((_[0] for _ in mechanisms), running))
+            for batch in self._independent_negotiations(mechanisms, [caller.id]):
+                for (puuid, _), result in zip(batch, self._step_batch(batch)):
+                    _on_step(indices[puuid], result)
         return list(zip(contracts, amis))
 
     def _log_header(self):
@@ -2096,9 +3175,17 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
             )
         else:
             annot_ = ""
+        self.logevent(
+            "contract-concluded",
+            payload={
+                "id": contract.id,
+                "partners": contract.partners,
+                "mechanism": mechanism.id,
+            },
+        )
         self.logdebug(
-            f'Contract<{"immediate-signature-forced" if force_signature_now else ""}> [{sign_status}]: {[_.name for _ in partners]}'
-            f" > {str(mechanism.state.agreement)} on annotation {annot_}"
+            lambda: f'Contract<{"immediate-signature-forced" if force_signature_now else ""}> [{sign_status}]: '
+            f"{[_.name for _ in partners]} > {str(mechanism.state.agreement)} on annotation {annot_}"
         )
         return contract
 
@@ -2125,8 +3212,12 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
                 state=mechanism_state,
             )
 
+        self.logevent(
+            "negotiation-failed",
+            payload={"partners": [_.id for _ in partners], "mechanism": mechanism.id},
+        )
         self.logdebug(
-            f"Negotiation failure between {[_.name for _ in partners]}"
+            lambda: f"Negotiation failure between {[_.name for _ in partners]}"
             f" on annotation {negotiation.annotation} "
         )
 
@@ -2160,13 +3251,7 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
                 partner.on_contract_signed_(contract=contract)
         else:
             # if self.save_cancelled_contracts:
-            record = self.contract_record(contract)
-            record["signed"] = False
-            record["executed"] = None
-            record["breaches"] = ""
-            self._saved_contracts[contract.id] = record
-            # else:
-            #     self._saved_contracts.pop(contract.id, None)
+            self._contract_registry.reject(contract)
             for partner in partners:
                 partner.on_contract_cancelled_(
                     contract=contract, rejectors=[_.id for _ in rejectors]
@@ -2188,14 +3273,12 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
         """
         self.__n_contracts_signed += 1
         self.unsigned_contracts[self.current_step].remove(contract)
-        record = self.contract_record(contract)
-        if self.save_signed_contracts:
-            record["signed"] = True
-            record["executed"] = None
-            record["breaches"] = ""
-            self._saved_contracts[contract.id] = record
-        else:
-            self._saved_contracts.pop(contract.id, None)
+        self.logevent(
+            "contract-signed", payload={"id": contract.id, "partners": contract.partners}
+        )
+        self._contract_registry.sign(
+            contract, self.current_step, save=self.save_signed_contracts
+        )
 
     def on_contract_cancelled(self, contract):
         """Called whenever a concluded contract is not signed (cancelled)
@@ -2211,25 +3294,32 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
 
         """
         self.__n_contracts_cancelled += 1
-        unsigned = self.unsigned_contracts.get(self.current_step, None)
-        if unsigned is None:
-            return
-        try:
-            unsigned.remove(contract)
-        except KeyError:
-            pass
+        self.logevent(
+            "contract-cancelled",
+            payload={"id": contract.id, "partners": contract.partners},
+        )
+        self._contract_registry.cancel(contract, self.current_step)
+
+    @property
+    def _saved_contracts(self) -> ContractRegistry:
+        return self._contract_registry
+
+    @property
+    def contract_registry(self) -> ContractRegistry:
+        """The registry of all contracts concluded in the world"""
+        return self._contract_registry
 
     @property
     def saved_contracts(self) -> List[Dict[str, Any]]:
-        return list(self._saved_contracts.values())
+        return self._contract_registry.records()
 
     @property
     def signed_contracts(self) -> List[Dict[str, Any]]:
-        return list(_ for _ in self._saved_contracts.values() if _["signed"])
+        return self._contract_registry.records(signed=True)
 
     @property
     def cancelled_contracts(self) -> List[Dict[str, Any]]:
-        return list(_ for _ in self._saved_contracts.values() if not _["signed"])
+        return self._contract_registry.records(signed=False)
 
     def on_contract_concluded(self, contract: Contract, to_be_signed_at: int) -> None:
         """Called to add a contract to the existing set of contract after it is signed
@@ -2246,7 +3336,7 @@ class World(EventSink, EventSource, ConfigReader, NamedObject, CheckpointMixin,
 
         """
         self.__n_contracts_concluded += 1
-        self.unsigned_contracts[to_be_signed_at].add(contract)
+        self._contract_registry.conclude(contract, to_be_signed_at)
         # self.saved_contracts.append(self._contract_record(contract))
 
     def save_config(self, file_name: str):
@@ -2447,18 +3537,20 @@ class SimpleWorld(World, ABC):
 class TimeInAgreementMixin:
     def init(self, time_field="time"):
         self._time_field_name = time_field
-        self.contracts: Dict[int, Set[Contract]] = defaultdict(set)
+        self.contracts: Dict[int, Set[Contract]] = self._contract_registry.scheduled
 
     def on_contract_signed(self: World, contract: Contract):
         super().on_contract_signed(contract=contract)
-        self.contracts[contract.agreement[self._time_field_name]].add(contract)
+        self._contract_registry.schedule(
+            contract, contract.agreement[self._time_field_name]
+        )
 
     def executable_contracts(self: World) -> Collection[Contract]:
         """Called at every time-step to get the contracts that are `executable` at this point of the simulation"""
-        return self.contracts.get(self.current_step, [])
+        return self._contract_registry.scheduled_at(self.current_step)
 
     def delete_executed_contracts(self: World) -> None:
-        self.contracts.pop(self.current_step, None)
+        self._contract_registry.remove_scheduled(self.current_step)
 
 
 class NoContractExecutionMixin:
@@ -2944,6 +4036,9 @@ def save_stats(
     except:
         pass
 
+    if world.timing_stats is not None:
+        world.timing_stats.save(log_dir / "timing.csv")
+
     if world.save_negotiations:
         if len(world.saved_negotiations) > 0:
             data = pd.DataFrame(world.saved_negotiations)
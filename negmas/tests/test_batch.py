@@ -0,0 +1,81 @@
+import random
+
+import numpy as np
+from pytest import mark
+
+from negmas import (
+    AspirationNegotiator,
+    BatchSAORunner,
+    MappingUtilityFunction,
+    NaiveTitForTatNegotiator,
+    SAOMechanism,
+    ToughNegotiator,
+)
+
+
+def _session(seed, negotiator_types, history_mode="offers", n_outcomes=30, **kwargs):
+    random.seed(seed)
+    np.random.seed(seed)
+    mechanism = SAOMechanism(
+        outcomes=n_outcomes, n_steps=40, history_mode=history_mode, **kwargs
+    )
+    ufuns = MappingUtilityFunction.generate_random(
+        len(negotiator_types), outcomes=mechanism.outcomes
+    )
+    for i, (t, u) in enumerate(zip(negotiator_types, ufuns)):
+        mechanism.add(t(name=f"n{i}"), ufun=u)
+    return mechanism
+
+
+def _summary(mechanism):
+    state = mechanism.state
+    names = {_.id: _.name for _ in mechanism.negotiators}
+    return (
+        state.agreement,
+        state.step,
+        state.broken,
+        state.timedout,
+        state.running,
+        state.current_offer,
+        [(names[n], o) for n, o in state.new_offers],
+        [mechanism.negotiator_offers(_.id) for _ in mechanism.negotiators],
+    )
+
+
+@mark.parametrize(
+    "negotiator_types",
+    [
+        (AspirationNegotiator, AspirationNegotiator),
+        (AspirationNegotiator, ToughNegotiator),
+        (AspirationNegotiator, AspirationNegotiator, AspirationNegotiator),
+    ],
+)
+@mark.parametrize("history_mode", ["full", "offers"])
+def test_batch_runner_matches_serial_runs(negotiator_types, history_mode):
+    serial = [_session(_, negotiator_types, history_mode) for _ in range(20)]
+    batched = [_session(_, negotiator_types, history_mode) for _ in range(20)]
+    for mechanism in serial:
+        mechanism.run()
+    runner = BatchSAORunner(batched)
+    runner.run()
+    assert runner.n_fast == len(batched)
+    assert not runner.running
+    for a, b in zip(serial, batched):
+        assert _summary(a) == _summary(b)
+        assert [_.current_offer for _ in a.history] == [
+            _.current_offer for _ in b.history
+        ]
+
+
+def test_batch_runner_falls_back_for_unsupported_sessions():
+    sessions = [
+        _session(0, (AspirationNegotiator, NaiveTitForTatNegotiator)),
+        _session(1, (AspirationNegotiator, AspirationNegotiator), enable_callbacks=True),
+        _session(2, (AspirationNegotiator, AspirationNegotiator), n_outcomes=10),
+        _session(3, (AspirationNegotiator, AspirationNegotiator)),
+    ]
+    runner = BatchSAORunner(sessions)
+    assert runner.n_fast == 2
+    states = runner.run()
+    assert all(not _.running for _ in states)
+    assert all(_.agreement is not None or _.timedout or _.broken for _ in states)
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from negmas.frontier import pareto_frontier_points, is_pareto_optimal
+
+
+def _brute_force_frontier(points):
+    """Returns the set of unique pareto optimal points"""
+    result = set()
+    for i, p in enumerate(points):
+        if np.isnan(p).any():
+            continue
+        dominated = False
+        for j, q in enumerate(points):
+            if i == j or np.isnan(q).any():
+                continue
+            if np.all(q >= p) and np.any(q > p):
+                dominated = True
+                break
+        if not dominated:
+            result.add(tuple(p))
+    return result
+
+
+@pytest.mark.parametrize("n_ufuns", [1, 2, 3, 4])
+def test_frontier_matches_brute_force(n_ufuns):
+    rng = np.random.RandomState(0)
+    for _ in range(10):
+        # use few levels to get many ties and duplicates
+        points = rng.randint(0, 6, size=(200, n_ufuns)).astype(float)
+        points[rng.randint(0, 200, size=5), 0] = np.nan
+        indices, frontier = pareto_frontier_points(points)
+        assert np.array_equal(points[indices], frontier)
+        assert len(set(map(tuple, frontier.tolist()))) == len(indices)
+        assert set(map(tuple, frontier.tolist())) == _brute_force_frontier(points)
+
+
+def test_frontier_orders():
+    rng = np.random.RandomState(1)
+    points = rng.rand(1000, 3)
+    indices, frontier = pareto_frontier_points(points)
+    assert np.all(np.diff(frontier[:, 0]) <= 0)
+    indices, frontier = pareto_frontier_points(points, sort_by_welfare=True)
+    assert np.all(np.diff(frontier.sum(axis=1)) <= 1e-12)
+
+
+def test_frontier_of_large_2d_problems():
+    rng = np.random.RandomState(2)
+    points = rng.rand(200000, 2)
+    indices, frontier = pareto_frontier_points(points)
+    assert np.all(np.diff(frontier[:, 0]) < 0)
+    assert np.all(np.diff(frontier[:, 1]) > 0)
+    assert is_pareto_optimal(points).sum() == len(indices)
+
+
+def test_frontier_of_large_kd_problems():
+    rng = np.random.RandomState(4)
+    # all points are on the simplex so all of them are on the frontier
+    points = rng.rand(20000, 3)
+    points /= points.sum(axis=1, keepdims=True)
+    indices, frontier = pareto_frontier_points(points)
+    assert len(indices) == len(points)
+    assert np.all(np.diff(frontier[:, 0]) <= 0)
+    points = rng.rand(200000, 4)
+    indices, frontier = pareto_frontier_points(points)
+    optimal = is_pareto_optimal(points)
+    assert optimal.sum() == len(indices)
+    # no frontier point dominates another
+    for p in frontier:
+        assert np.sum(np.all(frontier >= p, axis=1)) == 1
+
+
+def test_epsilon_dominance_gives_smaller_frontiers():
+    rng = np.random.RandomState(3)
+    for n_ufuns in (2, 3):
+        points = rng.rand(2000, n_ufuns)
+        exact, _ = pareto_frontier_points(points)
+        approximate, _ = pareto_frontier_points(points, eps=0.05)
+        assert len(approximate) <= len(exact)
+        # every exact frontier point is within eps of some point in the approximate frontier
+        for p in points[exact]:
+            assert np.any(np.all(points[approximate] >= p - 0.05, axis=1))
+
+
+def test_empty_frontier():
+    indices, frontier = pareto_frontier_points(np.empty((0, 2)))
+    assert len(indices) == 0 and frontier.shape == (0, 2)
+
+
+if __name__ == "__main__":
+    pytest.main(args=[__file__])
@@ -1,8 +1,21 @@
 import pytest
 import random
 
+import numpy as np
+
 from .fixtures import *
-from negmas import Issues, outcome_is_valid, outcome_in_range
+from negmas import (
+    Issue,
+    Issues,
+    OutcomeSpace,
+    OutcomeSpaceCache,
+    enumerate_outcomes,
+    outcome_is_valid,
+    outcome_is_complete,
+    outcome_in_range,
+    OutcomeValidator,
+)
+from negmas.sao import SAOMechanism
 
 
 def test_dict_outcomes(issues, valid_outcome_dict, invalid_outcome_dict):
@@ -96,5 +109,133 @@ def test_from_outcomes():
         assert f.values[0] >= v[0] and f.values[1] <= v[1]
 
 
+@pytest.mark.parametrize("keep_issue_names", [True, False])
+def test_outcome_space_matches_enumeration(keep_issue_names):
+    issues = [Issue(3, "quantity"), Issue(["a", "b"], "type"), Issue([0.5, 1.5], "price")]
+    space = OutcomeSpace(issues, keep_issue_names=keep_issue_names)
+    outcomes = enumerate_outcomes(issues, keep_issue_names=keep_issue_names)
+    assert len(space) == len(outcomes) == 12
+    assert list(space) == outcomes
+    assert space == outcomes
+    for i, outcome in enumerate(outcomes):
+        assert space[i] == outcome
+        assert space.index(outcome) == i
+        assert outcome in space
+    assert space[-1] == outcomes[-1]
+    assert space[2:5] == outcomes[2:5]
+    codes = space.codes()
+    assert codes.shape == (12, 3)
+    assert space.ids(codes).tolist() == list(range(12))
+
+
+def test_outcome_space_rejects_invalid_outcomes():
+    space = OutcomeSpace([Issue(3, "quantity"), Issue(["a", "b"], "type")])
+    assert {"quantity": 3, "type": "a"} not in space
+    assert {"quantity": 1, "type": "c"} not in space
+    assert (1, "a") in space
+    assert {"x": 1, "y": "a"} not in space
+    assert space.encode({"x": 1, "y": "a"}, default=None) is None
+    with pytest.raises(ValueError):
+        space.index({"quantity": 1, "type": "c"})
+    with pytest.raises(ValueError):
+        space.index({"x": 1, "y": "a"})
+    with pytest.raises(IndexError):
+        space[6]
+    with pytest.raises(ValueError):
+        OutcomeSpace([Issue((0.0, 1.0), "price")])
+
+
+def test_outcome_space_sampling():
+    space = OutcomeSpace([Issue(10, "a"), Issue(10, "b")])
+    ids = space.sample(30)
+    assert len(set(ids)) == 30
+    assert len(space.sample(1000)) == 100
+    assert all(space.decode(_, astype=tuple) in space for _ in ids)
+
+
+def test_mechanism_uses_outcome_space():
+    issues = [Issue(5, "quantity"), Issue(["a", "b", "c"], "type")]
+    mechanism = SAOMechanism(issues=issues, n_steps=10)
+    assert isinstance(mechanism.outcomes, OutcomeSpace)
+    assert mechanism.outcomes == enumerate_outcomes(issues)
+    for i, outcome in enumerate(mechanism.outcomes):
+        assert mechanism.outcome_index(outcome) == i
+    offers = mechanism.random_outcomes(5)
+    assert len(offers) == 5
+    assert all(_ in mechanism.outcomes for _ in offers)
+
+
+def test_mechanisms_with_identical_issues_share_outcome_spaces():
+    def make_issues():
+        return [Issue(5, "quantity"), Issue(["a", "b", "c"], "type")]
+
+    first = SAOMechanism(issues=make_issues(), n_steps=10)
+    second = SAOMechanism(issues=make_issues(), n_steps=10)
+    assert first.outcomes is second.outcomes
+    assert first.issues is not second.issues
+    assert second.outcome_index({"quantity": 4, "type": "c"}) == 14
+    assert SAOMechanism(outcomes=7).outcomes is SAOMechanism(outcomes=7).outcomes
+    assert list(SAOMechanism(outcomes=3).outcomes) == [(0,), (1,), (2,)]
+    names = SAOMechanism(issues=make_issues(), keep_issue_names=False, n_steps=10)
+    assert names.outcomes is not first.outcomes and names.outcomes[0] == (0, "a")
+
+
+def test_outcome_space_cache_evicts_least_recently_used():
+    cache = OutcomeSpaceCache(max_size=2)
+    spaces = [cache.get([Issue(n + 1, "x")]) for n in range(3)]
+    assert len(cache) == 2
+    assert cache.get([Issue(3, "x")]) is spaces[2]
+    assert cache.get([Issue(1, "x")]) is not spaces[0]
+    assert cache.get([Issue([[1], [2]], "unhashable")]) is not cache.get(
+        [Issue([[1], [2]], "unhashable")]
+    )
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 4, 2)
+    assert stats["uncacheable"] == 2 and stats["hit_rate"] == pytest.approx(0.2)
+    cache.clear()
+    assert len(cache) == 0 and cache.stats()["misses"] == 0
+
+
+def test_outcome_validator_matches_outcome_is_complete():
+    issues = [
+        Issue((0.5, 2.0), "price"),
+        Issue(["a", "b", "c"], "color"),
+        Issue(5, "count"),
+        Issue([1, 3, 5], "size"),
+    ]
+    validator = OutcomeValidator(issues)
+    values = [
+        [0.4, 0.5, 1.0, 2.0, 3],
+        ["a", "c", "d", 1],
+        [-1, 0, 4, 5, "a"],
+        [1, 2, 5, 3.0],
+    ]
+    outcomes = [tuple(random.choice(_) for _ in values) for _ in range(300)]
+    outcomes += [dict(zip(["price", "color", "count", "size"], _)) for _ in outcomes]
+    outcomes += [
+        (1.0, "a", 2),
+        (1.0, "a", 2, 1, 7),
+        {"price": 1.0, "color": "a", "count": 2},
+        {"price": 1.0, "color": "a", "count": 2, "sizes": 1},
+        {"count": 2, "size": 1, "color": "a", "price": 1.0},
+    ]
+    for outcome in outcomes:
+        assert validator.is_complete(outcome) == outcome_is_complete(outcome, issues)
+    numeric = [issues[0], issues[2], issues[3]]
+    array = np.array(
+        [
+            [
+                random.choice([0.4, 1.0, 2.0]),
+                random.choice([-1, 0, 5]),
+                random.randint(0, 5),
+            ]
+            for _ in range(300)
+        ]
+    )
+    assert OutcomeValidator(numeric).are_complete(array).tolist() == [
+        outcome_is_complete(tuple(_), numeric) for _ in array.tolist()
+    ]
+
+
 if __name__ == "__main__":
     pytest.main(args=[__file__])
@@ -0,0 +1,78 @@
+import time
+
+import numpy as np
+import pytest
+
+from negmas import Issue, enumerate_outcomes, outcome_is_valid, sample_outcomes
+from negmas.sampling import ids_to_codes, sample_codes, sample_ids
+
+
+@pytest.mark.parametrize("n", [1, 7, 100, 10 ** 9, 10 ** 30])
+def test_sample_ids_without_replacement_are_distinct_and_in_range(n):
+    np.random.seed(0)
+    for k in {0, 1, min(n, 5), min(n, 60)}:
+        ids = sample_ids(n, k)
+        ids = ids.tolist() if isinstance(ids, np.ndarray) else ids
+        assert len(ids) == k == len(set(ids))
+        assert all(0 <= _ < n for _ in ids)
+    with pytest.raises(ValueError):
+        sample_ids(n, n + 1)
+
+
+def test_sample_ids_are_uniform():
+    np.random.seed(1)
+    counts = np.bincount(
+        np.concatenate([sample_ids(40, 3) for _ in range(20000)]), minlength=40
+    )
+    assert counts.sum() == 60000
+    assert np.abs(counts / 1500 - 1).max() < 0.1
+
+
+def test_ids_to_codes_matches_enumeration_order():
+    issues = [Issue(3, "a"), Issue(["x", "y"], "b"), Issue([0.5, 1.5, 2.5, 3.5], "c")]
+    cards = [_.cardinality() for _ in issues]
+    outcomes = enumerate_outcomes(issues, keep_issue_names=False)
+    codes = ids_to_codes(np.arange(len(outcomes)), cards)
+    decoded = list(zip(*(issue.values_at(codes[:, i]) for i, issue in enumerate(issues))))
+    assert decoded == outcomes
+    big = [10 ** 7] * 4
+    assert ids_to_codes([10 ** 28 - 1, 10 ** 7 + 2], big).tolist() == [
+        [10 ** 7 - 1] * 4,
+        [0, 0, 1, 2],
+    ]
+
+
+def test_sampling_does_not_depend_on_outcome_space_size():
+    issues = [Issue(1000, f"i{_}") for _ in range(10)] + [Issue((0.0, 1.0), "price")]
+    start = time.perf_counter()
+    outcomes = Issue.sample(issues, 1000, astype=tuple, with_replacement=False)
+    assert time.perf_counter() - start < 2.0
+    assert len(set(outcomes)) == 1000
+    assert all(outcome_is_valid(dict(zip([_.name for _ in issues], o)), issues) for o in outcomes)
+    codes = sample_codes([10 ** 6] * 5, 1000, with_replacement=False)
+    assert len(set(map(tuple, codes.tolist()))) == 1000
+
+
+def test_issue_sampling_without_replacement():
+    issue = Issue(["a", "b", "c", "d"], "x")
+    assert sorted(issue.rand_outcomes(4)) == ["a", "b", "c", "d"]
+    assert sorted(Issue(10, "n").rand_outcomes(10)) == list(range(10))
+    assert len(Issue(10 ** 12, "n").rand_outcomes(5)) == 5
+    with pytest.raises(ValueError):
+        issue.rand_outcomes(5, fail_if_not_enough=True)
+    issues = [Issue(3, "a"), Issue(["x", "y"], "b")]
+    outcomes = Issue.sample(issues, 6, astype=tuple, with_replacement=False)
+    assert sorted(outcomes) == sorted(enumerate_outcomes(issues, keep_issue_names=False))
+    assert len(Issue.enumerate(issues, max_n_outcomes=4)) == 4
+
+
+def test_sample_outcomes_of_large_discretized_space():
+    issues = [Issue((0.0, 1.0), "price")] + [Issue(100, f"q{_}") for _ in range(6)]
+    outcomes = sample_outcomes(issues, n_outcomes=500)
+    assert len(outcomes) == 500
+    assert len(set(tuple(_.values()) for _ in outcomes)) == 500
+    assert list(outcomes[0].keys()) == [_.name for _ in issues]
+
+
+if __name__ == "__main__":
+    pytest.main(args=[__file__])
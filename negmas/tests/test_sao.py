@@ -4,8 +4,10 @@ from pathlib import Path
 from typing import List, Optional, Dict
 
 from hypothesis import given, settings
+import pytest
 from pytest import mark
 import hypothesis.strategies as st
+import numpy as np
 
 from negmas import (
     SAOMechanism,
@@ -19,7 +21,10 @@ from negmas import (
     SAOSyncController,
     SAOState,
     ResponseType,
+    ToughNegotiator,
+    NaiveTitForTatNegotiator,
 )
+from negmas.events import Notification
 from negmas.helpers import unique_name
 from negmas.sao import SAOResponse
 
@@ -97,6 +102,55 @@ def test_mechanism_runall(n_negotiators, oia):
     assert not any(_.running for _ in states)
 
 
+def _runall_mechanisms(seed, n=4):
+    random.seed(seed)
+    np.random.seed(seed)
+    mechanisms = []
+    for _ in range(n):
+        mechanism = SAOMechanism(outcomes=10, n_steps=20)
+        ufuns = MappingUtilityFunction.generate_random(2, outcomes=10)
+        for i in range(2):
+            mechanism.add(
+                AspirationNegotiator(name=f"agent{i}", randomize_offer=True),
+                ufun=ufuns[i],
+            )
+        mechanisms.append(mechanism)
+    return mechanisms
+
+
+@mark.parametrize("parallelism", ["serial", "threads", "processes"])
+@mark.parametrize("keep_order", [True, False])
+def test_mechanism_runall_parallel(parallelism, keep_order):
+    mechanisms = _runall_mechanisms(0)
+    negotiators = [_.negotiators for _ in mechanisms]
+    states = SAOMechanism.runall(
+        mechanisms, keep_order=keep_order, parallelism=parallelism, max_workers=2
+    )
+    assert len(states) == len(mechanisms)
+    for state, mechanism, original in zip(states, mechanisms, negotiators):
+        assert not state.running and not mechanism.running
+        assert state.agreement == mechanism.agreement
+        assert state.step == mechanism.state.step
+        assert len(mechanism.history) >= state.step > 0
+        assert mechanism.negotiators == original
+        assert all(_._ami is mechanism.ami for _ in mechanism.negotiators)
+
+
+def test_mechanism_runall_processes_is_deterministic():
+    results = []
+    for _ in range(2):
+        mechanisms = _runall_mechanisms(1)
+        random.seed(3)
+        SAOMechanism.runall(mechanisms, parallelism="processes", max_workers=2)
+        results.append(
+            [
+                (m.agreement, m.state.step, m.negotiator_offers(m.negotiators[0].id))
+                for m in mechanisms
+            ]
+        )
+    assert results[0] == results[1]
+
+
 class MySAOSync(SAOSyncController):
     def counter_all(
         self, offers: Dict[str, "Outcome"], states: Dict[str, SAOState]
@@ -265,3 +319,189 @@ def test_auto_checkpoint(tmp_path, single_checkpoint, checkpoint_every, exist_ok
         assert len(list(new_folder.glob("*"))) == 2
     else:
         assert len(list(new_folder.glob("*"))) == 0
+
+
+def test_state_is_cached_until_the_mechanism_changes():
+    mechanism = SAOMechanism(outcomes=10, n_steps=10)
+    ufuns = MappingUtilityFunction.generate_random(2, outcomes=10)
+    for i in range(2):
+        mechanism.add(AspirationNegotiator(name=f"agent{i}"), ufun=ufuns[i])
+    state = mechanism.state
+    assert mechanism.state is state
+    assert mechanism.ami.state is state
+    mechanism.step()
+    assert mechanism.state is not state
+    assert mechanism.state.step == 1 and state.step == 0
+    state = mechanism.state
+    mechanism._current_offer = mechanism.outcomes[3]
+    assert mechanism.state is not state
+    assert mechanism.state.current_offer == mechanism.outcomes[3]
+
+
+def test_state_follows_time_under_a_time_limit():
+    import time
+
+    mechanism = SAOMechanism(outcomes=10, n_steps=None, time_limit=0.5)
+    ufuns = MappingUtilityFunction.generate_random(2, outcomes=10)
+    for i in range(2):
+        mechanism.add(AspirationNegotiator(name=f"agent{i}"), ufun=ufuns[i])
+    mechanism.step()
+    before = mechanism.state.relative_time
+    time.sleep(0.2)
+    assert mechanism.state.relative_time >= before + 0.3
+    assert mechanism.state.relative_time <= mechanism.relative_time
+
+
+@mark.parametrize("n_negotiators", [2, 4])
+def test_few_states_are_created_per_round(n_negotiators):
+    n_created = [0]
+
+    def counting_factory(**kwargs):
+        n_created[0] += 1
+        return SAOState(**kwargs)
+
+    mechanism = SAOMechanism(outcomes=100, n_steps=50, enable_callbacks=True)
+    mechanism._state_factory = counting_factory
+    ufuns = MappingUtilityFunction.generate_random(n_negotiators, outcomes=100)
+    for i in range(n_negotiators):
+        mechanism.add(AspirationNegotiator(name=f"agent{i}"), ufun=ufuns[i])
+    mechanism.run()
+    n_rounds = len(mechanism.history)
+    # without caching, each negotiator gets a new state for each partner response plus one for its own response
+    assert n_created[0] <= (n_negotiators + 4) * n_rounds
+
+
+@mark.parametrize("history_mode", ["full", "offers", "none"])
+def test_history_modes(history_mode):
+    mechanism = SAOMechanism(outcomes=20, n_steps=30, history_mode=history_mode)
+    ufuns = MappingUtilityFunction.generate_random(2, outcomes=20)
+    for i in range(2):
+        mechanism.add(AspirationNegotiator(name=f"agent{i}"), ufun=ufuns[i])
+    mechanism.run()
+    assert (len(mechanism.history) > 0) == (history_mode == "full")
+    assert (mechanism.trace is None) == (history_mode == "none")
+    if history_mode == "none":
+        return
+    offers = [o for s in mechanism.history for _, o in s.new_offers]
+    assert len(mechanism.trace) >= len(offers)
+    first = mechanism.negotiators[0].id
+    assert all(_ in mechanism.outcomes for _ in mechanism.negotiator_offers(first))
+    if history_mode == "full":
+        assert mechanism.negotiator_offers(first) == [
+            o for s in mechanism.history for n, o in s.new_offers if n == first
+        ]
+
+
+def test_unknown_history_mode_fails():
+    with pytest.raises(ValueError):
+        SAOMechanism(outcomes=10, history_mode="partial")
+
+
+def test_negotiators_sharing_a_ufun_share_the_sorted_outcomes():
+    mechanism = SAOMechanism(outcomes=50, n_steps=40)
+    ufun = MappingUtilityFunction(lambda x: x[0] % 7 + 0.01 * x[0])
+    negotiators = [AspirationNegotiator(name=f"a{i}") for i in range(3)]
+    for negotiator in negotiators:
+        mechanism.add(negotiator, ufun=ufun)
+    mechanism.step()
+    assert all(_.sorted_index is negotiators[0].sorted_index for _ in negotiators)
+    ordered = sorted(
+        ((ufun(o), o) for o in mechanism.outcomes), key=lambda x: x[0], reverse=True
+    )
+    assert negotiators[0].ordered_outcomes == ordered
+    state = mechanism.state
+    for negotiator in negotiators:
+        negotiator.utility_function = MappingUtilityFunction(lambda x: -x[0])
+        negotiator.on_ufun_changed()
+        assert negotiator.propose(state) == (0,)
+
+
+@mark.parametrize(
+    "negotiator_type", [AspirationNegotiator, ToughNegotiator, NaiveTitForTatNegotiator]
+)
+def test_ufun_modified_in_place_rebuilds_the_sorted_outcomes(negotiator_type):
+    mechanism = SAOMechanism(outcomes=5, n_steps=10)
+    ufun = MappingUtilityFunction(lambda x: x[0] / 4)
+    negotiator = negotiator_type(name="n")
+    mechanism.add(negotiator, ufun=ufun)
+    mechanism.add(AspirationNegotiator(name="other"), ufun=ufun)
+    mechanism.step()
+    ufun.mapping = lambda x: 1 - x[0] / 4
+    negotiator.on_notification(
+        Notification(type="ufun_modified", data=None), mechanism.id
+    )
+    if negotiator_type is ToughNegotiator:
+        assert negotiator.best_outcome == (0,)
+    else:
+        assert negotiator.ordered_outcomes[0] == (1.0, (0,))
+    if negotiator_type is not NaiveTitForTatNegotiator:
+        assert negotiator.propose(mechanism.state) == (0,)
+
+
+def test_fork_shares_outcomes_and_runs_independently():
+    issues = [Issue(20, "price"), Issue(10, "quantity")]
+    mechanism = SAOMechanism(issues=issues, n_steps=30, keep_issue_names=False)
+    mechanism.add(
+        AspirationNegotiator(name="buyer"),
+        ufun=MappingUtilityFunction(lambda x: 1 - x[0] / 20 + x[1] / 10),
+    )
+    mechanism.add(
+        AspirationNegotiator(name="seller"),
+        ufun=MappingUtilityFunction(lambda x: x[0] / 20 - x[1] / 10),
+    )
+    for _ in range(3):
+        mechanism.step()
+    history = list(mechanism.history)
+    forked = mechanism.fork()
+    assert forked.id != mechanism.id and forked.ami.id == forked.id
+    assert forked.ami.issues is mechanism.ami.issues
+    assert forked.ami.outcomes is mechanism.ami.outcomes
+    assert all(a is b for a, b in zip(forked.history, history))
+    for a, b in zip(forked.negotiators, mechanism.negotiators):
+        assert a is not b and a.sorted_index is b.sorted_index
+        assert a._ami.state is forked.state
+    forked.run()
+    assert forked.state.step > mechanism.state.step == 3
+    assert mechanism.history == history
+    mechanism.run()
+    assert mechanism.state.agreement == forked.state.agreement
+
+
+def test_mechanisms_can_share_timing_stats():
+    from negmas.helpers import TimingStats
+
+    timing = TimingStats()
+    for _ in range(2):
+        mechanism = SAOMechanism(outcomes=10, n_steps=5, timing_stats=timing)
+        mechanism.add(AspirationNegotiator(), ufun=MappingUtilityFunction(lambda x: x[0]))
+        mechanism.add(
+            AspirationNegotiator(), ufun=MappingUtilityFunction(lambda x: -x[0])
+        )
+        mechanism.run()
+    assert set(timing.keys()) == {"SAOMechanism.step", "SAOMechanism.round"}
+    assert timing["SAOMechanism.round"]["count"] <= timing["SAOMechanism.step"]["count"]
+    assert timing["SAOMechanism.step"]["count"] >= 10
+
+
+def test_closing_a_mechanism_releases_negotiators_and_keeps_its_state():
+    import gc
+    import weakref
+    from negmas import Mechanism
+
+    mechanism = SAOMechanism(outcomes=10, n_steps=10)
+    negotiators = [AspirationNegotiator(), AspirationNegotiator()]
+    mechanism.add(negotiators[0], ufun=MappingUtilityFunction(lambda x: x[0] / 10))
+    mechanism.add(negotiators[1], ufun=MappingUtilityFunction(lambda x: 1 - x[0] / 10))
+    state = mechanism.run()
+    assert Mechanism.all[mechanism.id] is mechanism
+    mechanism.close()
+    assert mechanism.id not in Mechanism.all
+    assert len(mechanism.negotiators) == 0 and len(mechanism.history) == 0
+    assert mechanism.trace is None
+    assert all(_._ami is None for _ in negotiators)
+    assert mechanism.state.agreement == state.agreement
+    assert mechanism.step().agreement == state.agreement
+
+    ref = weakref.ref(SAOMechanism(outcomes=10, n_steps=10))
+    gc.collect()
+    assert ref() is None
@@ -1,3 +1,5 @@
+import logging
+import random
 from pathlib import Path
 from typing import (
     List,
@@ -198,10 +200,11 @@ class DummyAgent(Agent):
         results.append(f"{self.name}: step {self.__current_step}")
 
 
-def test_world_runs_with_some_negs(capsys):
+@pytest.mark.parametrize("parallelism", ["serial", "threads"])
+def test_world_runs_with_some_negs(capsys, parallelism):
     global results
     results = []
-    world = DummyWorld(n_steps=10)
+    world = DummyWorld(n_steps=10, negotiation_parallelism=parallelism)
     world.join(DummyAgent("A1"))
     world.join(DummyAgent("A2"))
     world.run()
@@ -214,6 +217,49 @@ def test_world_runs_with_some_negs(capsys):
     assert sum(world.stats["n_negotiations"]) == 2
 
 
+def test_world_runs_negotiations_of_the_same_agent_one_at_a_time(monkeypatch):
+    import threading
+    import time
+
+    world = DummyWorld(n_steps=10, negotiation_parallelism="threads")
+    agents = [DummyAgent(f"A{i}") for i in range(3)]
+    for agent in agents:
+        world.join(agent)
+    lock, active, most_active = threading.Lock(), [0], [0]
+    step = SAOMechanism.step
+
+    def counted_step(self):
+        with lock:
+            active[0] += 1
+            most_active[0] = max(most_active[0], active[0])
+        try:
+            time.sleep(0.001)
+            return step(self)
+        finally:
+            with lock:
+                active[0] -= 1
+
+    monkeypatch.setattr(SAOMechanism, "step", counted_step)
+    results = world.run_negotiations(
+        caller=agents[0],
+        issues=[[Issue(10, name="i1")]] * 4,
+        partners=[["A1"], ["A2"], ["A1"], ["A2"]],
+        negotiators=[
+            AspirationNegotiator(
+                ufun=MappingUtilityFunction(mapping=lambda x: x["i1"] / 10.0)
+            )
+            for _ in range(4)
+        ],
+    )
+    assert len(results) == 4 and all(ami is not None for _, ami in results)
+    assert most_active[0] == 1
+
+
+def test_world_rejects_process_parallelism():
+    with pytest.raises(ValueError):
+        DummyWorld(n_steps=10, negotiation_parallelism="processes")
+
+
 def test_config_reader_with_a_world():
 
     world = DummyWorld()
@@ -398,5 +444,386 @@ def test_agent_checkpoint_in_world(tmp_path):
         b.step_()
 
 
+def test_bulletin_board_indexes_do_not_change_query_results():
+    from negmas.apps.scml.common import CFP
+    from negmas.situated import BulletinBoard
+
+    boards = [BulletinBoard(), BulletinBoard()]
+    boards[0].add_section("cfps")
+    boards[1].add_section(
+        "cfps",
+        indexes={"is_buy": "is_buy", "publisher": "publisher", "product": "product"},
+        set_indexes={"products": "product"},
+        sorted_index="max_time",
+    )
+    random.seed(0)
+    for i in range(200):
+        cfp = CFP(
+            is_buy=random.random() < 0.5,
+            publisher=f"p{random.randint(0, 4)}",
+            product=random.randint(0, 5),
+            time=random.randint(0, 9),
+            unit_price=(1.0, 2.0),
+            quantity=(1, 3),
+        )
+        for board in boards:
+            board.record("cfps", cfp, key=str(i % 150))
+    for i in range(0, 150, 7):
+        for board in boards:
+            board.remove("cfps", key=str(i))
+    queries = [
+        {"is_buy": True},
+        {"publisher": "p3", "product": 2},
+        {"products": [1, 4], "is_buy": False},
+        {"products": {}.keys()},
+        {"time": (2, 4), "publisher": "p1"},
+    ]
+    for query in queries:
+        expected = boards[0].query("cfps", query)
+        assert list(boards[1].query("cfps", query).items()) == list(expected.items())
+    expired = boards[1].query_range("cfps", upper=4)
+    everything = boards[0].query("cfps", None, view=True)
+    assert list(expired) == [k for k, v in everything.items() if v.max_time <= 4]
+    boards[1].remove("cfps", query={"publisher": "p2"})
+    assert len(boards[1].query("cfps", {"publisher": "p2"})) == 0
+    assert all(v.publisher != "p2" for v in boards[1].query_range("cfps").values())
+    view = boards[1].query("cfps", None, view=True)
+    with pytest.raises(TypeError):
+        view["x"] = None
+
+
+@pytest.mark.parametrize("prioritized", [False, True])
+def test_negotiation_scheduler(prioritized):
+    from negmas.situated import NegotiationScheduler
+
+    mechanisms = {str(i): SAOMechanism(outcomes=10, n_steps=10 - i) for i in range(6)}
+    scheduler = NegotiationScheduler(
+        priority=(lambda m: m.n_steps) if prioritized else None
+    )
+    for k, m in mechanisms.items():
+        scheduler.add(k, m)
+    scheduler.add("0", mechanisms["0"])
+    assert len(scheduler) == 6
+    scheduler.remove("2")
+    assert "2" not in scheduler and len(scheduler) == 5
+    passes = [scheduler.next_pass() for _ in range(5)]
+    for p in passes:
+        assert sorted(k for k, _ in p) == ["0", "1", "3", "4", "5"]
+        assert all(mechanisms[k] is m for k, m in p)
+    if prioritized:
+        assert [k for k, _ in passes[0]] == ["5", "4", "3", "1", "0"]
+
+
+def test_world_steps_negotiations_by_priority():
+    world = DummyWorld(n_steps=3, negotiation_priority=lambda m: m.n_steps)
+    assert world._scheduler.priority is not None
+    world.join(DummyAgent("A1"))
+    world.join(DummyAgent("A2"))
+    world.run()
+    assert len(world._negotiations) == len(world._scheduler)
+
+
+def test_world_logs_events_and_skips_disabled_messages(tmp_path):
+    import json
+
+    world = DummyWorld(n_steps=5, log_folder=tmp_path, log_events=True)
+    world.join(DummyAgent("A1"))
+    world.join(DummyAgent("A2"))
+    built = []
+    world.logger.setLevel(logging.CRITICAL)
+    world.logdebug(lambda: built.append("debug") or "debug")
+    world.logger.setLevel(logging.DEBUG)
+    assert built == []
+    world.run()
+    with open(tmp_path / "events.jsonl") as f:
+        events = [json.loads(_) for _ in f]
+    kinds = [_["kind"] for _ in events]
+    assert kinds.count("negotiation-registered") == sum(
+        world.stats["n_negotiations"]
+    )
+    assert kinds.count("contract-concluded") == len(world._saved_contracts)
+    assert all(set(_.keys()) == {"step", "entity", "kind", "data"} for _ in events)
+    assert [_["step"] for _ in events] == sorted(_["step"] for _ in events)
+
+
+def test_world_releases_event_logger(tmp_path):
+    import gc
+    import json
+    import threading
+
+    n_threads = threading.active_count()
+    world = DummyWorld(n_steps=5, log_folder=tmp_path / "run", log_events=True)
+    world.join(DummyAgent("A1"))
+    world.join(DummyAgent("A2"))
+    world.run()
+    assert world._event_logger is None
+    assert threading.active_count() == n_threads
+
+    world = DummyWorld(n_steps=5, log_folder=tmp_path / "step", log_events=True)
+    world.join(DummyAgent("A1"))
+    world.join(DummyAgent("A2"))
+    for _ in range(3):
+        world.step()
+    n_logged = len(world._saved_contracts)
+    del world
+    gc.collect()
+    assert threading.active_count() == n_threads
+    with open(tmp_path / "step" / "events.jsonl") as f:
+        kinds = [json.loads(_)["kind"] for _ in f]
+    assert kinds.count("contract-concluded") == n_logged
+
+
+@pytest.mark.parametrize("sink", ["binary", "csv"])
+def test_world_logs_negotiations_to_sink(tmp_path, sink):
+    from negmas.traces import BinaryNegotiationLogSink
+
+    world = DummyWorld(
+        n_steps=5,
+        log_folder=tmp_path,
+        log_negotiations=True,
+        negotiation_log_sink=sink,
+    )
+    world.join(DummyAgent("A1"))
+    world.join(DummyAgent("A2"))
+    world.run()
+    n_negotiations = sum(world.stats["n_negotiations"])
+    assert n_negotiations > 0
+    if sink == "csv":
+        assert len(list((tmp_path / "negotiations").glob("*.csv"))) == n_negotiations
+        return
+    assert not (tmp_path / "negotiations").exists()
+    logs = BinaryNegotiationLogSink(tmp_path)
+    assert len(logs) == n_negotiations
+    for nid in logs.ids():
+        info, data = logs.read(nid)
+        assert info["id"] == nid
+        assert len(data["step"]) > 0
+    logs.to_csv(tmp_path / "converted")
+    assert (
+        len(list((tmp_path / "converted" / "negotiations").glob("*.csv")))
+        == n_negotiations
+    )
+    assert (tmp_path / "converted" / "negotiation_info.csv").exists()
+
+
+def test_world_stats_are_flushed_incrementally_and_monitored_read_only(tmp_path):
+    import pandas as pd
+    from negmas.situated import StatsMonitor
+
+    class Monitor(StatsMonitor):
+        def __init__(self):
+            super().__init__()
+            self.lengths = []
+
+        def step(self, stats, world_name):
+            with pytest.raises(ValueError):
+                stats["n_negotiations"][0] = 100
+            self.lengths.append(len(stats["n_negotiations"]))
+
+    world = DummyWorld(n_steps=6, log_folder=tmp_path, log_stats_every=2)
+    monitor = Monitor()
+    world.register_stats_monitor(monitor)
+    world.join(DummyAgent("A1"))
+    world.join(DummyAgent("A2"))
+    for i in range(3):
+        world.step()
+    data = pd.read_csv(tmp_path / "stats.csv", index_col="index")
+    assert len(data) == 2
+    assert data["n_negotiations"].tolist() == world.stats["n_negotiations"][:2]
+    world.run()
+    assert monitor.lengths[:6] == list(range(1, 7))
+    assert isinstance(world.stats["n_negotiations"], list)
+    data = pd.read_csv(tmp_path / "stats.csv", index_col="index")
+    assert data["n_negotiations"].tolist() == world.stats["n_negotiations"]
+    assert len(data) == world.n_steps
+
+
+def test_world_contract_registry_tracks_contracts_per_agent():
+    world = DummyWorld(n_steps=5)
+    world.join(DummyAgent("A1"))
+    world.join(DummyAgent("A2"))
+    world.run()
+    registry = world.contract_registry
+    assert len(registry) == len(world.saved_contracts) > 0
+    assert registry.count(signed=True) == len(world.signed_contracts)
+    for agent in ("A1", "A2"):
+        contracts = registry.contracts_of(world.agents[agent].id)
+        assert len(contracts) == len(registry)
+        for contract in contracts:
+            record = registry[contract.id]
+            assert {"signed", "executed", "breaches"} <= set(record.keys())
+            assert "signed" not in contract.__dict__
+
+
+def test_world_incremental_checkpoints_can_be_replayed(tmp_path):
+    from negmas.checkpoints import CheckpointRunner
+
+    world = DummyWorld(
+        n_steps=8,
+        checkpoint_every=1,
+        checkpoint_folder=tmp_path,
+        single_checkpoint=False,
+        checkpoint_full_every=3,
+        checkpoint_background=True,
+    )
+    world.join(DummyAgent("A1"))
+    world.join(DummyAgent("A2"))
+    world.run()
+    assert len(list(tmp_path.glob("*.delta"))) == 5
+    final = world.stats
+    runner = CheckpointRunner(folder=tmp_path)
+    assert runner.steps == list(range(8))
+    for step in runner.steps:
+        runner.goto(step, exact=True)
+        w = runner.loaded_object
+        assert w.current_step == step
+        assert w.stats.get("n_negotiations", []) == final["n_negotiations"][:step]
+        assert len(w.saved_contracts) <= len(world.saved_contracts)
+        if step % 3 == 0:
+            assert runner.fork() is not None
+        else:
+            with pytest.raises(ValueError):
+                runner.fork()
+
+
 if __name__ == "__main__":
     pytest.main(args=[__file__])
+
+
+def test_world_fork_runs_independently():
+    world = DummyWorld(n_steps=10)
+    world.join(DummyAgent("A1"))
+    world.join(DummyAgent("A2"))
+    for _ in range(3):
+        world.step()
+    before = world.stats["n_negotiations"]
+    forked = world.fork()
+    assert forked.current_step == world.current_step == 3
+    assert forked.stats["n_negotiations"] == before
+    assert forked.bulletin_board is not world.bulletin_board
+    assert forked.agents["A1"] is not world.agents["A1"]
+    assert forked.agents["A1"].awi._world is forked
+    forked.run()
+    assert forked.current_step == 10
+    assert world.current_step == 3
+    assert world.stats["n_negotiations"] == before
+    world.run()
+    assert world.current_step == 10
+    assert len(forked.stats["n_negotiations"]) == len(world.stats["n_negotiations"])
+
+
+def test_world_collects_timing_per_phase(tmp_path):
+    from negmas.helpers import TimingStats
+    from negmas.situated import save_stats
+    from negmas.tournaments import combine_tournament_timing
+
+    world = DummyWorld(n_steps=5, collect_timing=True)
+    world.join(DummyAgent("A1"))
+    world.join(DummyAgent("A2"))
+    world.run()
+    timing = world.timing_stats
+    for key in (
+        "step",
+        "phase:start",
+        "phase:signing",
+        "phase:entities",
+        "phase:contract_execution",
+        "phase:simulation_step",
+        "phase:negotiations",
+        "phase:stats",
+        "agent:DummyAgent",
+        "mechanism:SAOMechanism",
+    ):
+        assert key in timing.keys()
+    assert timing["step"]["count"] == 5
+    assert timing["agent:DummyAgent"]["count"] == 10
+    phases = sum(v["total"] for k, v in timing.items() if k.startswith("phase:"))
+    assert phases <= timing["step"]["total"]
+    for i in range(2):
+        save_stats(world, log_dir=tmp_path / f"w{i}")
+    assert TimingStats.load(tmp_path / "w0" / "timing.csv")["step"] == timing["step"]
+    combined = combine_tournament_timing([tmp_path])
+    assert combined.loc["step", "count"] == 10
+
+    assert DummyWorld(n_steps=5).timing_stats is None
+
+
+def test_bulletin_board_listeners_receive_only_matching_events():
+    from negmas.events import Event, EventSink
+    from negmas.situated import BulletinBoard
+
+    class Recorder(EventSink):
+        def __init__(self):
+            self.events, self.batches = [], []
+
+        def on_event(self, event, sender):
+            self.events.append((event.type, event.data["section"], event.data["key"]))
+
+        def on_events(self, events, sender):
+            self.batches.append(len(events))
+            super().on_events(events, sender)
+
+    board = BulletinBoard()
+    for section in ("cfps", "settings"):
+        board.add_section(section)
+    everything, cfps, big = Recorder(), Recorder(), Recorder()
+    for event_type in ("new_record", "will_remove_record"):
+        board.register_listener(event_type, everything)
+        board.register_listener(event_type, cfps, data={"section": "cfps"})
+    board.register_listener(
+        "new_record",
+        big,
+        data={"section": "cfps"},
+        condition=lambda e: e.data["value"] > 10,
+    )
+    board.record("cfps", 5, key="a")
+    board.record("cfps", 20, key="b")
+    board.record("settings", 20, key="c")
+    board.remove("cfps", key="a")
+    assert len(everything.events) == 4
+    assert cfps.events == [
+        ("new_record", "cfps", "a"),
+        ("new_record", "cfps", "b"),
+        ("will_remove_record", "cfps", "a"),
+    ]
+    assert big.events == [("new_record", "cfps", "b")]
+
+    board.announce_many(
+        [
+            Event("new_record", {"section": "cfps", "key": "d", "value": 30}),
+            Event("new_record", {"section": "other", "key": "e", "value": 30}),
+            Event("new_record", {"section": "cfps", "key": "f", "value": 1}),
+        ]
+    )
+    assert everything.batches == [3] and cfps.batches == [2] and big.batches == [1]
+    assert board.unregister_listener("new_record", cfps)
+    assert not board.unregister_listener("new_record", cfps)
+    board.record("cfps", 5, key="g")
+    assert cfps.events[-1][2] == "f"
+
+
+def test_event_source_listener_order_can_be_shuffled_with_a_seed():
+    from negmas.events import Event, EventSink, EventSource
+
+    order = []
+
+    class Sink(EventSink):
+        def __init__(self, i):
+            self.i = i
+
+        def on_event(self, event, sender):
+            order.append(self.i)
+
+    def run(shuffle, seed=None):
+        source = EventSource()
+        for i in range(20):
+            source.register_listener("e", Sink(i))
+        if shuffle:
+            source.set_listener_order(shuffle=True, seed=seed)
+        order.clear()
+        for _ in range(3):
+            source.announce(Event("e", None))
+        return list(order)
+
+    assert run(False) == list(range(20)) * 3
+    assert run(True, seed=1) == run(True, seed=1) != run(False)
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from negmas import NegotiationTrace
+
+
+def test_trace_grows_beyond_capacity():
+    outcomes = [(_,) for _ in range(10)]
+    trace = NegotiationTrace(outcomes=outcomes, capacity=2)
+    for i in range(25):
+        trace.record(
+            step=i,
+            time=0.1 * i,
+            relative_time=i / 25,
+            proposer=f"p{i % 3}",
+            outcome=outcomes[i % 10],
+            outcome_index=i % 10,
+        )
+    assert len(trace) == 25
+    assert trace.column("step").tolist() == list(range(25))
+    assert trace.proposers == ["p0", "p1", "p2"]
+    assert trace.rows_of("p1").tolist() == list(range(1, 25, 3))
+    assert trace.offers_of("p2") == [outcomes[i % 10] for i in range(2, 25, 3)]
+    assert trace.offers_of("unknown") == []
+
+
+def test_trace_keeps_unindexed_outcomes():
+    trace = NegotiationTrace()
+    trace.record(step=0, time=0.0, relative_time=0.0, proposer="a", outcome=(0.5,))
+    trace.record(step=1, time=0.1, relative_time=0.5, proposer="b", outcome=(0.7,))
+    assert trace.column("outcome").tolist() == [-1, -1]
+    d = trace.to_dict()
+    assert d["outcome"] == [(0.5,), (0.7,)]
+    assert d["proposer"] == ["a", "b"]
+
+
+def test_trace_columns_are_read_only():
+    trace = NegotiationTrace(outcomes=[(0,)])
+    trace.record(
+        step=0, time=0.0, relative_time=0.0, proposer="a", outcome=(0,), outcome_index=0
+    )
+    with pytest.raises(ValueError):
+        trace.column("step")[0] = 3
+    assert np.all(trace.column("outcome") == 0)
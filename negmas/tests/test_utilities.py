@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from negmas import *
@@ -146,5 +147,209 @@ def test_hypervolume_utility():
             assert u == e
 
 
+def _loop_utilities(ufun, outcomes):
+    return [float("nan") if ufun(o) is None else float(ufun(o)) for o in outcomes]
+
+
+@pytest.mark.parametrize("keep_issue_names", [True, False])
+def test_eval_many_matches_calling_the_ufun(keep_issue_names):
+    issues = [Issue(5, "a"), Issue(["x", "y", "z"], "b"), Issue([0.5, 1.5], "c")]
+    space = OutcomeSpace(issues, keep_issue_names=keep_issue_names)
+    outcomes = list(space)
+    keys = ["a", "b", "c"] if keep_issue_names else [0, 1, 2]
+    mapping_keys = [tuple(o.values()) if keep_issue_names else o for o in outcomes]
+    ufuns = [
+        LinearUtilityFunction({keys[0]: 1.0, keys[2]: 2.0}),
+        LinearUtilityAggregationFunction(
+            {
+                keys[0]: lambda x: 2 * x,
+                keys[1]: {"x": 1.0, "y": 2.0, "z": 3.0},
+                keys[2]: lambda x: -x,
+            },
+            weights={keys[0]: 1.0, keys[1]: 2.0, keys[2]: 3.0},
+        ),
+        MappingUtilityFunction(
+            dict(zip(mapping_keys[::2], range(len(outcomes)))), default=-1.0
+        ),
+        HyperRectangleUtilityFunction(
+            outcome_ranges=[
+                {keys[0]: (0.5, 3), keys[1]: ["x", "z"]},
+                {keys[2]: [(1.0, 2.0), 0.5]},
+            ],
+            utilities=[2.0, lambda o: 5.0],
+        ),
+        ComplexWeightedUtilityFunction(
+            ufuns=[LinearUtilityFunction({keys[0]: 1.0})], weights=[2.0]
+        ),
+    ]
+    for ufun in ufuns:
+        expected = _loop_utilities(ufun, outcomes)
+        for batch in (space, outcomes):
+            result = ufun.eval_many(batch)
+            assert result.dtype == np.float64
+            assert np.allclose(result, expected, equal_nan=True)
+        chunked = np.concatenate([ufun.eval_codes(space, c) for _, c in space.chunks(7)])
+        assert np.allclose(chunked, expected, equal_nan=True)
+
+
+def test_chunked_scans_match_full_evaluation():
+    issues = [Issue(20, "a"), Issue(["x", "y", "z"], "b"), Issue((0.0, 1.0), "c")]
+    space = OutcomeSpace(
+        [issues[0], issues[1], Issue([0.0, 0.25, 0.5, 0.75, 1.0], "c")],
+        keep_issue_names=False,
+    )
+    ufuns = [
+        LinearUtilityFunction({0: 1.0, 2: -3.0}),
+        LinearUtilityAggregationFunction(
+            [lambda x: -x, {"x": 1.0, "y": 5.0, "z": 2.0}, lambda x: 4 * x]
+        ),
+        lambda o: o[0] * o[2],
+    ]
+    frontier, indices = pareto_frontier(ufuns, outcomes=list(space))
+    for chunk_size in (1, 7, 64, len(space)):
+        assert pareto_frontier(ufuns, outcomes=space, chunk_size=chunk_size) == (
+            frontier,
+            indices,
+        )
+    assert pareto_frontier(ufuns, issues=issues, n_discretization=5, chunk_size=13) == (
+        frontier,
+        indices,
+    )
+    u = ufuns[1].eval_many(list(space))
+    assert utility_range(ufuns[1], outcomes=space, chunk_size=7) == (u.max(), u.min())
+    assert utility_range(
+        ufuns[1], outcomes=space, chunk_size=7, infeasible_cutoff=-19.0
+    ) == (u.max(), u[u > -19.0].min())
+    target = int(np.flatnonzero(u < -17.5)[0])
+    assert (
+        outcome_with_utility(
+            ufuns[1], (-100, -17.5), outcomes=space, n_trials=None, chunk_size=7
+        )
+        == space[target]
+    )
+    assert (
+        outcome_with_utility(
+            ufuns[1], (-100, -17.5), outcomes=space, n_trials=target, chunk_size=7
+        )
+        is None
+    )
+
+
+def test_eval_many_uses_reserved_value_for_none():
+    ufun = LinearUtilityFunction([1.0, 2.0], reserved_value=-1.0)
+    assert ufun.eval_many([(1, 1), None]).tolist() == [3.0, -1.0]
+
+
+def test_eval_array():
+    ufun = LinearUtilityFunction({"price": 1.0, "quantity": 2.0})
+    outcomes = np.array([[1.0, 2.0], [3.0, 0.5]])
+    assert ufun.eval_array(outcomes, issue_names=["price", "quantity"]).tolist() == [
+        5.0,
+        4.0,
+    ]
+    ufun = MappingUtilityFunction(lambda x: x[0] - x[1])
+    assert ufun.eval_array(outcomes).tolist() == [-1.0, 2.5]
+
+
+def _scan_first_below(utilities, level):
+    ordered = [_ for _ in sorted(utilities, reverse=True) if not np.isnan(_)]
+    for rank, u in enumerate(ordered):
+        if not np.isnan(u) and u < level:
+            return rank
+    return len(utilities)
+
+
+def test_sorted_utility_index_matches_linear_scan():
+    utilities = np.array([0.5, np.nan, 1.0, -np.inf, 0.5, 0.0, np.nan, 0.25, 1.0])
+    outcomes = [(_,) for _ in range(len(utilities))]
+    index = SortedUtilityIndex(utilities, outcomes)
+    known = [_ for _ in range(len(utilities)) if not np.isnan(utilities[_])]
+    unknown = [_ for _ in range(len(utilities)) if np.isnan(utilities[_])]
+    ordered = sorted(known, key=lambda i: utilities[i], reverse=True) + unknown
+    assert [index.outcome(_) for _ in range(len(index))] == [
+        outcomes[_] for _ in ordered
+    ]
+    assert index.n_known == 7
+    for level in (2.0, 1.0, 0.6, 0.5, 0.3, 0.0, -1.0, -np.inf, np.inf):
+        assert index.first_below(level) == _scan_first_below(utilities, level)
+    assert [utilities[index.order[_]] for _ in index.within(0.25, 0.5)] == [
+        0.5,
+        0.5,
+        0.25,
+    ]
+    assert len(index.within(2.0, 3.0)) == 0
+
+
+def test_sorted_utility_index_is_shared_and_invalidated():
+    outcomes = [(_,) for _ in range(10)]
+    ufun = MappingUtilityFunction(lambda x: x[0])
+    index = SortedUtilityIndex.from_ufun(ufun, outcomes)
+    assert SortedUtilityIndex.from_ufun(ufun, outcomes) is index
+    assert SortedUtilityIndex.from_ufun(ufun, list(outcomes)) is not index
+    assert SortedUtilityIndex.from_ufun(ufun, outcomes, cache=False) is not index
+    assert index.outcome(0) == (9,)
+    ufun.mapping = lambda x: -x[0]
+    SortedUtilityIndex.invalidate(ufun)
+    assert SortedUtilityIndex.from_ufun(ufun, outcomes).outcome(0) == (0,)
+
+
+def test_sorted_utility_index_is_dropped_with_its_ufun():
+    import gc
+
+    gc.collect()
+    n_cached = len(SortedUtilityIndex._cache)
+    outcomes = [(_,) for _ in range(10)]
+    ufuns = [MappingUtilityFunction(lambda x, i=i: x[0] * i) for i in range(5)]
+    for ufun in ufuns:
+        SortedUtilityIndex.from_ufun(ufun, outcomes)
+    assert len(SortedUtilityIndex._cache) == n_cached + len(ufuns)
+    del ufun, ufuns
+    gc.collect()
+    assert len(SortedUtilityIndex._cache) == n_cached
+    assert all(ref() is not None for ref, _ in SortedUtilityIndex._cache.values())
+
+
+def test_cached_utility_function():
+    calls = []
+
+    def f(o):
+        calls.append(o)
+        return o["a"] + 2 * o["b"]
+
+    ufun = CachedUtilityFunction(MappingUtilityFunction(f), maxsize=None)
+    ufun.reserved_value = 0.5
+    assert ufun.ufun.reserved_value == 0.5 and ufun(None) == 0.5
+    assert ufun({"a": 1, "b": 2}) == 5
+    assert ufun({"a": 1, "b": 2}) == 5
+    assert len(calls) == 1 and ufun.hits == 1 and ufun.misses == 1
+    assert ufun({"a": 1, "b": 2, "c": [0]}) == 5 and ufun.misses == 2
+    assert len(calls) == 2 and len(ufun) == 1
+    outcomes = [{"a": i, "b": j} for i in range(3) for j in range(3)]
+    assert np.allclose(ufun.eval_many(outcomes), [f(_) for _ in outcomes])
+    ufun.invalidate()
+    assert len(ufun) == 0
+
+
+def test_cached_utility_function_keeps_the_order_of_dict_outcomes():
+    ufun = CachedUtilityFunction(LinearUtilityFunction([1.0, 0.0]))
+    assert ufun({"a": 1, "b": 2}) == 1.0
+    assert ufun({"b": 2, "a": 1}) == ufun.ufun({"b": 2, "a": 1}) == 2.0
+    assert len(ufun) == 2
+
+
+def test_negotiators_invalidate_cached_ufuns():
+    from negmas.negotiators import Negotiator
+
+    ufun = CachedUtilityFunction(MappingUtilityFunction(lambda x: x[0]))
+    negotiator = Negotiator(ufun=ufun)
+    ufun((1,))
+    negotiator.utility_function = ufun
+    assert len(ufun) == 0
+    ufun((1,))
+    ufun.ufun.mapping = lambda x: -x[0]
+    negotiator.on_ufun_changed()
+    assert ufun((1,)) == -1
+
+
 if __name__ == "__main__":
     pytest.main(args=[__file__])
@@ -45,6 +45,7 @@ from negmas.helpers import (
     dump,
     add_records,
     load,
+    TimingStats,
 )
 from .situated import Agent, World, save_stats
 import hashlib
@@ -59,6 +60,7 @@ __all__ = [
     "evaluate_tournament",
     "combine_tournaments",
     "combine_tournament_stats",
+    "combine_tournament_timing",
     "create_tournament",
     "run_tournament",
 ]
@@ -191,6 +193,9 @@ class TournamentResults:
     stats: pd.DataFrame = None
     agg_stats: pd.DataFrame = None
     score_stats: pd.DataFrame = None
+    timing: pd.DataFrame = None
+    """Time spent in every phase of world steps and in stepping agents and mechanisms (summed over all worlds). Only
+    available for worlds created with `collect_timing`"""
 
 
 def run_world(
@@ -1491,6 +1496,11 @@ def evaluate_tournament(
             stats.to_csv(str(tournament_path / "stats.csv"), index=False)
             agg_stats = _combine_stats(stats)
             agg_stats.to_csv(str(tournament_path / "agg_stats.csv"), index=False)
+        timing = combine_tournament_timing(sources=[tournament_path], dest=None)
+        if len(timing) > 0:
+            timing.to_csv(str(tournament_path / "agg_timing.csv"))
+    else:
+        timing = pd.DataFrame()
 
     if verbose:
         print(f"N. scores = {len(scores)}\tN. Worlds = {len(scores.world.unique())}")
@@ -1505,6 +1515,7 @@ def evaluate_tournament(
         stats=stats,
         agg_stats=agg_stats,
         score_stats=score_stats,
+        timing=timing,
     )
 
 
@@ -1585,6 +1596,20 @@ def combine_tournament_stats(
     return stats
 
 
+def combine_tournament_timing(
+    sources: Iterable[Union[str, PathLike]], dest: Union[str, PathLike] = None
+) -> pd.DataFrame:
+    """Combines the timing of all world runs (timing.csv files) in the given sources (see `TimingStats`)."""
+    timing = TimingStats()
+    for src in sources:
+        for filename in _path(src).glob("**/timing.csv"):
+            timing.merge(TimingStats.load(filename))
+    timing = timing.to_frame()
+    if dest is not None and len(timing) > 0:
+        timing.to_csv(str(_path(dest) / "agg_timing.csv"))
+    return timing
+
+
 def _combine_stats(stats: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
     """Generates aggregate stats from stats"""
     if stats is None:
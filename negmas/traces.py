@@ -0,0 +1,384 @@
+"""Compact, columnar recording of negotiation traces.
+
+A `NegotiationTrace` keeps one row per offer made during a negotiation in preallocated NumPy columns (step, time,
+relative time, proposer index and outcome index) that grow geometrically when full. It also keeps, for every
+proposer, the rows of its offers so that the offers of a single negotiator can be retrieved without scanning the
+whole trace.
+
+Mechanisms select how much they keep using a history mode (see `HISTORY_MODES`):
+
+- *full*: The complete state after every step (`Mechanism.history`) in addition to the trace.
+- *offers*: Only the trace.
+- *none*: Nothing at all.
+
+Worlds write the records of completed negotiations to a `NegotiationLogSink`. `BinaryNegotiationLogSink` appends
+them in chunks to a single file per world with an index for random access while `CSVNegotiationLogSink` keeps one
+CSV file per negotiation.
+
+Examples:
+
+    >>> trace = NegotiationTrace(outcomes=[(0,), (1,), (2,)])
+    >>> trace.record(step=0, time=0.1, relative_time=0.0, proposer="a", outcome=(2,), outcome_index=2)
+    >>> trace.record(step=1, time=0.2, relative_time=0.5, proposer="b", outcome=(0,), outcome_index=0)
+    >>> trace.record(step=2, time=0.3, relative_time=1.0, proposer="a", outcome=(1,), outcome_index=1)
+    >>> len(trace)
+    3
+    >>> trace.offers_of("a")
+    [(2,), (1,)]
+    >>> trace.column("step").tolist()
+    [0, 1, 2]
+
+"""
+import os
+import pickle
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from negmas.helpers import add_records
+from negmas.java import to_flat_dict
+from negmas.outcomes import Outcome
+
+__all__ = [
+    "NegotiationTrace",
+    "HISTORY_MODES",
+    "NegotiationLogSink",
+    "CSVNegotiationLogSink",
+    "BinaryNegotiationLogSink",
+]
+
+HISTORY_MODES = ("full", "offers", "none")
+"""Allowed values for the `history_mode` of mechanisms"""
+
+_COLUMNS = {
+    "step": np.int64,
+    "time": np.float64,
+    "relative_time": np.float64,
+    "proposer": np.int32,
+    "outcome": np.int64,
+}
+
+
+class NegotiationTrace:
+    """A columnar record of all offers made in a negotiation.
+
+    Args:
+        outcomes: The outcomes of the negotiation (if known). Used to decode outcome indices.
+        capacity: The initial number of rows to preallocate.
+
+    Remarks:
+        - Outcomes that have no index (e.g. with continuous issues) are stored separately and get the index -1 in
+          the outcome column.
+    """
+
+    def __init__(
+        self, outcomes: Optional[Sequence[Outcome]] = None, capacity: int = 64
+    ):
+        self.outcomes = outcomes
+        self._n = 0
+        self._columns = {
+            k: np.empty(max(1, capacity), dtype=t) for k, t in _COLUMNS.items()
+        }
+        self.proposers: List[str] = []
+        """IDs of all proposers in the order they first appeared. The proposer column indexes this list"""
+        self._proposer_index: Dict[str, int] = {}
+        self._rows_of: List[List[int]] = []
+        self._unindexed: Dict[int, Outcome] = {}
+
+    def __len__(self):
+        return self._n
+
+    def _grow(self) -> None:
+        for k, v in self._columns.items():
+            self._columns[k] = np.concatenate((v, np.empty(len(v), dtype=v.dtype)))
+
+    def record(
+        self,
+        step: int,
+        time: float,
+        relative_time: float,
+        proposer: str,
+        outcome: Outcome,
+        outcome_index: Optional[int] = None,
+    ) -> None:
+        """Records an offer.
+
+        Args:
+            step: The step at which the offer was made
+            time: The time at which the offer was made
+            relative_time: The relative time at which the offer was made
+            proposer: The ID of the proposer
+            outcome: The offer
+            outcome_index: The index of the offer in `outcomes` if known.
+        """
+        if self._n >= len(self._columns["step"]):
+            self._grow()
+        p = self._proposer_index.get(proposer, None)
+        if p is None:
+            p = self._proposer_index[proposer] = len(self.proposers)
+            self.proposers.append(proposer)
+            self._rows_of.append([])
+        row = self._n
+        if outcome_index is None or outcome_index < 0:
+            outcome_index = -1
+            self._unindexed[row] = outcome
+        columns = self._columns
+        columns["step"][row] = step
+        columns["time"][row] = time
+        columns["relative_time"][row] = relative_time
+        columns["proposer"][row] = p
+        columns["outcome"][row] = outcome_index
+        self._rows_of[p].append(row)
+        self._n += 1
+
+    def column(self, name: str) -> np.ndarray:
+        """Returns a read-only view of one of the columns (step, time, relative_time, proposer, outcome)"""
+        view = self._columns[name][: self._n]
+        view.flags.writeable = False
+        return view
+
+    def outcome_at(self, row: int) -> Outcome:
+        """Returns the outcome offered at the given row"""
+        index = int(self._columns["outcome"][row])
+        if index < 0:
+            return self._unindexed[row]
+        return self.outcomes[index]
+
+    def offers_of(self, proposer: str) -> List[Outcome]:
+        """Returns all offers made by the given proposer in order"""
+        p = self._proposer_index.get(proposer, None)
+        if p is None:
+            return []
+        return [self.outcome_at(_) for _ in self._rows_of[p]]
+
+    def rows_of(self, proposer: str) -> np.ndarray:
+        """Returns the rows of all offers made by the given proposer"""
+        p = self._proposer_index.get(proposer, None)
+        if p is None:
+            return np.empty(0, dtype=np.int64)
+        return np.asarray(self._rows_of[p], dtype=np.int64)
+
+    def to_dict(self) -> Dict[str, List[Any]]:
+        """Converts the trace to a dict of columns with proposer IDs and outcomes decoded (e.g. for a DataFrame)"""
+        d = {k: self.column(k).tolist() for k in _COLUMNS.keys()}
+        d["outcome_index"] = d.pop("outcome")
+        d["proposer"] = [self.proposers[_] for _ in d["proposer"]]
+        d["outcome"] = [self.outcome_at(_) for _ in range(self._n)]
+        return d
+
+
+NegotiationData = Union[List[Dict[str, Any]], Dict[str, List[Any]]]
+"""The data of a negotiation. Either a list of states (one dict per step) or a dict of columns (e.g. a trace)"""
+
+
+class NegotiationLogSink(ABC):
+    """Receives the records of completed negotiations (e.g. from a `World` with `log_negotiations` enabled).
+
+    Args:
+        folder: The folder to save logs into.
+    """
+
+    def __init__(self, folder: Union[str, os.PathLike]):
+        self.folder = Path(folder)
+
+    @abstractmethod
+    def log(self, info: Dict[str, Any], data: NegotiationData) -> None:
+        """Records a negotiation.
+
+        Args:
+            info: Information about the negotiation. Must have an `id` key.
+            data: The states of the negotiation (a list of dicts) or its trace (a dict of columns)
+        """
+
+    def flush(self) -> None:
+        """Makes sure that all logged negotiations are saved"""
+
+    def close(self) -> None:
+        """Saves everything and releases any resources held by the sink"""
+        self.flush()
+
+
+def _data_frame(data: NegotiationData) -> pd.DataFrame:
+    if isinstance(data, dict):
+        return pd.DataFrame(data)
+    return pd.DataFrame([to_flat_dict(_) for _ in data])
+
+
+class CSVNegotiationLogSink(NegotiationLogSink):
+    """Saves information about all negotiations in `negotiation_info.csv` and the data of every negotiation in a
+    separate CSV file in the `negotiations` subfolder"""
+
+    def log(self, info: Dict[str, Any], data: NegotiationData) -> None:
+        add_records(self.folder / "negotiation_info.csv", [info])
+        negs_folder = self.folder / "negotiations"
+        negs_folder.mkdir(parents=True, exist_ok=True)
+        _data_frame(data).to_csv(negs_folder / f"{info['id']}.csv", index=False)
+
+
+class BinaryNegotiationLogSink(NegotiationLogSink):
+    """Saves all negotiations in a single append-only binary file with an index for fast random access.
+
+    Negotiations are buffered and appended in chunks to `negotiations.bin` in the given folder. Every negotiation is
+    stored as a pickled record of its information and its data as NumPy columns. The offset and size of every record
+    is appended to `negotiations.idx` (a tab separated text file) so that a single negotiation can be read without
+    scanning the data file.
+
+    Args:
+        folder: The folder to save logs into.
+        chunk_size: The number of negotiations to buffer before appending them to the file.
+
+    Remarks:
+        - Creating a sink on a folder that already has logs appends to them.
+        - Use `to_csv` to convert the logs to the layout used by `CSVNegotiationLogSink`.
+
+    Examples:
+
+        >>> import tempfile
+        >>> sink = BinaryNegotiationLogSink(tempfile.mkdtemp())
+        >>> sink.log({"id": "n1", "Failed": False}, {"step": [0, 1], "offer": [(1,), (2,)]})
+        >>> sink.log({"id": "n2", "Failed": True}, [{"step": 0, "relative_time": 0.5}])
+        >>> sink.close()
+        >>> sink.ids()
+        ['n1', 'n2']
+        >>> info, data = sink.read("n1")
+        >>> info["Failed"], data["step"].tolist(), data["offer"].tolist()
+        (False, [0, 1], [(1,), (2,)])
+
+    """
+
+    data_file_name = "negotiations.bin"
+    index_file_name = "negotiations.idx"
+
+    def __init__(self, folder: Union[str, os.PathLike], chunk_size: int = 100):
+        super().__init__(folder)
+        self.chunk_size = max(1, chunk_size)
+        self._buffer: List[Tuple[str, bytes]] = []
+        self._index: Dict[str, Tuple[int, int]] = {}
+        self._size = 0
+        index_path = self.folder / self.index_file_name
+        if index_path.exists():
+            with open(index_path, "r") as f:
+                for line in f:
+                    nid, offset, size = line.rstrip("\n").split("\t")
+                    self._index[nid] = (int(offset), int(size))
+                    self._size = max(self._size, int(offset) + int(size))
+
+    def __len__(self):
+        return len(self._index) + len(self._buffer)
+
+    def __getstate__(self):
+        self.flush()
+        state = self.__dict__.copy()
+        state["_index"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__init__(state["folder"], state["chunk_size"])
+
+    @staticmethod
+    def _columns(data: NegotiationData) -> Tuple[Dict[str, np.ndarray], bool]:
+        is_states = not isinstance(data, dict)
+        if is_states:
+            names: Dict[str, None] = {}
+            for row in data:
+                names.update(dict.fromkeys(row.keys()))
+            data = {k: [row.get(k, None) for row in data] for k in names.keys()}
+        columns = {}
+        for k, v in data.items():
+            column = np.empty(len(v), dtype=object)
+            column[:] = v
+            try:
+                converted = np.asarray(v)
+            except ValueError:
+                converted = column
+            columns[k] = (
+                converted
+                if converted.ndim == 1 and converted.dtype.kind in "biufU"
+                else column
+            )
+        return columns, is_states
+
+    def log(self, info: Dict[str, Any], data: NegotiationData) -> None:
+        columns, is_states = self._columns(data)
+        record = pickle.dumps(
+            {"info": info, "columns": columns, "states": is_states}, protocol=4
+        )
+        self._buffer.append((str(info["id"]), record))
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        self.folder.mkdir(parents=True, exist_ok=True)
+        index_lines = []
+        offset = self._size
+        for nid, record in self._buffer:
+            self._index[nid] = (offset, len(record))
+            index_lines.append(f"{nid}\t{offset}\t{len(record)}\n")
+            offset += len(record)
+        with open(self.folder / self.data_file_name, "ab") as f:
+            f.write(b"".join(_[1] for _ in self._buffer))
+        with open(self.folder / self.index_file_name, "a") as f:
+            f.write("".join(index_lines))
+        self._size = offset
+        self._buffer = []
+
+    def ids(self) -> List[str]:
+        """Returns the IDs of all negotiations saved (after flushing the buffer)"""
+        self.flush()
+        return list(self._index.keys())
+
+    def _read_record(self, nid: str) -> Dict[str, Any]:
+        offset, size = self._index[nid]
+        with open(self.folder / self.data_file_name, "rb") as f:
+            f.seek(offset)
+            return pickle.loads(f.read(size))
+
+    def read(self, nid: str) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        """Reads a single negotiation.
+
+        Args:
+            nid: The ID of the negotiation
+
+        Returns:
+            The information about the negotiation and its data as a dict of columns
+        """
+        self.flush()
+        record = self._read_record(nid)
+        return record["info"], record["columns"]
+
+    def __iter__(self) -> Iterator[Tuple[Dict[str, Any], Dict[str, np.ndarray]]]:
+        self.flush()
+        with open(self.folder / self.data_file_name, "rb") as f:
+            for offset, size in self._index.values():
+                f.seek(offset)
+                record = pickle.loads(f.read(size))
+                yield record["info"], record["columns"]
+
+    def to_csv(self, folder: Optional[Union[str, os.PathLike]] = None) -> None:
+        """Converts the saved negotiations to the layout of `CSVNegotiationLogSink`.
+
+        Args:
+            folder: The folder to save the CSV files into. If not given, the folder of the sink is used.
+        """
+        self.flush()
+        folder = Path(folder) if folder is not None else self.folder
+        negs_folder = folder / "negotiations"
+        negs_folder.mkdir(parents=True, exist_ok=True)
+        infos = []
+        for nid in self._index.keys():
+            record = self._read_record(nid)
+            columns = {k: v.tolist() for k, v in record["columns"].items()}
+            if record["states"]:
+                n = len(next(iter(columns.values()))) if columns else 0
+                data = [{k: v[i] for k, v in columns.items()} for i in range(n)]
+            else:
+                data = columns
+            _data_frame(data).to_csv(negs_folder / f"{nid}.csv", index=False)
+            infos.append(record["info"])
+        if infos:
+            add_records(folder / "negotiation_info.csv", infos)
@@ -22,8 +22,11 @@ Notes:
 import itertools
 import pprint
 import random
+import threading
+import weakref
 import xml.etree.ElementTree as ET
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from functools import reduce
 from operator import mul
 from typing import (
@@ -37,16 +40,20 @@ from typing import (
     Dict,
     List,
     Iterable,
+    Iterator,
     Tuple,
     Collection,
     Type,
+    Hashable,
 )
 from typing import TYPE_CHECKING
 
 import numpy as np
 import pkg_resources
+from dataclasses import dataclass
 
 from negmas.common import NamedObject
+from negmas.frontier import pareto_frontier_points
 from negmas.common import AgentMechanismInterface
 from negmas.generics import GenericMapping, ienumerate, iget, ivalues
 from negmas.helpers import Distribution
@@ -62,6 +69,8 @@ from negmas.outcomes import (
     OutcomeType,
     outcome_as_dict,
     outcome_as_tuple,
+    OutcomeSpace,
+    CHUNK_SIZE,
 )
 
 if TYPE_CHECKING:
@@ -75,6 +84,7 @@ __all__ = [
     "ConstUFun",
     "LinDiscountedUFun",
     "ExpDiscountedUFun",
+    "CachedUtilityFunction",
     "MappingUtilityFunction",
     "LinearUtilityAggregationFunction",
     "NonLinearUtilityAggregationFunction",
@@ -92,6 +102,7 @@ __all__ = [
     "INVALID_UTILITY",
     "outcome_with_utility",
     "utility_range",
+    "SortedUtilityIndex",
 ]
 
 INVALID_UTILITY = float("-inf")
@@ -124,6 +135,171 @@ UtilityValue = Union[UtilityDistribution, float]
 probabilistic modeling of utility_function values."""
 
 
+def _utility_as_float(u: Optional[UtilityValue]) -> float:
+    """Converts a utility value to a float using NaN for unknown utilities"""
+    if u is None:
+        return float("nan")
+    return float(u)
+
+
+def _eval_many(ufun: Callable, outcomes: Sequence["Outcome"]) -> np.ndarray:
+    """Evaluates outcomes in batch if the ufun is a `UtilityFunction` and one by one for other callables"""
+    if isinstance(ufun, UtilityFunction):
+        return ufun.eval_many(outcomes)
+    return np.fromiter(
+        (_utility_as_float(ufun(_)) for _ in outcomes),
+        dtype=np.float64,
+        count=len(outcomes),
+    )
+
+
+def _eval_codes(ufun: Callable, space: OutcomeSpace, codes: np.ndarray) -> np.ndarray:
+    """Evaluates outcomes of a space given by their value codes with any callable"""
+    if isinstance(ufun, UtilityFunction):
+        return ufun.eval_codes(space, codes)
+    return np.fromiter(
+        (_utility_as_float(ufun(space.decode(_))) for _ in space.ids(codes).tolist()),
+        dtype=np.float64,
+        count=len(codes),
+    )
+
+
+def _utility_chunks(
+    ufun: Callable, outcomes: Sequence["Outcome"], chunk_size: Optional[int] = None
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """Yields the index of the first outcome and the utilities of consecutive blocks of outcomes.
+
+    Only outcome spaces larger than the chunk size are split so memory stays bounded while scanning them.
+    """
+    if chunk_size is None:
+        chunk_size = CHUNK_SIZE
+    if isinstance(outcomes, OutcomeSpace) and len(outcomes) > chunk_size:
+        for first, codes in outcomes.chunks(chunk_size):
+            yield first, _eval_codes(ufun, outcomes, codes)
+        return
+    yield 0, _eval_many(ufun, outcomes)
+
+
+def _utility_bounds(
+    ufun: Callable,
+    outcomes: Sequence["Outcome"],
+    infeasible_cutoff: Optional[float] = None,
+    chunk_size: Optional[int] = None,
+) -> Optional[Tuple[float, float]]:
+    """Returns the maximum and minimum known utilities above the cutoff (None if there are none)"""
+    mx, mn = float("-inf"), float("inf")
+    for _, u in _utility_chunks(ufun, outcomes, chunk_size):
+        u = u[~np.isnan(u)]
+        if infeasible_cutoff is not None:
+            u = u[u > infeasible_cutoff]
+        if len(u) > 0:
+            mx, mn = max(mx, float(u.max())), min(mn, float(u.min()))
+    if mx < mn:
+        return None
+    return mx, mn
+
+
+def _factorize(values: Sequence) -> Tuple[list, np.ndarray]:
+    """Returns the unique values of a sequence and the index of each element in them"""
+    table: Dict[Any, int] = {}
+    codes = np.empty(len(values), dtype=np.int64)
+    for i, v in enumerate(values):
+        codes[i] = table.setdefault(v, len(table))
+    return list(table.keys()), codes
+
+
+@dataclass
+class _OutcomeColumns:
+    """A column-wise (factorized) representation of a batch of homogeneous outcomes.
+
+    Each column is stored as a lookup table of the unique values of an issue and an integer code per outcome
+    indexing that table.
+    """
+
+    n: int
+    """Number of outcomes"""
+    columns: Dict[Any, Tuple[list, np.ndarray]]
+    """Maps issue keys (names for dict outcomes, indices for tuples) to (unique values, codes)"""
+    named: bool
+    """Whether the outcomes are dicts (True) or tuples (False)"""
+
+    @classmethod
+    def from_outcomes(cls, outcomes: Sequence["Outcome"]) -> Optional["_OutcomeColumns"]:
+        """Creates columns from a sequence of outcomes returning None if the outcomes are not homogeneous"""
+        if isinstance(outcomes, OutcomeSpace):
+            return cls.from_codes(outcomes, outcomes.codes())
+        if len(outcomes) == 0:
+            return None
+        first = outcomes[0]
+        try:
+            if isinstance(first, dict):
+                keys = first.keys()
+                if not all(isinstance(_, dict) and _.keys() == keys for _ in outcomes):
+                    return None
+                columns = {k: _factorize([_[k] for _ in outcomes]) for k in keys}
+                return cls(n=len(outcomes), columns=columns, named=True)
+            if isinstance(first, tuple):
+                n_issues = len(first)
+                if not all(
+                    isinstance(_, tuple) and len(_) == n_issues for _ in outcomes
+                ):
+                    return None
+                columns = {
+                    i: _factorize([_[i] for _ in outcomes]) for i in range(n_issues)
+                }
+                return cls(n=len(outcomes), columns=columns, named=False)
+        except TypeError:
+            # unhashable issue values
+            return None
+        return None
+
+    @classmethod
+    def from_codes(
+        cls, space: OutcomeSpace, codes: np.ndarray
+    ) -> Optional["_OutcomeColumns"]:
+        """Creates columns from value codes of outcomes of an outcome space returning None for custom outcome types"""
+        if space.astype not in (dict, tuple):
+            return None
+        keys = space.issue_names if space.keep_issue_names else range(space.n_issues)
+        return cls(
+            n=len(codes),
+            columns={k: (space.issue_values(i), codes[:, i]) for i, k in enumerate(keys)},
+            named=space.keep_issue_names,
+        )
+
+    @classmethod
+    def from_array(
+        cls, outcomes: np.ndarray, issue_names: Optional[Sequence] = None
+    ) -> "_OutcomeColumns":
+        """Creates columns from an (n_outcomes x n_issues) array of issue values"""
+        outcomes = np.asarray(outcomes)
+        if outcomes.ndim != 2:
+            raise ValueError(
+                f"Expected a 2D array of outcomes but got one with shape {outcomes.shape}"
+            )
+        keys = list(issue_names) if issue_names is not None else range(outcomes.shape[1])
+        columns = {}
+        for i, k in enumerate(keys):
+            if outcomes.dtype == object:
+                columns[k] = _factorize(outcomes[:, i].tolist())
+            else:
+                table, codes = np.unique(outcomes[:, i], return_inverse=True)
+                columns[k] = (table.tolist(), codes.reshape(-1))
+        return cls(n=len(outcomes), columns=columns, named=issue_names is not None)
+
+    def values(self, key, dtype=None) -> np.ndarray:
+        """Returns the values of the given issue for all outcomes"""
+        table, codes = self.columns[key]
+        return np.asarray(table, dtype=dtype)[codes]
+
+    def outcome(self, i: int) -> "Outcome":
+        """Reconstructs the i^th outcome"""
+        values = (table[codes[i]] for table, codes in self.columns.values())
+        if self.named:
+            return dict(zip(self.columns.keys(), values))
+        return tuple(values)
+
+
 class UtilityFunction(ABC, NamedObject):
     """The abstract base class for all utility functions.
 
@@ -806,6 +982,112 @@ class UtilityFunction(ABC, NamedObject):
             return self.reserved_value
         return None
 
+    def eval_many(self, outcomes: Iterable[Optional["Outcome"]]) -> np.ndarray:
+        """Calculates the utility values of a collection of outcomes.
+
+        Args:
+            outcomes: The outcomes to evaluate. Can be any iterable of outcomes including an `OutcomeSpace`. `None`
+                      stands for the null outcome (i.e. evaluated to the reserved value).
+
+        Returns:
+            A float64 array with one utility value per outcome. Utilities that cannot be calculated are given as
+            `nan` and utility distributions are replaced by their means.
+
+        Remarks:
+            - Utility function types that can evaluate a batch of outcomes more effeciently than calling the
+              utility function for each outcome do so by overriding `_eval_columns`.
+
+        Examples:
+
+            >>> f = LinearUtilityFunction([1.0, 2.0])
+            >>> f.eval_many([(1, 2), (3, 4), None]).tolist()
+            [5.0, 11.0, nan]
+        """
+        if not isinstance(outcomes, Sequence):
+            outcomes = list(outcomes)
+        n = len(outcomes)
+        if isinstance(outcomes, OutcomeSpace) and n > CHUNK_SIZE:
+            # never materialize the codes of all outcomes of large spaces at once
+            result = np.empty(n, dtype=np.float64)
+            for first, codes in outcomes.chunks():
+                result[first : first + len(codes)] = self.eval_codes(outcomes, codes)
+            return result
+        if not isinstance(outcomes, OutcomeSpace) and any(_ is None for _ in outcomes):
+            result = np.full(n, _utility_as_float(self.reserved_value))
+            indices = [i for i, _ in enumerate(outcomes) if _ is not None]
+            result[indices] = self.eval_many([outcomes[_] for _ in indices])
+            return result
+        columns = _OutcomeColumns.from_outcomes(outcomes)
+        if columns is not None:
+            result = self._eval_columns(columns)
+            if result is not None:
+                return result
+        return np.fromiter(
+            (_utility_as_float(self(_)) for _ in outcomes), dtype=np.float64, count=n
+        )
+
+    def eval_codes(self, space: OutcomeSpace, codes: np.ndarray) -> np.ndarray:
+        """Calculates the utility values of outcomes of an outcome space given by their value codes.
+
+        Args:
+            space: The outcome space
+            codes: An (n_outcomes x n_issues) array of value codes as returned by `OutcomeSpace.codes` or
+                   `OutcomeSpace.chunks`
+
+        Returns:
+            A float64 array with one utility value per row (see `eval_many`).
+
+        Examples:
+
+            >>> space = OutcomeSpace([Issue(10, 'price'), Issue(5, 'quantity')])
+            >>> f = LinearUtilityFunction({'price': 1.0, 'quantity': 0.5})
+            >>> [float(f.eval_codes(space, codes).max()) for _, codes in space.chunks(20)]
+            [5.0, 9.0, 11.0]
+        """
+        columns = _OutcomeColumns.from_codes(space, codes)
+        if columns is not None:
+            result = self._eval_columns(columns)
+            if result is not None:
+                return result
+        return np.fromiter(
+            (_utility_as_float(self(space.decode(_))) for _ in space.ids(codes).tolist()),
+            dtype=np.float64,
+            count=len(codes),
+        )
+
+    def eval_array(
+        self, outcomes: np.ndarray, issue_names: Optional[Sequence] = None
+    ) -> np.ndarray:
+        """Calculates the utility values of an array of outcomes.
+
+        Args:
+            outcomes: An (n_outcomes x n_issues) array with one outcome per row
+            issue_names: The names of the issues (columns). If given, rows are treated as dict outcomes with these
+                         keys otherwise they are treated as tuples.
+
+        Returns:
+            A float64 array with one utility value per row (see `eval_many`).
+
+        Examples:
+
+            >>> f = LinearUtilityFunction({'price': 1.0, 'quantity': 0.5})
+            >>> f.eval_array(np.array([[1.0, 2.0], [3.0, 4.0]]), issue_names=['price', 'quantity']).tolist()
+            [2.0, 5.0]
+        """
+        columns = _OutcomeColumns.from_array(outcomes, issue_names)
+        result = self._eval_columns(columns)
+        if result is not None:
+            return result
+        return np.fromiter(
+            (_utility_as_float(self(columns.outcome(_))) for _ in range(columns.n)),
+            dtype=np.float64,
+            count=columns.n,
+        )
+
+    def _eval_columns(self, columns: _OutcomeColumns) -> Optional[np.ndarray]:
+        """Evaluates a batch of outcomes given column-wise. Returns None if no fast path is available"""
+        return None
+
     @classmethod
     def approximate(
         cls,
@@ -852,7 +1134,7 @@ class UtilityFunction(ABC, NamedObject):
 
         utils = []
         for ufun in ufuns:
-            u = [ufun(o) for o in outcomes]
+            u = ufun.eval_many(outcomes).tolist()
             utils.append(MappingUtilityFunction(mapping=dict(zip(output_outcomes, u))))
 
         return utils, output_outcomes, output_issues
@@ -1132,7 +1414,7 @@ class UtilityFunction(ABC, NamedObject):
         if isinstance(outcomes, int):
             outcomes = [(_,) for _ in range(outcomes)]
         n_outcomes = len(outcomes)
-        points = np.array([[u1(o), u2(o)] for o in outcomes])
+        points = np.column_stack((u1.eval_many(outcomes), u2.eval_many(outcomes)))
         order = np.random.permutation(np.array(range(n_outcomes)))
         p1, p2 = points[order, 0], points[order, 1]
         signs = []
@@ -1184,7 +1466,7 @@ class UtilityFunction(ABC, NamedObject):
         if isinstance(outcomes, int):
             outcomes = [(_,) for _ in range(outcomes)]
         n_outcomes = len(outcomes)
-        points = np.array([[u1(o), u2(o)] for o in outcomes])
+        points = np.column_stack((u1.eval_many(outcomes), u2.eval_many(outcomes)))
         order = np.random.permutation(np.array(range(n_outcomes)))
         p1, p2 = points[order, 0], points[order, 1]
         signs = []
@@ -1386,6 +1668,135 @@ class ConstUFun(UtilityFunction):
         return str(self.value)
 
 
+def _outcome_key(outcome: Outcome) -> Hashable:
+    """A hashable key for an outcome (raises `TypeError` if the outcome values are not hashable).
+
+    Keys of dict and `OutcomeType` outcomes keep the order of their items because some utility functions (e.g.
+    `LinearUtilityFunction` with a list of weights) depend on it.
+    """
+    if isinstance(outcome, tuple):
+        key = outcome
+    elif isinstance(outcome, dict):
+        key = (dict, tuple(outcome.items()))
+    elif isinstance(outcome, OutcomeType):
+        key = (type(outcome), tuple(outcome.asdict().items()))
+    else:
+        key = tuple(outcome)
+    hash(key)
+    return key
+
+
+class CachedUtilityFunction(UtilityFunction):
+    """A utility function that memoizes the utility values of another utility function.
+
+    Args:
+        ufun: The utility function being cached
+        maxsize: The maximum number of outcomes to keep (least recently used ones are dropped first). If None, the
+                 cache is unbounded.
+        name: Name of the utility function. If None, a random name will be given.
+
+    Remarks:
+        - Outcomes are cached by their values in order so a dict outcome and the same outcome with its keys in a
+          different order are cached separately. Outcomes with unhashable values are never cached.
+        - The reserved value and `ami` are those of the cached utility function.
+        - Call `invalidate` whenever the cached utility function changes. Negotiators do that automatically when
+          their ufun is assigned or `on_ufun_changed` is called.
+        - Do not cache utility functions that depend on the negotiation state (e.g. discounted ones).
+
+    Examples:
+
+        >>> f = CachedUtilityFunction(MappingUtilityFunction(lambda o: o[0] * 2), maxsize=2)
+        >>> f((1,)), f((1,)), f((2,)), f((3,))
+        (2, 2, 4, 6)
+        >>> f.hits, f.misses, len(f)
+        (1, 3, 2)
+        >>> f.invalidate()
+        >>> len(f)
+        0
+    """
+
+    def __init__(
+        self,
+        ufun: UtilityFunction,
+        maxsize: Optional[int] = 1024,
+        name: Optional[str] = None,
+    ):
+        self.ufun = ufun
+        super().__init__(name=name, reserved_value=ufun.reserved_value, ami=ufun.ami)
+        self.maxsize = maxsize
+        self.hits = 0
+        """Number of calls answered from the cache"""
+        self.misses = 0
+        """Number of calls that had to evaluate the cached utility function"""
+        self._cache: "OrderedDict[Hashable, Optional[UtilityValue]]" = OrderedDict()
+
+    @property
+    def reserved_value(self):
+        return self.ufun.reserved_value
+
+    @reserved_value.setter
+    def reserved_value(self, value):
+        self.ufun.reserved_value = value
+
+    @property
+    def ami(self):
+        return self.ufun.ami
+
+    @ami.setter
+    def ami(self, value):
+        self.ufun.ami = value
+
+    def invalidate(self) -> None:
+        """Drops all cached utility values"""
+        self._cache.clear()
+
+    def __len__(self):
+        return len(self._cache)
+
+    def __call__(self, offer: Outcome) -> Optional[UtilityValue]:
+        if offer is None:
+            return self.ufun(offer)
+        try:
+            key = _outcome_key(offer)
+        except TypeError:
+            self.misses += 1
+            return self.ufun(offer)
+        cache = self._cache
+        if key in cache:
+            self.hits += 1
+            if self.maxsize is not None:
+                cache.move_to_end(key)
+            return cache[key]
+        self.misses += 1
+        u = cache[key] = self.ufun(offer)
+        if self.maxsize is not None and len(cache) > self.maxsize:
+            cache.popitem(last=False)
+        return u
+
+    def _eval_columns(self, columns: _OutcomeColumns) -> Optional[np.ndarray]:
+        # vectorized evaluation is cheap enough to skip the cache
+        return self.ufun._eval_columns(columns)
+
+    def xml(self, issues: List[Issue]) -> str:
+        return self.ufun.xml(issues)
+
+    def __str__(self):
+        return f"{self.ufun}-cached"
+
+    def __getattr__(self, item):
+        if item == "ufun" or item.startswith("__"):
+            raise AttributeError(item)
+        return getattr(self.ufun, item)
+
+    @property
+    def base_type(self):
+        return self.ufun.type
+
+    @property
+    def type(self):
+        return self.ufun.type + "_cached"
+
+
 def make_discounted_ufun(
     ufun: "UtilityFunction",
     ami: "AgentMechanismInterface",
@@ -1517,6 +1928,30 @@ class LinearUtilityFunction(UtilityFunction):
         offer = outcome_as_tuple(offer)
         return sum(w * v for w, v in zip(self.weights, offer))
 
+    def _eval_columns(self, columns: _OutcomeColumns) -> Optional[np.ndarray]:
+        if isinstance(self.weights, dict):
+            weights = self.weights.items()
+        else:
+            weights = zip(columns.columns.keys(), self.weights)
+        u = np.zeros(columns.n)
+        keys, w = [], []
+        for k, weight in weights:
+            if k in columns.columns:
+                keys.append(k)
+                w.append(weight)
+            elif self.missing_value is None:
+                return None
+            else:
+                u += weight * self.missing_value
+        if not keys:
+            return u
+        try:
+            values = np.column_stack([columns.values(k, dtype=np.float64) for k in keys])
+        except (ValueError, TypeError):
+            # non-numeric values. Let the utility function decide what to do with them
+            return None
+        return u + values @ np.asarray(w, dtype=np.float64)
+
     def xml(self, issues: List[Issue]) -> str:
         """ Generates an XML string representing the utility function
 
@@ -1679,6 +2114,24 @@ class LinearUtilityAggregationFunction(UtilityFunction):
                 continue
         return u
 
+    def _eval_columns(self, columns: _OutcomeColumns) -> Optional[np.ndarray]:
+        u = np.zeros(columns.n)
+        for k in ikeys(self.issue_utilities):
+            key = k if columns.named else self.issue_indices[k]
+            w = iget(self.weights, k)  # type: ignore
+            if key not in columns.columns or w is None:
+                return None
+            table, codes = columns.columns[key]
+            # evaluate each issue value once then look the results up for all outcomes
+            mapping = iget(self.issue_utilities, k)
+            utils = np.fromiter(
+                (_utility_as_float(gmap(mapping, v)) for v in table),
+                dtype=np.float64,
+                count=len(table),
+            )
+            u += w * utils[codes]
+        return u
+
     def xml(self, issues: List[Issue]) -> str:
         """ Generates an XML string representing the utility function
 
@@ -1864,6 +2317,23 @@ class MappingUtilityFunction(UtilityFunction):
 
         return m
 
+    def eval_many(self, outcomes: Iterable[Optional["Outcome"]]) -> np.ndarray:
+        if not isinstance(outcomes, OutcomeSpace) or not isinstance(self.mapping, dict):
+            return super().eval_many(outcomes)
+        # Place the mapped values at the indices of their outcomes in the space. Outcomes not in the mapping
+        # get the default value
+        result = np.full(len(outcomes), _utility_as_float(self.default))
+        indices, values = [], []
+        for key, value in self.mapping.items():
+            if not isinstance(key, tuple):
+                continue
+            index = outcomes.encode(key, default=None)
+            if index is not None:
+                indices.append(index)
+                values.append(_utility_as_float(value))
+        result[indices] = values
+        return result
+
     def xml(self, issues: List[Issue]) -> str:
         """
 
@@ -2207,6 +2677,46 @@ class HyperRectangleUtilityFunction(UtilityFunction):
 
         return u
 
+    def _eval_columns(self, columns: _OutcomeColumns) -> Optional[np.ndarray]:
+        u = np.zeros(columns.n)
+        for weight, outcome_range, mapping in zip(
+            self.weights, self.outcome_ranges, self.mappings
+        ):  # type: ignore
+            if outcome_range is None:
+                mask = np.ones(columns.n, dtype=bool)
+            else:
+                if set(ikeys(outcome_range)) - set(columns.columns.keys()) != set([]):
+                    if self.ignore_issues_not_in_input:
+                        continue
+                    return np.full(columns.n, np.nan)
+                # check the range condition once per issue value and look it up for all outcomes
+                mask = np.ones(columns.n, dtype=bool)
+                for key, values in ienumerate(outcome_range):
+                    table, codes = columns.columns[key]
+                    inside = np.fromiter(
+                        (
+                            outcome_in_range({key: v}, {key: values})
+                            for v in table
+                        ),
+                        dtype=bool,
+                        count=len(table),
+                    )
+                    mask &= inside[codes]
+            if isinstance(mapping, float):
+                u[mask] += weight * mapping
+                continue
+            for i in np.nonzero(mask)[0]:
+                if np.isnan(u[i]):
+                    continue
+                try:
+                    # noinspection PyTypeChecker
+                    u[i] += weight * _utility_as_float(gmap(mapping, columns.outcome(i)))
+                except KeyError:
+                    if self.ignore_failing_range_utilities:
+                        continue
+                    u[i] = np.nan
+        return u
+
 
 class NonlinearHyperRectangleUtilityFunction(UtilityFunction):
     """A utility function defined as a set of outcome_ranges.
@@ -2645,71 +3155,14 @@ class IPUtilityFunction(UtilityFunction):
         raise NotImplementedError(f"Cannot convert {self.__class__.__name__} to xml")
 
 
-def _pareto_frontier(
-    points, eps=-1e-18, sort_by_welfare=False
-) -> Tuple[List[Tuple[float]], List[int]]:
-    """Finds the pareto-frontier of a set of points
-
-    Args:
-        points: list of points
-        eps: A (usually negative) small number to treat as zero during calculations
-        sort_by_welfare: If True, the results are sorted descindingly by total welfare
-
-    Returns:
-
-    """
-    points = np.asarray(points)
-    n = len(points)
-    indices = np.array(range(n))
-    for j in range(points.shape[1]):
-        order = points[:, 0].argsort()[-1::-1]
-        points = points[order]
-        indices = indices[order]
-
-    frontier = [(indices[0], points[0, :])]
-    for p in range(1, n):
-        current = points[p, :]
-        for i, (_, f) in enumerate(frontier):
-            current_better, current_worse = current > f, current < f
-            if np.all(current == f):
-                break
-            if not np.any(current_better) and np.any(current_worse):
-                # current is dominated, break
-                break
-            if np.any(current_better):
-                if not np.any(current_worse):
-                    # current dominates f, append it, remove f and scan for anything else dominated by current
-                    for j, (_, g) in enumerate(frontier[i + 1 :]):
-                        if np.all(current == g):
-                            frontier = frontier[:i] + frontier[i + 1 :]
-                            break
-                        if np.any(current > g) and not np.any(current < g):
-                            frontier = frontier[:j] + frontier[j + 1 :]
-                    else:
-                        frontier[i] = (indices[p], current)
-                else:
-                    # neither current nor f dominate each other, append current only if it is not
-                    # dominated by anything in frontier
-                    for j, (_, g) in enumerate(frontier[i + 1 :]):
-                        if np.all(current == g) or (
-                            np.any(g > current) and not np.any(current > g)
-                        ):
-                            break
-                    else:
-                        frontier.append((indices[p], current))
-    if sort_by_welfare:
-        welfare = [np.sum(_[1]) for _ in frontier]
-        indx = sorted(range(len(welfare)), key=lambda x: welfare[x], reverse=True)
-        frontier = [frontier[_] for _ in indx]
-    return [tuple(_[1]) for _ in frontier], [_[0] for _ in frontier]
-
-
 def pareto_frontier(
     ufuns: Iterable[UtilityFunction],
     outcomes: Iterable[Outcome] = None,
     issues: Iterable[Issue] = None,
     n_discretization: Optional[int] = 10,
     sort_by_welfare=False,
+    eps: float = 0.0,
+    chunk_size: Optional[int] = None,
 ) -> Tuple[List[Tuple[float]], List[int]]:
     """Finds all pareto-optimal outcomes in the list
 
@@ -2720,27 +3173,56 @@ def pareto_frontier(
         issues: The set of issues (only used when outcomes is None)
         n_discretization: The number of items to discretize each real-dimension into
         sort_by_welfare: If True, the resutls are sorted descendingly by total welfare
+        eps: If positive, epsilon-dominance is used to find an approximate (smaller) frontier. See
+             `pareto_frontier_points`
+        chunk_size: Outcome spaces larger than this (`CHUNK_SIZE` if None) are scanned in chunks of this size
 
     Returns:
         Two lists of the same length. First list gives the utilities at pareto frontier points and second list gives their indices
 
+    Remarks:
+
+        - When outcomes are not given, the (discretized) outcome space of the issues is never materialized. It is
+          scanned in chunks keeping only the frontier of the outcomes seen so far so memory is bounded by the chunk
+          size and the size of the frontier.
+
     """
 
     ufuns = list(ufuns)
     if issues:
         issues = list(issues)
-    if outcomes:
+    if outcomes and not isinstance(outcomes, Sequence):
         outcomes = list(outcomes)
 
     # calculate all candidate outcomes
     if outcomes is None:
         if issues is None:
             return [], []
-        outcomes = itertools.product(
-            *[issue.alli(n=n_discretization) for issue in issues]
+        outcomes = OutcomeSpace(
+            [
+                _
+                if _.is_countable()
+                else Issue(list(_.alli(n=n_discretization)), name=_.name)
+                for _ in issues
+            ],
+            keep_issue_names=False,
+        )
+    frontier = np.empty((0, len(ufuns)))
+    indices = np.empty(0, dtype=np.int64)
+    chunks = zip(*(_utility_chunks(ufun, outcomes, chunk_size) for ufun in ufuns))
+    for chunk in chunks:
+        # every outcome dominated in the full set is dominated by a frontier point so merging the frontier so far
+        # with the next chunk loses nothing
+        first = chunk[0][0]
+        points = np.vstack((frontier, np.column_stack([u for _, u in chunk])))
+        ids = np.concatenate(
+            (indices, np.arange(first, first + len(points) - len(frontier)))
+        )
+        best, frontier = pareto_frontier_points(
+            points, eps=eps, sort_by_welfare=sort_by_welfare
         )
-    points = [[ufun(outcome) for ufun in ufuns] for outcome in outcomes]
-    return _pareto_frontier(points, sort_by_welfare=sort_by_welfare)
+        indices = ids[best]
+    return [tuple(_) for _ in frontier.tolist()], indices.tolist()
 
 
 def normalize(
@@ -2749,6 +3231,7 @@ def normalize(
     rng: Tuple[float, float] = (0.0, 1.0),
     epsilon: float = 1e-6,
     infeasible_cutoff: Optional[float] = None,
+    chunk_size: Optional[int] = None,
 ) -> UtilityFunction:
     """Normalizes a utility function to the range [0, 1]
 
@@ -2758,18 +3241,16 @@ def normalize(
         rng: range to normalize to. Default is [0, 1]
         epsilon: A small number specifying the resolution
         infeasible_cutoff: A value under which any utility is considered infeasible and is not used in normalization
+        chunk_size: Outcome spaces larger than this (`CHUNK_SIZE` if None) are scanned in chunks of this size
 
     Returns:
         UtilityFunction: A utility function that is guaranteed to be normalized for the set of given outcomes
 
     """
-    u = [ufun(o) for o in outcomes]
-    u = [float(_) for _ in u if _ is not None]
-    if infeasible_cutoff is not None:
-        u = [_ for _ in u if _ > infeasible_cutoff]
-    if len(u) == 0:
+    bounds = _utility_bounds(ufun, outcomes, infeasible_cutoff, chunk_size)
+    if bounds is None:
         return ufun
-    mx, mn = max(u), min(u)
+    mx, mn = bounds
     if abs(mx - 1.0) < epsilon and abs(mn) < epsilon:
         return ufun
     if mx == mn:
@@ -2824,6 +3305,7 @@ def utility_range(
     issues: List[Issue] = None,
     outcomes: Collection[Outcome] = None,
     infeasible_cutoff: Optional[float] = None,
+    chunk_size: Optional[int] = None,
 ) -> Tuple[UtilityValue, UtilityValue]:
     """Finds the range of the given utility function for the given outcomes
 
@@ -2832,10 +3314,15 @@ def utility_range(
         issues: List of issues (optional)
         outcomes: A collection of outcomes (optional)
         infeasible_cutoff: A value under which any utility is considered infeasible and is not used in calculation
+        chunk_size: Outcome spaces larger than this (`CHUNK_SIZE` if None) are scanned in chunks of this size
 
     Returns:
         UtilityFunction: A utility function that is guaranteed to be normalized for the set of given outcomes
 
+    Remarks:
+
+        - Passing an `OutcomeSpace` as outcomes finds the exact range over all of its outcomes using bounded memory.
+
     """
     if outcomes is None:
         outcomes = Issue.sample(
@@ -2844,13 +3331,10 @@ def utility_range(
             with_replacement=True,
             fail_if_not_enough=False,
         )
-    u = [ufun(o) for o in outcomes]
-    u = [float(_) for _ in u if _ is not None]
-    if infeasible_cutoff is not None:
-        u = [_ for _ in u if _ > infeasible_cutoff]
-    if len(u) == 0:
+    bounds = _utility_bounds(ufun, outcomes, infeasible_cutoff, chunk_size)
+    if bounds is None:
         return ufun
-    return max(u), min(u)
+    return bounds
 
 
 class JavaUtilityFunction(UtilityFunction, JavaCallerMixin):
@@ -2878,8 +3362,9 @@ def outcome_with_utility(
     rng: Tuple[float, float],
     issues: List[Issue] = None,
     outcomes: List[Outcome] = None,
-    n_trials: int = 100,
+    n_trials: Optional[int] = 100,
     astype: Type = dict,
+    chunk_size: Optional[int] = None,
 ) -> Optional[Outcome]:
     """
     Gets one outcome within the given utility range or None on failure
@@ -2889,11 +3374,14 @@ def outcome_with_utility(
         rng: The utility range
         issues: The issues the utility function is defined on
         outcomes: The outcomes to sample from
-        n_trials: The maximum number of trials
+        n_trials: The maximum number of trials. If None, all outcomes are tried
+        chunk_size: Outcome spaces larger than this (`CHUNK_SIZE` if None) are scanned in chunks of this size
 
     Returns:
 
         - Either issues, or outcomes should be given but not both
+        - If outcomes is an `OutcomeSpace`, its outcomes are evaluated in vectorized chunks and only the outcome
+          found is decoded
 
     """
     if outcomes is None:
@@ -2904,10 +3392,141 @@ def outcome_with_utility(
             with_replacement=False,
             fail_if_not_enough=False,
         )
-    n = min(len(outcomes), n_trials)
+    n = len(outcomes) if n_trials is None else min(len(outcomes), n_trials)
     mn, mx = rng
+    if isinstance(outcomes, OutcomeSpace):
+        for first, codes in outcomes.chunks(chunk_size, stop=n):
+            u = _eval_codes(ufun, outcomes, codes)
+            found = np.flatnonzero((u >= mn) & (u <= mx))
+            if len(found) > 0:
+                return outcomes.decode(first + int(found[0]))
+        return None
     for i in range(n):
         o = outcomes[i]
         if mn <= ufun(o) <= mx:
             return o
     return None
+
+
+class SortedUtilityIndex:
+    """Outcomes sorted by utility (descending) with binary-search lookups.
+
+    Args:
+        utilities: The utility of every outcome (`nan` for unknown utilities)
+        outcomes: The outcomes (in the same order as `utilities`)
+
+    Remarks:
+        - The sort is stable so outcomes with equal utilities keep their relative order. Outcomes with unknown
+          utilities come last and are never returned by `first_below` or `within`.
+        - Positions used by all methods are ranks in the sorted order (0 is the best outcome).
+        - Use `from_ufun` to get an index that is shared by all users of the same utility function and outcomes.
+
+    Examples:
+
+        >>> index = SortedUtilityIndex(np.array([0.5, 1.0, np.nan, 0.2, 1.0]), ['a', 'b', 'c', 'd', 'e'])
+        >>> [index.outcome(_) for _ in range(len(index))]
+        ['b', 'e', 'a', 'd', 'c']
+        >>> index.utility(0), index.utility(4)
+        (1.0, None)
+        >>> index.first_below(1.0), index.outcome(index.first_below(1.0))
+        (2, 'a')
+        >>> index.first_below(0.0)
+        5
+        >>> [index.outcome(_) for _ in index.within(0.3, 1.0)]
+        ['b', 'e', 'a']
+
+    """
+
+    max_cached = 256
+    """The maximum number of indices kept by `from_ufun`"""
+
+    _cache: "OrderedDict[Tuple[int, int], Tuple[Any, SortedUtilityIndex]]" = OrderedDict()
+    _lock = threading.RLock()
+
+    def __init__(self, utilities: np.ndarray, outcomes: Sequence[Outcome]):
+        utilities = np.asarray(utilities, dtype=np.float64)
+        known = ~np.isnan(utilities)
+        self.outcomes = outcomes
+        self.order = np.lexsort((-np.where(known, utilities, 0.0), ~known))
+        """The index of the outcome at every rank"""
+        self.utilities = utilities[self.order]
+        """The utility at every rank (descending with unknown utilities last)"""
+        self.known = known[self.order]
+        self.n_known = int(known.sum())
+        """The number of outcomes with known utilities"""
+        # ascending search keys with unknown utilities at the end
+        self._keys = np.where(self.known, -self.utilities, float("inf"))
+
+    @classmethod
+    def from_ufun(
+        cls, ufun: "UtilityFunction", outcomes: Sequence[Outcome], cache: bool = True
+    ) -> "SortedUtilityIndex":
+        """Returns the index of the given outcomes under the given utility function.
+
+        Args:
+            ufun: The utility function
+            outcomes: The outcomes to sort
+            cache: If True, the index is shared with all other calls using the same ufun and outcomes objects.
+
+        Remarks:
+            - Discounted utility functions depend on the negotiation time and are never cached.
+            - Call `invalidate` after changing a utility function in place.
+        """
+        if not cache or isinstance(ufun, (ExpDiscountedUFun, LinDiscountedUFun)):
+            return cls(ufun.eval_many(outcomes), outcomes)
+        key = (id(ufun), id(outcomes))
+        with cls._lock:
+            entry = cls._cache.get(key, None)
+            if entry is not None:
+                ref, index = entry
+                if ref() is ufun and index.outcomes is outcomes:
+                    cls._cache.move_to_end(key)
+                    return index
+        index = cls(ufun.eval_many(outcomes), outcomes)
+        try:
+            # the index (and the outcomes) are dropped as soon as the ufun is garbage collected
+            ref = weakref.ref(ufun, lambda r, key=key: cls._forget(key, r))
+        except TypeError:
+            return index
+        with cls._lock:
+            cls._cache[key] = (ref, index)
+            while len(cls._cache) > cls.max_cached:
+                cls._cache.popitem(last=False)
+        return index
+
+    @classmethod
+    def _forget(cls, key: Tuple[int, int], ref: Any) -> None:
+        """Drops a cached index if it still belongs to the given (collected) ufun"""
+        with cls._lock:
+            entry = cls._cache.get(key, None)
+            if entry is not None and entry[0] is ref:
+                del cls._cache[key]
+
+    @classmethod
+    def invalidate(cls, ufun: "UtilityFunction") -> None:
+        """Drops all cached indices of the given utility function"""
+        with cls._lock:
+            for key in [_ for _ in cls._cache.keys() if _[0] == id(ufun)]:
+                del cls._cache[key]
+
+    def __len__(self):
+        return len(self.order)
+
+    def outcome(self, rank: int) -> Outcome:
+        """The outcome at the given rank"""
+        return self.outcomes[self.order[rank]]
+
+    def utility(self, rank: int) -> Optional[float]:
+        """The utility at the given rank (None if unknown)"""
+        return float(self.utilities[rank]) if self.known[rank] else None
+
+    def first_below(self, level: float) -> int:
+        """The first rank with a known utility strictly below `level` (`len(self)` if there is none)"""
+        i = int(np.searchsorted(self._keys, -level, side="right"))
+        return i if i < self.n_known else len(self.order)
+
+    def within(self, lower: float, upper: float) -> np.ndarray:
+        """The ranks of all outcomes with known utilities in the closed band [lower, upper]"""
+        start = np.searchsorted(self._keys, -upper, side="left")
+        end = np.searchsorted(self._keys, -lower, side="right")
+        return np.arange(start, min(end, self.n_known))
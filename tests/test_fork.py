@@ -0,0 +1,74 @@
+import copy
+import gc
+import time
+
+import pytest
+
+from negmas import Mechanism
+from negmas.apps.scml.utils import anac2019_world
+
+
+def _best_time(f, n=5):
+    best, result = float("inf"), None
+    for _ in range(n):
+        # as in timeit, garbage collection would make timing depend on unrelated objects
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            result = f()
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best, result
+
+
+def _check_fork(world, forked, n_steps):
+    assert forked.products is world.products and forked.processes is world.processes
+    assert len(forked._negotiations) == len(world._negotiations)
+    for (key, negotiation), (fkey, fnegotiation) in zip(
+        world._negotiations.items(), forked._negotiations.items()
+    ):
+        assert fkey != key and Mechanism.all[fkey] is fnegotiation.mechanism
+        assert fnegotiation.mechanism is not negotiation.mechanism
+        assert fnegotiation.issues is negotiation.issues
+    forked.run()
+    assert forked.current_step == world.n_steps
+    assert world.current_step == n_steps
+    world.run()
+    assert world.current_step == world.n_steps
+
+
+def test_fork_shares_structure_and_runs_independently():
+    world = anac2019_world(
+        n_steps=10,
+        n_intermediate=(1, 1),
+        n_miners=3,
+        n_factories_per_level=3,
+        n_consumers=3,
+        n_lines_per_factory=2,
+    )
+    n_steps = 3
+    for _ in range(n_steps):
+        world.step()
+    _check_fork(world, world.fork(), n_steps)
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("n_steps", [3, 6], ids=["early", "late"])
+def test_fork_benchmark(n_steps):
+    world = anac2019_world(n_steps=20)
+    for _ in range(n_steps):
+        world.step()
+    fork_time, forked = _best_time(world.fork)
+    deepcopy_time, copied = _best_time(lambda: copy.deepcopy(world))
+    print(
+        f"fork: {fork_time:.4f}s, deepcopy: {deepcopy_time:.4f}s "
+        f"({len(world._negotiations)} running negotiations)"
+    )
+    assert copied.products is not world.products
+    _check_fork(world, forked, n_steps)
+
+
+if __name__ == "__main__":
+    pytest.main(args=[__file__])
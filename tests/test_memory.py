@@ -0,0 +1,120 @@
+import gc
+import tracemalloc
+
+import pytest
+
+from negmas import (
+    AspirationNegotiator,
+    Controller,
+    Issue,
+    LinearUtilityAggregationFunction,
+    LinearUtilityFunction,
+    MappingUtilityFunction,
+    Mechanism,
+    OutcomeSpace,
+    SAOMechanism,
+    outcome_with_utility,
+    pareto_frontier,
+    utility_range,
+)
+
+
+def _create(i: int) -> SAOMechanism:
+    mechanism = SAOMechanism(outcomes=10, n_steps=10)
+    mechanism.add(AspirationNegotiator(), ufun=MappingUtilityFunction(lambda x: x[0]))
+    mechanism.add(AspirationNegotiator(), ufun=MappingUtilityFunction(lambda x: -x[0]))
+    if i % 2:
+        mechanism.close()
+    return mechanism
+
+
+@pytest.mark.parametrize(
+    "n", [1000, pytest.param(100_000, marks=pytest.mark.slow)], ids=["1k", "100k"]
+)
+def test_dropped_mechanisms_are_released(n):
+    gc.collect()
+    n_registered = len(Mechanism.all)
+    tracemalloc.start()
+    try:
+        for i in range(1000):
+            _create(i)
+        gc.collect()
+        before, _ = tracemalloc.get_traced_memory()
+        for i in range(n):
+            _create(i)
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(Mechanism.all) <= n_registered + 1
+    # every mechanism takes tens of kilobytes so keeping them alive would take tens of megabytes at least
+    assert after - before < 5 * 1024 * 1024
+
+
+def test_negotiators_are_dissociated_from_collected_mechanisms():
+    mechanism = SAOMechanism(outcomes=10, n_steps=10)
+    negotiators = [AspirationNegotiator(), AspirationNegotiator()]
+    mechanism.add(negotiators[0], ufun=MappingUtilityFunction(lambda x: x[0]))
+    mechanism.add(negotiators[1], ufun=MappingUtilityFunction(lambda x: -x[0]))
+    mechanism.run()
+    del mechanism
+    gc.collect()
+    for negotiator in negotiators:
+        assert negotiator._ami is None
+        negotiator.utility_function = MappingUtilityFunction(lambda x: 1.0)
+        assert negotiator.utility_function(0) == 1.0
+
+
+def test_controller_states_skip_collected_mechanisms():
+    controller = Controller()
+    mechanisms = [SAOMechanism(outcomes=10, n_steps=10) for _ in range(2)]
+    for mechanism in mechanisms:
+        mechanism.add(
+            controller.create_negotiator(AspirationNegotiator),
+            ufun=MappingUtilityFunction(lambda x: x[0]),
+        )
+        mechanism.add(
+            AspirationNegotiator(), ufun=MappingUtilityFunction(lambda x: -x[0])
+        )
+        mechanism.run()
+    alive = mechanisms[0]
+    del mechanisms, mechanism
+    gc.collect()
+    states = controller.states
+    assert len(states) == 1
+    assert list(states.values())[0] is alive.state
+
+
+def test_huge_outcome_spaces_are_scanned_in_bounded_memory():
+    issues = [
+        Issue(100, "a"),
+        Issue(100, "b"),
+        Issue([float(_) for _ in range(1000)], "c"),
+    ]
+    space = OutcomeSpace(issues, keep_issue_names=False)
+    assert len(space) == 10_000_000
+    first = LinearUtilityFunction({0: 1.0, 1: -0.5, 2: 0.01})
+    second = LinearUtilityAggregationFunction(
+        {0: lambda x: -x, 1: lambda x: x, 2: lambda x: -0.02 * x}
+    )
+    tracemalloc.start()
+    try:
+        assert utility_range(first, outcomes=space) == pytest.approx((108.99, -49.5))
+        frontier, indices = pareto_frontier([first, second], outcomes=space)
+        outcome = outcome_with_utility(
+            first, (108.985, 110.0), outcomes=space, n_trials=None
+        )
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # a list of all outcomes alone would take more than a gigabyte
+    assert peak < 64 * 1024 * 1024
+    assert outcome == (99, 0, 999.0)
+    assert len(frontier) == len(indices) > 0
+    assert all(
+        first(space[i]) == pytest.approx(u[0]) for u, i in zip(frontier[:10], indices)
+    )
+
+
+if __name__ == "__main__":
+    pytest.main(args=[__file__])
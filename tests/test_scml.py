@@ -11,5 +11,52 @@ def test_anac2019(n_steps, consumption_horizon):
     world.run()
 
 
+def test_anac2019_scores_before_the_first_step():
+    import math
+
+    world = anac2019_world(n_steps=5)
+    assert world.business_size == 0 and type(world.business_size) is int
+    for name in (
+        "agreement_rate",
+        "cancellation_rate",
+        "n_negotiation_rounds_successful",
+        "n_negotiation_rounds_failed",
+        "contract_execution_fraction",
+        "breach_rate",
+    ):
+        assert math.isnan(getattr(world, name))
+    world.run()
+    assert type(world.business_size) in (int, float)
+    assert type(world.breach_rate) is float
+    assert "activity_level" in world._stats
+    world = anac2019_world(n_steps=8, negotiation_parallelism="threads")
+    passes, registered = [], []
+    next_pass = world._scheduler.next_pass
+
+    def _next_pass():
+        mechanisms = next_pass()
+        passes.append({k: i for i, (k, _) in enumerate(mechanisms)})
+        return mechanisms
+
+    def _recorder(f):
+        def recorded(mechanism, negotiation, *args, **kwargs):
+            registered.append((len(passes), passes[-1][mechanism.id]))
+            return f(mechanism, negotiation, *args, **kwargs)
+
+        return recorded
+
+    world._scheduler.next_pass = _next_pass
+    world._register_contract = _recorder(world._register_contract)
+    world._register_failed_negotiation = _recorder(
+        world._register_failed_negotiation
+    )
+    world.run()
+    assert world.current_step == 8
+    assert len(registered) > 0
+    # negotiations end (and their contracts are registered) in the order they were stepped
+    assert registered == sorted(registered)
+    assert world._negotiation_pool is None
+
+
 if __name__ == "__main__":
     pytest.main(args=[__file__])